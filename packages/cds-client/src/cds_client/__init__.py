@@ -1,5 +1,10 @@
 from .auth import get_hashed_user, hash_user
-from .client import CDSClient, HubbleClient
+from .client import (
+    AsyncCDSClient,
+    CDSClient,
+    HubbleClient,
+    shared_client,
+)
 from .exceptions import CDSAPIError, CDSAuthError, CDSConflictError, CDSNotFoundError
 from .models import (
     Classroom,
@@ -29,7 +34,7 @@ from .models import (
     Student,
     StudentCreationInfo,
 )
-from .session import CDSSession
+from .session import AsyncCDSSession, CDSSession
 from .state import ClassroomState, EducatorState, StudentState, get_state
 
 __all__ = [
@@ -37,6 +42,9 @@ __all__ = [
     "CDSClient",
     "HubbleClient",
     "CDSSession",
+    "shared_client",
+    "AsyncCDSClient",
+    "AsyncCDSSession",
     # auth
     "hash_user",
     "get_hashed_user",
@@ -1,5 +1,7 @@
 """Top-level CDSClient and HubbleClient entry points."""
 
+from threading import Lock
+
 from .endpoints.classes import ClassesEndpoint
 from .endpoints.educators import EducatorsEndpoint
 from .endpoints.hubble.classes import HubbleClassesEndpoint
@@ -7,7 +9,7 @@ from .endpoints.hubble.galaxies import GalaxiesEndpoint
 from .endpoints.hubble.measurements import MeasurementsEndpoint
 from .endpoints.stories import StoriesEndpoint
 from .endpoints.students import StudentsEndpoint
-from .session import CDSSession
+from .session import AsyncCDSSession, CDSSession
 
 _HUBBLE_PREFIX = "/hubbles_law"
 
@@ -15,10 +17,10 @@ _HUBBLE_PREFIX = "/hubbles_law"
 class HubbleClient:
     """Namespaced client for Hubble's Law story endpoints.
 
-    Accessible via ``CDSClient.hubble``.
+    Accessible via ``CDSClient.hubble`` and ``AsyncCDSClient.hubble``.
     """
 
-    def __init__(self, session: CDSSession):
+    def __init__(self, session: CDSSession | AsyncCDSSession):
         hubble_session = session.with_prefix(_HUBBLE_PREFIX)
         self.measurements = MeasurementsEndpoint(hubble_session)
         self.galaxies = GalaxiesEndpoint(hubble_session)
@@ -60,3 +62,90 @@ class CDSClient:
         self.classes = ClassesEndpoint(self._session)
         self.stories = StoriesEndpoint(self._session)
         self.hubble = HubbleClient(self._session)
+
+    @property
+    def session(self) -> CDSSession:
+        """The session shared by all endpoints of this client."""
+        return self._session
+
+
+_shared_clients: dict[tuple[str | None, str | None], CDSClient] = {}
+_shared_clients_lock = Lock()
+
+
+def shared_client(api_key: str | None = None, base_url: str | None = None) -> CDSClient:
+    """Return the process-wide `CDSClient` for ``api_key`` and ``base_url``.
+
+    The client is created on first use and then reused by every caller
+    (and every solara session) in the process, so that they all share one
+    connection pool instead of opening their own.
+
+    Parameters
+    ----------
+    api_key : str, optional
+        API key sent as the ``Authorization`` header.  Defaults to the
+        ``CDS_API_KEY`` environment variable.
+    base_url : str, optional
+        Override the default API base URL.
+    """
+    key = (api_key, base_url)
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = CDSClient(api_key=api_key, base_url=base_url)
+    return client
+
+
+class AsyncCDSClient:
+    """Asynchronous entry point for the CosmicDS API.
+
+    Exposes the same endpoint classes as `CDSClient`, but on an
+    `AsyncCDSSession`, so every endpoint method returns a coroutine that
+    awaits its requests on the running event loop, without holding a thread.
+    Requests share one pooled ``httpx`` client per loop.
+
+    Parameters
+    ----------
+    api_key : str, optional
+        API key sent as the ``Authorization`` header.  Defaults to the
+        ``CDS_API_KEY`` environment variable.
+    base_url : str, optional
+        Override the default API base URL
+        (``https://api.cosmicds.cfa.harvard.edu``).
+    **session_options
+        Pool, concurrency, timeout and HTTP/2 options passed on to
+        `AsyncCDSSession`.
+
+    Examples
+    --------
+    >>> from cds_client import AsyncCDSClient
+    >>> async with AsyncCDSClient(max_concurrency=5) as client:
+    ...     student = await client.students.get("abc123hash")
+    ...     galaxies = await client.hubble.galaxies.get_all(types=["Sp"])
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        **session_options,
+    ):
+        self._session = AsyncCDSSession(
+            api_key=api_key, base_url=base_url, **session_options
+        )
+
+        self.students = StudentsEndpoint(self._session)
+        self.educators = EducatorsEndpoint(self._session)
+        self.classes = ClassesEndpoint(self._session)
+        self.stories = StoriesEndpoint(self._session)
+        self.hubble = HubbleClient(self._session)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._session.aclose()
+
+    async def __aenter__(self) -> "AsyncCDSClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -1,6 +1,58 @@
-from ..session import CDSSession
+from functools import wraps
+from typing import Any, NamedTuple
+
+from ..session import AsyncCDSSession, CDSSession
+
+
+class Request(NamedTuple):
+    """A request an endpoint method yields to its session."""
+
+    method: str
+    path: str
+    kwargs: dict[str, Any]
+
+    @classmethod
+    def get(cls, path: str, **kwargs) -> "Request":
+        return cls("GET", path, kwargs)
+
+    @classmethod
+    def post(cls, path: str, **kwargs) -> "Request":
+        return cls("POST", path, kwargs)
+
+    @classmethod
+    def put(cls, path: str, **kwargs) -> "Request":
+        return cls("PUT", path, kwargs)
+
+    @classmethod
+    def patch(cls, path: str, **kwargs) -> "Request":
+        return cls("PATCH", path, kwargs)
+
+    @classmethod
+    def delete(cls, path: str, **kwargs) -> "Request":
+        return cls("DELETE", path, kwargs)
+
+
+def endpoint(steps):
+    """Turn a generator describing an API call into an endpoint method.
+
+    The generator yields each `Request` it needs and receives the response
+    (or has the request's error raised at the ``yield``), then returns the
+    parsed result. The session of the endpoint sends the requests, so the
+    same method returns the result with a `CDSSession` and an awaitable of
+    it with an `AsyncCDSSession`. Annotations describe the result.
+
+    The generator itself is kept as ``steps``, so that an endpoint method
+    can build on another with ``yield from self.other.steps(self, ...)``.
+    """
+
+    @wraps(steps)
+    def method(self, *args, **kwargs):
+        return self._session.run(steps(self, *args, **kwargs))
+
+    method.steps = steps
+    return method
 
 
 class BaseEndpoint:
-    def __init__(self, session: CDSSession):
+    def __init__(self, session: CDSSession | AsyncCDSSession):
         self._session = session
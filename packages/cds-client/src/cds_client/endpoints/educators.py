@@ -1,31 +1,36 @@
 from ..exceptions import CDSNotFoundError
 from ..models.base import Classroom, Educator, EducatorCreated, EducatorCreationInfo
-from .base import BaseEndpoint
+from .base import BaseEndpoint, Request, endpoint
 
 
 class EducatorsEndpoint(BaseEndpoint):
     """Endpoints under ``/educators``."""
 
+    @endpoint
     def get(self, identifier: str | int) -> Educator | None:
         """Fetch an educator by username (string) or numeric ID.
 
         Returns ``None`` if no educator with that identifier exists.
         """
         try:
-            data = self._session.get(f"/educators/{identifier}").json()
+            data = (yield Request.get(f"/educators/{identifier}")).json()
         except CDSNotFoundError:
             return None
         return Educator(**data["educator"]) if data.get("educator") else None
 
+    @endpoint
     def get_all(self) -> list[Educator]:
         """Return all educators."""
-        data = self._session.get("/educators").json()
+        data = (yield Request.get("/educators")).json()
         return [Educator(**e) for e in data]
 
+    @endpoint
     def create(self, info: EducatorCreationInfo) -> EducatorCreated:
         """Create a new educator account."""
-        data = self._session.post(
-            "/educators/create", json=info.model_dump(exclude_none=True)
+        data = (
+            yield Request.post(
+                "/educators/create", json=info.model_dump(exclude_none=True)
+            )
         ).json()
         return EducatorCreated(
             educator_info=data.get("educator_info"),
@@ -33,10 +38,13 @@ class EducatorsEndpoint(BaseEndpoint):
             success=data["success"],
         )
 
+    @endpoint
     def get_classes(self, educator_id: int, active_only: bool = True) -> list[Classroom]:
         """Return the classes managed by an educator."""
-        data = self._session.get(
-            f"/educator-classes/{educator_id}",
-            params={"active_only": active_only},
+        data = (
+            yield Request.get(
+                f"/educator-classes/{educator_id}",
+                params={"active_only": active_only},
+            )
         ).json()
         return [Classroom(**c) for c in data.get("classes", [])]
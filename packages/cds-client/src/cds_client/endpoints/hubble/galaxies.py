@@ -1,14 +1,24 @@
-from contextlib import closing
-from io import BytesIO
+import asyncio
 
 from ...exceptions import CDSNotFoundError
 from ...models.hubble import Galaxy, SpectrumData
-from ..base import BaseEndpoint
+from ...spectra import (
+    SPECTRUM_STORE,
+    SpectrumArrays,
+    SpectrumStore,
+    decode_spectrum,
+    spectrum_key,
+)
+from ...session import AsyncCDSSession
+from ..base import BaseEndpoint, Request, endpoint
 
 
 class GalaxiesEndpoint(BaseEndpoint):
     """Hubble's Law galaxy endpoints."""
 
+    STORY = "hubbles_law"
+
+    @endpoint
     def get_all(
         self,
         types: list[str] | None = None,
@@ -26,14 +36,16 @@ class GalaxiesEndpoint(BaseEndpoint):
         params: dict = {"flags": include_flags}
         if types:
             params["types"] = types
-        data = self._session.get("/galaxies", params=params).json()
+        data = (yield Request.get("/galaxies", params=params)).json()
         return [Galaxy(**g) for g in data]
 
+    @endpoint
     def get_sample(self) -> Galaxy:
         """Return the designated sample (example) galaxy."""
-        data = self._session.get("/sample-galaxy").json()
+        data = (yield Request.get("/sample-galaxy")).json()
         return Galaxy(**data)
 
+    @endpoint
     def mark_bad(
         self,
         galaxy_id: int | None = None,
@@ -47,8 +59,9 @@ class GalaxiesEndpoint(BaseEndpoint):
             payload["galaxy_id"] = galaxy_id
         if galaxy_name is not None:
             payload["galaxy_name"] = galaxy_name
-        self._session.put("/mark-galaxy-bad", json=payload)
+        yield Request.put("/mark-galaxy-bad", json=payload)
 
+    @endpoint
     def mark_spectrum_bad(
         self,
         galaxy_id: int | None = None,
@@ -62,10 +75,20 @@ class GalaxiesEndpoint(BaseEndpoint):
             payload["galaxy_id"] = galaxy_id
         if galaxy_name is not None:
             payload["galaxy_name"] = galaxy_name
-        self._session.post("/mark-spectrum-bad", json=payload)
+        yield Request.post("/mark-spectrum-bad", json=payload)
+
+    def get_spectrum(
+        self,
+        galaxy_type: str,
+        name: str,
+        store: SpectrumStore | None = SPECTRUM_STORE,
+    ) -> SpectrumData:
+        """Return the spectrum of a galaxy.
 
-    def get_spectrum(self, galaxy_type: str, name: str) -> SpectrumData:
-        """Download and parse a galaxy spectrum FITS file.
+        The FITS file is only downloaded and parsed if the spectrum is not
+        already held in ``store``. With an asynchronous session this returns
+        an awaitable, and the store is read, and the file parsed, in a worker
+        thread.
 
         Parameters
         ----------
@@ -73,29 +96,51 @@ class GalaxiesEndpoint(BaseEndpoint):
             One of ``"spiral"``, ``"elliptical"``, or ``"irregular"``.
         name : str
             The FITS file name (with or without ``.fits`` extension).
+        store : `~cds_client.spectra.SpectrumStore`, optional
+            The spectrum store to read from and fill. Pass `None` to always
+            download the spectrum.
         """
-        try:
-            from astropy.io import fits  # type: ignore[import]
-        except ImportError as e:
-            raise ImportError(
-                "astropy is required to load spectrum data. "
-                "Install it with: pip install astropy"
-            ) from e
-
         file_name = name if name.endswith(".fits") else f"{name}.fits"
-        response = self._session.get(f"/spectra/{galaxy_type}/{file_name}")
+        if isinstance(self._session, AsyncCDSSession):
+            return self._get_spectrum_async(galaxy_type, name, file_name, store)
+
+        def _fetch() -> SpectrumArrays:
+            response = self._session.get(f"/spectra/{galaxy_type}/{file_name}")
+            return decode_spectrum(response.content, file_name)
+
+        if store is None:
+            arrays = _fetch()
+        else:
+            key = spectrum_key(self.STORY, galaxy_type, file_name)
+            arrays = store.get_or_fetch(key, _fetch)
+
+        return self._spectrum_data(name, arrays)
+
+    async def _get_spectrum_async(
+        self,
+        galaxy_type: str,
+        name: str,
+        file_name: str,
+        store: SpectrumStore | None,
+    ) -> SpectrumData:
+        key = spectrum_key(self.STORY, galaxy_type, file_name)
 
-        with closing(BytesIO(response.content)) as f:
-            f.name = file_name
-            with fits.open(f) as hdulist:
-                data = hdulist["COADD"].data if "COADD" in hdulist else None
+        arrays = None if store is None else await asyncio.to_thread(store.get, key)
+        if arrays is None:
+            response = await self._session.get(f"/spectra/{galaxy_type}/{file_name}")
+            arrays = await asyncio.to_thread(
+                decode_spectrum, response.content, file_name
+            )
+            if store is not None:
+                arrays = await asyncio.to_thread(store.put, key, arrays)
 
-        if data is None:
-            raise ValueError(f"No 'COADD' extension found in spectrum for '{name}'.")
+        return self._spectrum_data(name, arrays)
 
+    @staticmethod
+    def _spectrum_data(name: str, arrays: SpectrumArrays) -> SpectrumData:
         return SpectrumData(
             name=name,
-            wave=list(10 ** data["loglam"]),
-            flux=list(data["flux"]),
-            ivar=list(data["ivar"]),
+            wave=arrays.wave,
+            flux=arrays.flux,
+            ivar=arrays.ivar,
         )
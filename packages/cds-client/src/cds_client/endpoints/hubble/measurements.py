@@ -11,72 +11,119 @@ from ...models.hubble import (
     HubbleSampleMeasurementInput,
     HubbleStudentData,
 )
-from ..base import BaseEndpoint
+from ..base import BaseEndpoint, Request, endpoint
 
 
 class MeasurementsEndpoint(BaseEndpoint):
     """Hubble's Law measurement endpoints."""
 
     # Student measurements
+    @endpoint
     def get(self, student_id: int) -> list[HubbleMeasurement]:
         """Return all measurements for a student."""
-        data = self._session.get(f"/measurements/{student_id}").json()
+        data = (yield Request.get(f"/measurements/{student_id}")).json()
         return [HubbleMeasurement(**m) for m in data.get("measurements", [])]
 
+    @endpoint
     def get_one(self, student_id: int, galaxy_id: int) -> HubbleMeasurement | None:
         """Return a specific galaxy measurement for a student."""
         try:
-            data = self._session.get(
-                f"/measurements/{student_id}/{galaxy_id}"
+            data = (
+                yield Request.get(
+                    f"/measurements/{student_id}/{galaxy_id}"
+                )
             ).json()
         except CDSNotFoundError:
             return None
         m = data.get("measurement")
         return HubbleMeasurement(**m) if m else None
 
+    @endpoint
     def submit(self, measurement: HubbleMeasurementInput) -> HubbleMeasurement:
         """Submit (upsert) a student measurement."""
-        data = self._session.put(
-            "/submit-measurement", json=measurement.model_dump(exclude_none=True)
+        data = (
+            yield Request.put(
+                "/submit-measurement", json=measurement.model_dump(exclude_none=True)
+            )
         ).json()
         return HubbleMeasurement(**data)
 
+    @endpoint
+    def submit_many(
+        self, measurements: list[HubbleMeasurementInput]
+    ) -> list[HubbleMeasurement]:
+        """Submit (upsert) several student measurements in one request."""
+        data = (
+            yield Request.put(
+                "/submit-measurements",
+                json={
+                    "measurements": [m.model_dump(exclude_none=True) for m in measurements]
+                },
+            )
+        ).json()
+        return [HubbleMeasurement(**m) for m in data.get("measurements", [])]
+
+    @endpoint
     def delete(self, student_id: int, galaxy_identifier: str | int) -> None:
         """Delete a student's measurement for a galaxy."""
-        self._session.delete(f"/measurement/{student_id}/{galaxy_identifier}")
+        yield Request.delete(f"/measurement/{student_id}/{galaxy_identifier}")
 
     # Sample measurements
+    @endpoint
     def get_sample(self, student_id: int) -> list[HubbleSampleMeasurement]:
         """Return sample (example) measurements for a student."""
-        data = self._session.get(f"/sample-measurements/{student_id}").json()
+        data = (yield Request.get(f"/sample-measurements/{student_id}")).json()
         return [HubbleSampleMeasurement(**m) for m in data.get("measurements", [])]
 
+    @endpoint
     def get_sample_one(
         self, student_id: int, measurement_number: str
     ) -> HubbleSampleMeasurement | None:
         """Return one sample measurement (``"first"`` or ``"second"``)."""
         try:
-            data = self._session.get(
-                f"/sample-measurements/{student_id}/{measurement_number}"
+            data = (
+                yield Request.get(
+                    f"/sample-measurements/{student_id}/{measurement_number}"
+                )
             ).json()
         except CDSNotFoundError:
             return None
         m = data.get("measurement")
         return HubbleSampleMeasurement(**m) if m else None
 
+    @endpoint
     def submit_sample(
         self, measurement: HubbleSampleMeasurementInput
     ) -> HubbleSampleMeasurement:
         """Submit (upsert) a sample measurement."""
-        data = self._session.put(
-            "/sample-measurement", json=measurement.model_dump(exclude_none=True)
+        data = (
+            yield Request.put(
+                "/sample-measurement", json=measurement.model_dump(exclude_none=True)
+            )
         ).json()
         return HubbleSampleMeasurement(**data)
 
+    @endpoint
+    def submit_sample_many(
+        self, measurements: list[HubbleSampleMeasurementInput]
+    ) -> list[HubbleSampleMeasurement]:
+        """Submit (upsert) several sample measurements in one request."""
+        data = (
+            yield Request.put(
+                "/submit-sample-measurements",
+                json={
+                    "measurements": [m.model_dump(exclude_none=True) for m in measurements]
+                },
+            )
+        ).json()
+        return [HubbleSampleMeasurement(**m) for m in data.get("measurements", [])]
+
+    @endpoint
     def delete_sample(self, student_id: int, measurement_number: str) -> None:
         """Delete a sample measurement (``"first"`` or ``"second"``)."""
-        self._session.delete(f"/sample-measurement/{student_id}/{measurement_number}")
+        yield Request.delete(f"/sample-measurement/{student_id}/{measurement_number}")
 
+    @endpoint
     def list_all_sample(
         self, measurement_number: str | None = None
     ) -> list[HubbleSampleMeasurement]:
@@ -86,11 +133,12 @@ class MeasurementsEndpoint(BaseEndpoint):
             if measurement_number
             else "/sample-measurements"
         )
-        data = self._session.get(path).json()
+        data = (yield Request.get(path)).json()
         items = data if isinstance(data, list) else data.get("measurements", [])
         return [HubbleSampleMeasurement(**m) for m in items]
 
     # Class measurements
+    @endpoint
     def get_class(
         self,
         student_id: int,
@@ -105,29 +153,38 @@ class MeasurementsEndpoint(BaseEndpoint):
             params["exclude_student"] = True
         if student_ids:
             params["student_ids"] = student_ids
-        data = self._session.get(
-            f"/class-measurements/{student_id}/{class_id}", params=params
+        data = (
+            yield Request.get(
+                f"/class-measurements/{student_id}/{class_id}", params=params
+            )
         ).json()
         return [HubbleMeasurement(**m) for m in data.get("measurements", [])]
 
+    @endpoint
     def get_class_size(
         self, student_id: int, class_id: int, complete_only: bool = False
     ) -> int:
         """Return the number of measurements in a class."""
-        data = self._session.get(
-            f"/class-measurements/size/{student_id}/{class_id}",
-            params={"complete_only": complete_only},
+        data = (
+            yield Request.get(
+                f"/class-measurements/size/{student_id}/{class_id}",
+                params={"complete_only": complete_only},
+            )
         ).json()
         return data["measurement_count"]
 
+    @endpoint
     def get_students_completed_count(self, student_id: int, class_id: int) -> int:
         """Return how many students have completed all measurements in a class."""
-        data = self._session.get(
-            f"/class-measurements/students-completed/{student_id}/{class_id}"
+        data = (
+            yield Request.get(
+                f"/class-measurements/students-completed/{student_id}/{class_id}"
+            )
         ).json()
         return data["students_completed_measurements"]
 
     # Aggregate data
+    @endpoint
     def get_all_data(
         self,
         class_id: int | None = None,
@@ -140,7 +197,7 @@ class MeasurementsEndpoint(BaseEndpoint):
             params["class_id"] = class_id
         if before is not None:
             params["before"] = before.isoformat()
-        data = self._session.get("/all-data", params=params).json()
+        data = (yield Request.get("/all-data", params=params)).json()
         return HubbleAllData(
             measurements=[
                 HubbleMeasurement(**m)
@@ -1,50 +1,60 @@
 from ..exceptions import CDSNotFoundError
 from ..models.base import Classroom, Student, StudentCreated, StudentCreationInfo
-from .base import BaseEndpoint
+from .base import BaseEndpoint, Request, endpoint
 
 
 class StudentsEndpoint(BaseEndpoint):
     """Endpoints under ``/students`` and ``/student``."""
 
+    @endpoint
     def get(self, identifier: str | int) -> Student | None:
         """Fetch a student by username (string) or numeric ID.
 
         Returns ``None`` if no student with that identifier exists.
         """
         try:
-            data = self._session.get(f"/students/{identifier}").json()
+            data = (yield Request.get(f"/students/{identifier}")).json()
         except CDSNotFoundError:
             return None
         return Student(**data["student"]) if data.get("student") else None
 
+    @endpoint
     def get_all(self) -> list[Student]:
         """Return all students."""
-        data = self._session.get("/students").json()
+        data = (yield Request.get("/students")).json()
         return [Student(**s) for s in data]
 
+    @endpoint
     def create(self, info: StudentCreationInfo) -> StudentCreated:
         """Create a new student account."""
-        data = self._session.post(
-            "/students/create", json=info.model_dump(exclude_none=True)
+        data = (
+            yield Request.post(
+                "/students/create", json=info.model_dump(exclude_none=True)
+            )
         ).json()
         return StudentCreated(status=data["status"], success=data["success"])
 
+    @endpoint
     def get_classes(self, identifier: str | int, active_only: bool = True) -> list[Classroom]:
         """Return the classes a student is enrolled in."""
         if isinstance(identifier, int):
             # /student-classes/{id} supports the active_only filter
-            data = self._session.get(
-                f"/student-classes/{identifier}",
-                params={"active_only": active_only},
+            data = (
+                yield Request.get(
+                    f"/student-classes/{identifier}",
+                    params={"active_only": active_only},
+                )
             ).json()
         else:
-            data = self._session.get(f"/students/{identifier}/classes").json()
+            data = (yield Request.get(f"/students/{identifier}/classes")).json()
         return [Classroom(**c) for c in data.get("classes", [])]
 
+    @endpoint
     def remove_from_class(self, identifier: str | int, class_id: int) -> None:
         """Remove a student from a specific class."""
-        self._session.delete(f"/students/{identifier}/classes/{class_id}")
+        yield Request.delete(f"/students/{identifier}/classes/{class_id}")
 
+    @endpoint
     def ignore_for_story(
         self,
         identifier: str | int,
@@ -52,7 +62,7 @@ class StudentsEndpoint(BaseEndpoint):
         ignore: bool = True,
     ) -> None:
         """Set the ignored flag for a student on a given story."""
-        self._session.put(
+        yield Request.put(
             f"/students/ignore/{identifier}/{story_name}",
             json={"ignore": ignore},
         )
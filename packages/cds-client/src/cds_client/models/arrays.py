@@ -0,0 +1,32 @@
+"""Array-valued field types for models that carry numeric samples.
+
+Fields annotated with `Float32Array` hold a one-dimensional ``float32``
+`numpy.ndarray`. Arrays that already have that dtype (including memory-mapped
+arrays) are stored as-is, and Python-mode dumps return the same array, so
+neither validation nor serialization touches the individual samples. JSON
+dumps still produce a plain list of numbers.
+"""
+
+from typing import Annotated, Any
+
+import numpy as np
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+
+
+def _as_float32(value: Any) -> np.ndarray:
+    array = np.asarray(value, dtype=np.float32)
+    if array.ndim != 1:
+        raise ValueError(
+            f"expected a one-dimensional array, got {array.ndim} dimensions"
+        )
+    return array
+
+
+Float32Array = Annotated[
+    np.ndarray,
+    PlainValidator(_as_float32),
+    PlainSerializer(lambda array: array.tolist(), when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
+
+__all__ = ["Float32Array"]
@@ -8,6 +8,7 @@ directly.
 
 from pydantic import BaseModel
 
+from .arrays import Float32Array
 from ._generated_hubble import (
     Element,
     Galaxy,
@@ -38,9 +39,9 @@ class SpectrumData(BaseModel):
     """Spectrum arrays returned by the galaxy spectrum endpoint."""
 
     name: str
-    wave: list[float]
-    flux: list[float]
-    ivar: list[float]
+    wave: Float32Array
+    flux: Float32Array
+    ivar: Float32Array
 
 
 __all__ = [
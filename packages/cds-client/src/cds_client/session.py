@@ -1,16 +1,48 @@
-"""HTTP session wrapper providing auth and base-URL handling."""
+"""HTTP session wrappers providing auth and base-URL handling."""
 
+import asyncio
 import os
+import threading
+import weakref
 from functools import cached_property
+from typing import Any, Generator
 
+import httpx
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .exceptions import CDSAPIError, CDSAuthError, CDSNotFoundError, CDSConflictError
 
+# Connections kept open to the API host by each `CDSSession`
+POOL_SIZE = int(os.getenv("CDS_CLIENT_POOL_SIZE", 16))
+
+# Times an idempotent request is retried after a connection error or a
+#  502/503/504 response
+RETRIES = int(os.getenv("CDS_CLIENT_RETRIES", 2))
+
+
+def _check_response(r):
+    """Raise the matching `CDSAPIError` subclass for an error response."""
+    if r.status_code in (401, 403):
+        raise CDSAuthError(r.status_code, r.text)
+    if r.status_code == 404:
+        raise CDSNotFoundError(r.status_code, r.text)
+    if r.status_code == 409:
+        raise CDSConflictError(r.status_code, r.text)
+    if r.status_code >= 400:
+        raise CDSAPIError(r.status_code, r.text)
+    return r
+
 
 class CDSSession:
     """Authenticated HTTP session for the CosmicDS API.
 
+    Requests go through one ``requests.Session`` whose connection pool holds
+    up to ``CDS_CLIENT_POOL_SIZE`` connections and is shared by every session
+    derived with `with_prefix`. Idempotent requests are retried with backoff
+    when the connection fails or the server is briefly unavailable.
+
     Parameters
     ----------
     api_key : str, optional
@@ -39,36 +71,69 @@ class CDSSession:
         session = Session()
         key = self._api_key or os.getenv("CDS_API_KEY", "")
         session.headers.update({"Authorization": key})
+
+        adapter = HTTPAdapter(
+            pool_maxsize=POOL_SIZE,
+            max_retries=Retry(
+                total=RETRIES,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         return session
 
+    @property
+    def http(self) -> Session:
+        """The pooled ``requests.Session`` used to send requests.
+
+        Useful for routes that have no endpoint method yet, so that they
+        share the same connections and retries.
+        """
+        return self._session
+
     def _url(self, path: str) -> str:
         return f"{self._base_url}{self._prefix}{path}"
 
     def _check(self, r: Response) -> Response:
-        if r.status_code in (401, 403):
-            raise CDSAuthError(r.status_code, r.text)
-        if r.status_code == 404:
-            raise CDSNotFoundError(r.status_code, r.text)
-        if r.status_code == 409:
-            raise CDSConflictError(r.status_code, r.text)
-        if r.status_code >= 400:
-            raise CDSAPIError(r.status_code, r.text)
-        return r
+        return _check_response(r)
+
+    def request(self, method: str, path: str, **kwargs) -> Response:
+        return self._check(self._session.request(method, self._url(path), **kwargs))
 
     def get(self, path: str, **kwargs) -> Response:
-        return self._check(self._session.get(self._url(path), **kwargs))
+        return self.request("GET", path, **kwargs)
 
     def post(self, path: str, **kwargs) -> Response:
-        return self._check(self._session.post(self._url(path), **kwargs))
+        return self.request("POST", path, **kwargs)
 
     def put(self, path: str, **kwargs) -> Response:
-        return self._check(self._session.put(self._url(path), **kwargs))
+        return self.request("PUT", path, **kwargs)
 
     def patch(self, path: str, **kwargs) -> Response:
-        return self._check(self._session.patch(self._url(path), **kwargs))
+        return self.request("PATCH", path, **kwargs)
 
     def delete(self, path: str, **kwargs) -> Response:
-        return self._check(self._session.delete(self._url(path), **kwargs))
+        return self.request("DELETE", path, **kwargs)
+
+    def run(self, steps: Generator) -> Any:
+        """Send the requests of an endpoint method and return its result."""
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    response = self.request(
+                        request.method, request.path, **request.kwargs
+                    )
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(response)
+        except StopIteration as stop:
+            return stop.value
 
     def with_prefix(self, prefix: str) -> "CDSSession":
         """Return a new session sharing the same underlying connection but with a path prefix."""
@@ -79,3 +144,172 @@ class CDSSession:
         # Share the underlying requests.Session so auth headers are reused
         new.__dict__["_session"] = self._session
         return new
+
+
+class AsyncCDSSession:
+    """Authenticated, pooled asynchronous HTTP session for the CosmicDS API.
+
+    Requests are sent through one ``httpx.AsyncClient`` per event loop, whose
+    connection pool is shared by every session derived with `with_prefix`.
+    The number of requests in flight against the API host from each loop is
+    capped by ``max_concurrency``.
+
+    Parameters
+    ----------
+    api_key : str, optional
+        API key sent as the ``Authorization`` header.  Defaults to the
+        ``CDS_API_KEY`` environment variable.
+    base_url : str, optional
+        Override the default API base URL.
+    prefix : str, optional
+        Optional path prefix appended to ``base_url`` (e.g. ``/hubbles_law``).
+    max_connections : int, optional
+        Maximum number of open connections in the pool.
+    max_keepalive_connections : int, optional
+        Maximum number of idle connections kept alive for reuse.
+    keepalive_expiry : float, optional
+        Seconds an idle connection is kept alive.
+    max_concurrency : int, optional
+        Maximum number of requests in flight at once.
+    timeout : float, optional
+        Timeout in seconds applied to connecting, reading and writing.
+    http2 : bool, optional
+        Negotiate HTTP/2 with the server. Requires the ``h2`` package
+        (``pip install httpx[http2]``).
+    """
+
+    DEFAULT_BASE_URL = CDSSession.DEFAULT_BASE_URL
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        prefix: str = "",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_concurrency: int = 10,
+        timeout: float = 30.0,
+        http2: bool = False,
+    ):
+        if http2:
+            try:
+                import h2  # noqa: F401  # type: ignore[import]
+            except ImportError as e:
+                raise ImportError(
+                    "h2 is required for HTTP/2 support. "
+                    "Install it with: pip install httpx[http2]"
+                ) from e
+
+        self._api_key = api_key
+        self._base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
+        self._prefix = prefix.rstrip("/")
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._max_concurrency = max_concurrency
+        self._timeout = httpx.Timeout(timeout)
+        self._http2 = http2
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            tuple[httpx.AsyncClient, asyncio.Semaphore],
+        ] = weakref.WeakKeyDictionary()
+        self._pools_lock = threading.Lock()
+
+    def _pool(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """The client and concurrency limit of the running event loop.
+
+        Both are bound to the loop they are first used in, so each loop gets
+        its own, shared by every session derived with `with_prefix`.
+        """
+        loop = asyncio.get_running_loop()
+        with self._pools_lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                key = self._api_key or os.getenv("CDS_API_KEY", "")
+                client = httpx.AsyncClient(
+                    headers={"Authorization": key},
+                    limits=self._limits,
+                    timeout=self._timeout,
+                    http2=self._http2,
+                )
+                pool = self._pools[loop] = (
+                    client,
+                    asyncio.Semaphore(self._max_concurrency),
+                )
+        return pool
+
+    def _url(self, path: str) -> str:
+        return f"{self._base_url}{self._prefix}{path}"
+
+    @staticmethod
+    def _request_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+        # Accept the same keyword arguments as `CDSSession`, which follows
+        #  the `requests` conventions.
+        kwargs = dict(kwargs)
+        if isinstance(kwargs.get("data"), (str, bytes)):
+            kwargs["content"] = kwargs.pop("data")
+        if kwargs.get("params"):
+            # `requests` sends booleans as "True"/"False"
+            kwargs["params"] = {
+                k: str(v) if isinstance(v, bool) else v
+                for k, v in kwargs["params"].items()
+            }
+        return kwargs
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        client, semaphore = self._pool()
+        async with semaphore:
+            r = await client.request(
+                method, self._url(path), **self._request_kwargs(kwargs)
+            )
+        return _check_response(r)
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, **kwargs)
+
+    async def run(self, steps: Generator) -> Any:
+        """Await the requests of an endpoint method and return its result."""
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    response = await self.request(
+                        request.method, request.path, **request.kwargs
+                    )
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    def with_prefix(self, prefix: str) -> "AsyncCDSSession":
+        """Return a new session sharing the same connection pool but with a path prefix."""
+        new = AsyncCDSSession.__new__(AsyncCDSSession)
+        new.__dict__.update(self.__dict__)
+        # The pools are shared through the copied `_pools` dictionary
+        new._prefix = prefix.rstrip("/")
+        return new
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._pools_lock:
+            pool = self._pools.pop(loop, None)
+        if pool is not None:
+            await pool[0].aclose()
@@ -0,0 +1,327 @@
+"""Persistent, memory-mapped cache of decoded galaxy spectra.
+
+Spectrum FITS files never change once published, so the decoded ``wave``,
+``flux`` and ``ivar`` arrays are stored on disk as ``.npy`` files addressed
+by a digest of the story, galaxy type and file name. Stored arrays are
+memory-mapped on read, so every process on a host shares the same pages,
+and an in-process LRU keeps the most recently used spectra at hand.
+
+The store can be pre-warmed for a whole catalog from the command line::
+
+    cds-spectra --types Sp E Ir --workers 8
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "SpectrumArrays",
+    "SpectrumStore",
+    "SPECTRUM_STORE",
+    "decode_spectrum",
+    "spectrum_key",
+    "prewarm",
+]
+
+# Directory in which decoded spectra are stored. Set to an empty string to
+#  keep spectra in memory only.
+SPECTRUM_CACHE_DIR = os.getenv(
+    "CDS_SPECTRUM_CACHE_DIR",
+    str(
+        Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+        / "cosmicds"
+        / "spectra"
+    ),
+)
+
+# Number of spectra held in the in-process LRU
+SPECTRUM_LRU_SIZE = int(os.getenv("CDS_SPECTRUM_LRU_SIZE", 256))
+
+# Folder names used by the API for each galaxy type code
+GALAXY_TYPE_FOLDERS = {"Sp": "spiral", "E": "elliptical", "Ir": "irregular"}
+
+_FIELDS = ("wave", "flux", "ivar")
+
+
+class SpectrumArrays(NamedTuple):
+    """The decoded arrays of a single spectrum."""
+
+    wave: np.ndarray
+    flux: np.ndarray
+    ivar: np.ndarray
+
+
+def spectrum_key(story: str, galaxy_type: str, name: str) -> str:
+    """Return the storage key of the spectrum ``name`` in ``story``."""
+    file_name = f"{name.replace('.fits', '')}.fits"
+    return hashlib.sha256(f"{story}/{galaxy_type}/{file_name}".encode()).hexdigest()
+
+
+def decode_spectrum(content: bytes, name: str) -> SpectrumArrays:
+    """Decode the ``COADD`` extension of a spectrum FITS file.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw contents of the FITS file.
+    name : str
+        The file name, used in error messages.
+    """
+    try:
+        from astropy.io import fits  # type: ignore[import]
+    except ImportError as e:
+        raise ImportError(
+            "astropy is required to load spectrum data. "
+            "Install it with: pip install astropy"
+        ) from e
+
+    with closing(BytesIO(content)) as f:
+        f.name = name
+        with fits.open(f) as hdulist:
+            if "COADD" not in hdulist:
+                raise ValueError(
+                    f"No 'COADD' extension found in spectrum for '{name}'."
+                )
+            data = hdulist["COADD"].data
+
+            # FITS data is big-endian; store it in native byte order, and
+            #  in the dtype `SpectrumData` holds so loading it is zero-copy
+            return SpectrumArrays(
+                wave=np.power(10, data["loglam"], dtype=np.float64).astype(np.float32),
+                flux=np.asarray(data["flux"], dtype=np.float32),
+                ivar=np.asarray(data["ivar"], dtype=np.float32),
+            )
+
+
+class SpectrumStore:
+    """Two-level cache of decoded spectra.
+
+    Lookups are served from an in-process LRU first, then from the
+    ``.npy`` files in ``directory`` (memory-mapped), and only then fetched.
+    Concurrent lookups of the same missing spectrum result in one fetch.
+
+    Parameters
+    ----------
+    directory : str or `~pathlib.Path`, optional
+        Directory in which spectra are stored. If empty or not writable,
+        spectra are only cached in memory.
+    max_items : int, optional
+        Number of spectra held in the in-process LRU.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = SPECTRUM_CACHE_DIR,
+        max_items: int = SPECTRUM_LRU_SIZE,
+    ):
+        self.directory = Path(directory) if directory else None
+        self.max_items = max_items
+        self._memory: OrderedDict[str, SpectrumArrays] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def _path(self, key: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / key[:2] / key
+
+    def _remember(self, key: str, arrays: SpectrumArrays):
+        with self._lock:
+            self._memory[key] = arrays
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> SpectrumArrays | None:
+        path = self._path(key)
+        if path is None or not path.is_dir():
+            return None
+
+        try:
+            return SpectrumArrays(
+                *(np.load(path / f"{field}.npy", mmap_mode="r") for field in _FIELDS)
+            )
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read stored spectrum `%s`: %s", path, e)
+            return None
+
+    def _write(self, key: str, arrays: SpectrumArrays) -> bool:
+        path = self._path(key)
+        if path is None:
+            return False
+
+        tmp_path = path.with_name(f"{key}.tmp-{os.getpid()}-{threading.get_ident()}")
+        try:
+            tmp_path.mkdir(parents=True, exist_ok=True)
+            for field, array in zip(_FIELDS, arrays):
+                np.save(tmp_path / f"{field}.npy", array)
+            tmp_path.rename(path)
+        except OSError as e:
+            # Either another process stored the spectrum first, or the
+            #  directory is not writable
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if not path.is_dir():
+                logger.warning("Failed to store spectrum `%s`: %s", path, e)
+                return False
+
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+        path = self._path(key)
+        return path is not None and path.is_dir()
+
+    def get(self, key: str) -> SpectrumArrays | None:
+        """Return the stored spectrum for ``key``, or `None`."""
+        with self._lock:
+            arrays = self._memory.get(key)
+            if arrays is not None:
+                self._memory.move_to_end(key)
+                return arrays
+
+        arrays = self._read(key)
+        if arrays is not None:
+            self._remember(key, arrays)
+        return arrays
+
+    def put(self, key: str, arrays: SpectrumArrays) -> SpectrumArrays:
+        """Store ``arrays`` under ``key`` and return the stored arrays.
+
+        If the arrays were written to disk, the returned arrays are the
+        memory-mapped copies.
+        """
+        if self._write(key, arrays):
+            arrays = self._read(key) or arrays
+        self._remember(key, arrays)
+        return arrays
+
+    def get_or_fetch(
+        self, key: str, fetch: Callable[[], SpectrumArrays]
+    ) -> SpectrumArrays:
+        """Return the spectrum for ``key``, calling ``fetch`` if it is missing."""
+        arrays = self.get(key)
+        if arrays is not None:
+            return arrays
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                # Another thread may have fetched the spectrum while we waited
+                arrays = self.get(key)
+                if arrays is None:
+                    arrays = self.put(key, fetch())
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+        return arrays
+
+    def clear_memory(self):
+        """Drop the in-process LRU; stored spectra are kept on disk."""
+        with self._lock:
+            self._memory.clear()
+
+
+SPECTRUM_STORE = SpectrumStore()
+
+
+def prewarm(
+    client,
+    types: list[str] | None = None,
+    store: SpectrumStore = SPECTRUM_STORE,
+    workers: int = 8,
+) -> tuple[int, int]:
+    """Download and store the spectrum of every galaxy in the catalog.
+
+    Parameters
+    ----------
+    client : `~cds_client.CDSClient`
+        The client used to fetch the catalog and the spectra.
+    types : list of str, optional
+        Galaxy type codes to include. Defaults to all types.
+    store : `SpectrumStore`, optional
+        The store to fill.
+    workers : int, optional
+        The number of spectra downloaded concurrently.
+
+    Returns
+    -------
+    tuple of int
+        The number of spectra stored and the number that failed.
+    """
+    galaxies = client.hubble.galaxies.get_all(types=types)
+
+    def _load(galaxy) -> bool:
+        try:
+            client.hubble.galaxies.get_spectrum(
+                GALAXY_TYPE_FOLDERS[galaxy.type], galaxy.name, store=store
+            )
+            return True
+        except Exception as e:
+            logger.warning("Failed to store spectrum for `%s`: %s", galaxy.name, e)
+            return False
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_load, galaxies))
+
+    return sum(results), len(results) - sum(results)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Pre-warm the on-disk spectrum store for the galaxy catalog."
+    )
+    parser.add_argument(
+        "--types",
+        nargs="*",
+        default=None,
+        help="Galaxy type codes to include (e.g. Sp E Ir). Defaults to all.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=SPECTRUM_CACHE_DIR,
+        help="Directory in which spectra are stored.",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent downloads.")
+    parser.add_argument("--base-url", default=None, help="Override the API URL.")
+    args = parser.parse_args(argv)
+
+    if not args.cache_dir:
+        parser.error("a cache directory is required to pre-warm the store")
+
+    from .client import CDSClient
+
+    logging.basicConfig(level=logging.INFO)
+
+    store = SpectrumStore(args.cache_dir)
+    stored, failed = prewarm(
+        CDSClient(base_url=args.base_url),
+        types=args.types,
+        store=store,
+        workers=args.workers,
+    )
+    print(f"Stored {stored} spectra in {store.directory} ({failed} failed).")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
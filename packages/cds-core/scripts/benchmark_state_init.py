@@ -0,0 +1,79 @@
+"""
+Benchmark constructing story and app states, with the union types patched
+on every instantiation (as the states used to do) and only once after the
+registries change.
+
+    python packages/cds-core/scripts/benchmark_state_init.py --stages 7
+"""
+import argparse
+import timeit
+
+from cds_core.base_states import (
+    BaseAppState,
+    BaseMarker,
+    BaseStageState,
+    BaseStoryState,
+    register_stage,
+    register_story,
+)
+
+STEPS = 20
+
+
+def make_states(n_stages):
+    """Register `n_stages` stages and a story, shaped like the Hubble story"""
+    for i in range(n_stages):
+        marker = BaseMarker(f"Marker{i}", {f"step{j}": j for j in range(1, STEPS + 1)})
+        stage_cls = type(
+            f"Stage{i}",
+            (BaseStageState,),
+            {
+                "__annotations__": {"current_step": marker, "stage_id": str, "done": bool},
+                "current_step": marker.first(),
+                "stage_id": f"stage_{i}",
+                "done": False,
+            },
+        )
+        register_stage(f"stage_{i}")(stage_cls)
+
+    @register_story("benchmark")
+    class StoryState(BaseStoryState):
+        title: str = "Benchmark"
+        story_id: str = "benchmark"
+
+    class AppState(BaseAppState):
+        pass
+
+    return StoryState, AppState
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stages", type=int, default=7)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    story_cls, app_cls = make_states(args.stages)
+    stored = story_cls().model_dump()
+
+    cases = [
+        ("new story", story_cls, lambda: story_cls()),
+        ("stored story", story_cls, lambda: story_cls(**stored)),
+        ("new app", app_cls, lambda: app_cls()),
+    ]
+    for name, cls, construct in cases:
+
+        def patched_every_time():
+            cls.patch_union_type()
+            if cls is app_cls:
+                story_cls.patch_union_type()
+            construct()
+
+        old = min(timeit.repeat(patched_every_time, number=args.number, repeat=5)) / args.number
+        new = min(timeit.repeat(construct, number=args.number, repeat=5)) / args.number
+        print(f"{name:>12}: patched every time {old * 1e6:7.1f} us  "
+              f"patched once {new * 1e6:7.1f} us  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import enum
 from inspect import isclass
 import os
+from threading import Lock
 from types import UnionType
 from typing import (
     Dict,
@@ -42,6 +43,30 @@ logger.info(f"Debug mode is {'enabled' if debug_mode_init else 'disabled'}. ")
 STAGE_REGISTRY: Dict[str, Type["BaseStageState"]] = {}
 STORY_REGISTRY: Dict[str, Type["BaseStoryState"]] = {}
 
+# State classes whose union types have been patched for the current contents
+#  of the registries. Cleared whenever a stage or story is registered.
+_PATCHED_UNION_TYPES: set[type] = set()
+_union_types_lock = Lock()
+
+
+def _registries_changed():
+    with _union_types_lock:
+        _PATCHED_UNION_TYPES.clear()
+
+
+def _ensure_union_type(cls):
+    """
+    Patch the union type of `cls` the first time it is instantiated after
+    the registries last changed, instead of on every instantiation.
+    """
+    if cls in _PATCHED_UNION_TYPES:
+        return
+
+    with _union_types_lock:
+        if cls not in _PATCHED_UNION_TYPES:
+            cls.patch_union_type()
+            _PATCHED_UNION_TYPES.add(cls)
+
 
 def register_stage(state_name: str):
 
@@ -49,6 +74,7 @@ def register_stage(state_name: str):
         setattr(cls, "type", state_name)
 
         STAGE_REGISTRY[state_name] = cls
+        _registries_changed()
         return cls
 
     return decorator
@@ -60,6 +86,7 @@ def register_story(state_name: str):
         setattr(cls, "type", state_name)
 
         STORY_REGISTRY[state_name] = cls
+        _registries_changed()
         return cls
 
     return decorator
@@ -288,7 +315,7 @@ class BaseStoryState(BaseState):
     stage_states: Dict[str, Annotated[object, ...]] = Field(default_factory=dict)
 
     def __init__(self, **data):
-        self.patch_union_type()
+        _ensure_union_type(type(self))
         super().__init__(**data)
         for stage_name, stage_cls in STAGE_REGISTRY.items():
             if stage_name not in self.stage_states:
@@ -325,7 +352,7 @@ class BaseAppState(BaseState):
     story_state: Optional[Annotated[object, ...]] = None
 
     def __init__(self, **data):
-        self.patch_union_type()
+        _ensure_union_type(type(self))
         super().__init__(**data)
         for story_name, story_cls in STORY_REGISTRY.items():
             self.story_state = story_cls()
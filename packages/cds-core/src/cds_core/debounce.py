@@ -0,0 +1,192 @@
+import os
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+from .logger import setup_logger
+from .scheduler import SCHEDULER, TimerHandle, _current_context
+
+logger = setup_logger("DEBOUNCE")
+
+__all__ = ["Debouncer", "BLOCKING_EXECUTOR"]
+
+# Shared pool for debounced calls that block, such as writes to the API, so
+#  that they do not hold up the scheduler's thread
+BLOCKING_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("CDS_DEBOUNCE_WORKERS", 4)),
+    thread_name_prefix="cds-debounce",
+)
+
+
+class _Pending:
+    __slots__ = ("context", "handle", "args", "kwargs", "future")
+
+    def __init__(self, context):
+        self.context = context
+        self.handle: Optional[TimerHandle] = None
+        self.args: Optional[tuple] = None
+        self.kwargs: Optional[dict] = None
+        self.future: Optional[Future] = None
+
+
+class Debouncer:
+    """
+    Debounces or throttles the calls of ``function``, separately for each
+    session and key, using timers of the shared scheduler instead of a
+    thread per call.
+
+    When debouncing, ``function`` is called once calls have stopped for
+    ``wait`` seconds. When throttling, it is called at most once every
+    ``wait`` seconds. Either way, the call made is the latest one, on the
+    trailing edge of the wait, and/or the first one, on the leading edge.
+    Pending calls of a session are flushed when its kernel shuts down.
+
+    Parameters
+    ----------
+    wait : float
+        Seconds to wait for further calls.
+    function : callable
+        The function to call.
+    leading : bool
+        Call ``function`` right away on the first call of a burst.
+    trailing : bool
+        Call ``function`` with the latest arguments at the end of the wait.
+    throttle : bool
+        Limit the rate of calls instead of waiting for a quiet period.
+    key : callable, optional
+        Returns the key of a call from its arguments. Calls with different
+        keys are debounced independently. By default, all calls of a
+        session share a key.
+    executor : `~concurrent.futures.Executor`, optional
+        Run trailing calls in this executor, e.g. `BLOCKING_EXECUTOR` for
+        calls that do I/O. By default they run on the scheduler's thread
+        and must return quickly.
+    """
+
+    def __init__(
+        self,
+        wait: float,
+        function: Callable,
+        leading: bool = False,
+        trailing: bool = True,
+        throttle: bool = False,
+        key: Optional[Callable[..., Hashable]] = None,
+        executor: Optional[Executor] = None,
+    ):
+        if not (leading or trailing):
+            raise ValueError("At least one of `leading` and `trailing` must be set.")
+
+        self.wait = wait
+        self.function = function
+        self.leading = leading
+        self.trailing = trailing
+        self.throttle = throttle
+        self._key = key
+        self._executor = executor
+
+        self._pending: dict[tuple, _Pending] = {}
+        self._sessions: set = set()
+        self._lock = Lock()
+
+    def __call__(self, *args, **kwargs) -> Optional[Future]:
+        """
+        Register a call. Returns a future for the result of the call that
+        will be made in its place, or ``None`` if the call is dropped.
+        """
+        context = _current_context()
+        session = getattr(context, "id", None)
+        key = (session, self._key(*args, **kwargs) if self._key else None)
+
+        with self._lock:
+            if session is not None and session not in self._sessions:
+                self._sessions.add(session)
+                context.on_close(lambda: self.flush(session))
+
+            pending = self._pending.get(key)
+            leading = pending is None and self.leading
+
+            if pending is None:
+                pending = self._pending[key] = _Pending(context)
+                pending.handle = SCHEDULER.call_later(self.wait, self._expire, key)
+            elif not self.throttle:
+                pending.handle.cancel()
+                pending.handle = SCHEDULER.call_later(self.wait, self._expire, key)
+
+            if not leading:
+                if not self.trailing:
+                    return None
+                pending.args, pending.kwargs = args, kwargs
+                if pending.future is None:
+                    pending.future = Future()
+                return pending.future
+
+        future = Future()
+        self._invoke(future, None, args, kwargs)
+        return future
+
+    def _expire(self, key: tuple):
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                return
+
+            if pending.future is None:
+                del self._pending[key]
+                return
+
+            call = (pending.future, pending.context, pending.args, pending.kwargs)
+            pending.future = pending.args = pending.kwargs = None
+
+            if self.throttle:
+                # Keep the window open so that the next call waits for it
+                pending.handle = SCHEDULER.call_later(self.wait, self._expire, key)
+            else:
+                del self._pending[key]
+
+        if self._executor is not None:
+            self._executor.submit(self._invoke, *call)
+        else:
+            self._invoke(*call)
+
+    def _invoke(self, future: Future, context: Any, args: tuple, kwargs: dict):
+        try:
+            if context is None:
+                result = self.function(*args, **kwargs)
+            else:
+                with context:
+                    result = self.function(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Debounced call of %r failed: %s", self.function, e)
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def _take(self, session) -> list[_Pending]:
+        with self._lock:
+            keys = [
+                key for key in self._pending if session is None or key[0] == session
+            ]
+            taken = [self._pending.pop(key) for key in keys]
+        for pending in taken:
+            pending.handle.cancel()
+        return taken
+
+    def flush(self, session: Optional[str] = None):
+        """
+        Make the pending trailing calls right away, in the calling thread,
+        for the kernel ``session`` or for all sessions.
+        """
+        if session is not None:
+            with self._lock:
+                self._sessions.discard(session)
+        for pending in self._take(session):
+            if pending.future is not None:
+                self._invoke(
+                    pending.future, pending.context, pending.args, pending.kwargs
+                )
+
+    def cancel(self, session: Optional[str] = None):
+        """Drop the pending calls of the kernel ``session``, or of all sessions."""
+        for pending in self._take(session):
+            if pending.future is not None:
+                pending.future.cancel()
@@ -55,7 +55,9 @@ def BaseSetup(
         educator_mode = False
 
         if bool(auth.user.value):
-            if remote_api.is_educator:
+            # Resolve who the user is once; the API methods called for the
+            #  rest of the session read it from memory
+            if remote_api.resolve_identity().is_educator:
                 debug_mode.set(True)
                 educator_mode = True
                 Ref(global_state.fields.update_db).set(False)
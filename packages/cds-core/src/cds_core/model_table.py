@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import Any, ClassVar, Iterable, Mapping, Sequence, Type
+
+import numpy as np
+from glue.core import Data
+from glue.core.roi import CategoricalComponent
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined, core_schema
+
+from .utils import component_type_for_field
+
+__all__ = ["ModelTable"]
+
+
+class ModelTable:
+    """
+    Immutable, column-oriented table of records of a pydantic model.
+
+    Each field of ``model`` is stored as one numpy array instead of keeping
+    one model instance per row, which makes large tables cheap to hold and
+    lets them be handed to glue without walking every row. Numeric fields
+    are stored as ``float64`` (with ``NaN`` for missing values), or as
+    ``int64`` if they are required integers; all other fields are stored as
+    object arrays and become categorical components in glue.
+
+    Subclasses set ``model``, and may change the stored columns by
+    overriding `column_fields` and `_record`.
+
+    Parameters
+    ----------
+    columns : mapping of str to array-like
+        The values of each column. All columns must have the same length.
+    """
+
+    model: ClassVar[Type[BaseModel]]
+
+    def __init__(self, columns: Mapping[str, Any]):
+        fields = self.column_fields()
+        missing = set(fields) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        self._columns = {}
+        for name, info in fields.items():
+            # Columns are shared between tables, so only read-only views
+            #  of them are kept
+            column = self._as_column(columns[name], info).view()
+            column.flags.writeable = False
+            self._columns[name] = column
+
+        lengths = {len(column) for column in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def column_fields(cls) -> dict[str, FieldInfo]:
+        """The names and field infos of the stored columns."""
+        return dict(cls.model.model_fields)
+
+    @staticmethod
+    def _dtype(info: FieldInfo) -> Any:
+        if component_type_for_field(info) is CategoricalComponent:
+            return object
+        if info.annotation is int:
+            return np.int64
+        return np.float64
+
+    @classmethod
+    def _as_column(cls, values: Any, info: FieldInfo) -> np.ndarray:
+        dtype = cls._dtype(info)
+        if dtype is object:
+            column = np.empty(len(values), dtype=object)
+            column[:] = list(values)
+            return column
+        return np.asarray(values, dtype=dtype)
+
+    @classmethod
+    def _record(cls, item: BaseModel) -> Mapping[str, Any]:
+        """Return the column values of a single model instance."""
+        return {name: getattr(item, name) for name in cls.column_fields()}
+
+    @classmethod
+    def empty(cls) -> ModelTable:
+        return cls.from_records([])
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> ModelTable:
+        """
+        Build a table directly from records such as parsed API JSON. Fields
+        missing from a record take the default of the model field.
+        """
+        columns = {}
+        for name, info in cls.column_fields().items():
+            default = None if info.default is PydanticUndefined else info.default
+            columns[name] = [record.get(name, default) for record in records]
+        return cls(columns)
+
+    @classmethod
+    def from_models(cls, items: Iterable[BaseModel]) -> ModelTable:
+        return cls.from_records([cls._record(item) for item in items])
+
+    @classmethod
+    def concat(cls, *tables: ModelTable) -> ModelTable:
+        """Return a table holding the rows of all ``tables`` in order."""
+        return cls(
+            {
+                name: np.concatenate([table[name] for table in tables])
+                for name in cls.column_fields()
+            }
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    @property
+    def columns(self) -> Mapping[str, np.ndarray]:
+        return dict(self._columns)
+
+    def select(self, mask: Any) -> ModelTable:
+        """Return the rows selected by a boolean mask or index array."""
+        return type(self)(
+            {name: column[mask] for name, column in self._columns.items()}
+        )
+
+    def with_column(self, name: str, value: Any) -> ModelTable:
+        """Return a copy of the table with ``name`` set to ``value``."""
+        columns = dict(self._columns)
+        columns[name] = np.broadcast_to(value, self._length)
+        return type(self)(columns)
+
+    def unique(self, name: str) -> list:
+        """Return the sorted distinct values of a column."""
+        return np.unique(self._columns[name]).tolist()
+
+    def to_records(self) -> list[dict[str, Any]]:
+        names = list(self._columns)
+        return [
+            dict(zip(names, row))
+            for row in zip(*(column.tolist() for column in self._columns.values()))
+        ]
+
+    def to_glue_data(self, label: str | None = None) -> Data:
+        """Create a glue `~glue.core.Data` with one component per column."""
+        fields = self.column_fields()
+        data_dict = {
+            name: component_type_for_field(fields[name])(column)
+            for name, column in self._columns.items()
+        }
+        if label:
+            data_dict["label"] = label
+        return Data(**data_dict)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} with {self._length} rows>"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, _source_type: Any, _handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        def validate(value: Any) -> ModelTable:
+            if isinstance(value, cls):
+                return value
+            items = list(value)
+            if items and isinstance(items[0], BaseModel):
+                return cls.from_models(items)
+            return cls.from_records(items)
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda table: table.to_records()
+            ),
+        )
@@ -0,0 +1,229 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+from solara import Reactive
+
+from .base_states import BaseAppState
+from .debounce import Debouncer
+from .logger import setup_logger
+
+logger = setup_logger("PERSISTENCE")
+
+__all__ = ["StatePersistence", "changed_paths", "build_patch"]
+
+StatePath = tuple[Any, ...]
+
+# Pool the flushes of every session run in. Each flush is a blocking round
+#  trip to the API and a session flushes at most once every `debounce`
+#  seconds, so it should hold about one worker per 20 sessions expected to
+#  be active at once. Workers are only started as flushes overlap.
+PERSISTENCE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("CDS_PERSISTENCE_WORKERS", 32)),
+    thread_name_prefix="cds-persistence",
+)
+
+
+def _serializable_fields(model: BaseModel) -> list[str]:
+    fields = [
+        name for name, info in type(model).model_fields.items() if not info.exclude
+    ]
+    return fields + list(type(model).model_computed_fields)
+
+
+def changed_paths(old: Any, new: Any, path: StatePath = ()) -> list[StatePath]:
+    """
+    Walk two versions of a state tree and return the paths of the leaves
+    that differ between them.
+
+    Setting a field through a ``Ref`` copies only the models along the path
+    to that field, so every untouched subtree is shared between ``old`` and
+    ``new`` and is skipped with a single identity check. Lists and scalars
+    are treated as leaves; fields excluded from serialization are ignored.
+    """
+    if old is new:
+        return []
+
+    if (
+        isinstance(old, BaseModel)
+        and isinstance(new, BaseModel)
+        and type(old) is type(new)
+    ):
+        paths = []
+        for name in _serializable_fields(new):
+            paths.extend(
+                changed_paths(getattr(old, name), getattr(new, name), path + (name,))
+            )
+        return paths
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        paths = []
+        for key, value in new.items():
+            if key not in old:
+                paths.append(path + (key,))
+            else:
+                paths.extend(changed_paths(old[key], value, path + (key,)))
+        return paths
+
+    if old != new:
+        return [path]
+
+    return []
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (list, tuple)):
+        return [_dump(x) for x in value]
+    if isinstance(value, dict):
+        return {k: _dump(v) for k, v in value.items()}
+    return value
+
+
+def _resolve(root: Any, path: StatePath) -> Any:
+    value = root
+    for key in path:
+        if isinstance(value, dict):
+            value = value[key]
+        else:
+            value = getattr(value, key)
+    return value
+
+
+def build_patch(state: BaseModel, paths: set[StatePath]) -> dict:
+    """
+    Build a nested patch dictionary holding the current value of each of
+    the given paths in ``state``. Only the dirty subtrees are serialized.
+    """
+    patch: dict = {}
+
+    # Writing a shorter path first lets any longer path beneath it be
+    #  skipped, since its value is already contained in the parent dump.
+    for path in sorted(paths, key=len):
+        current = patch
+        for key in path[:-1]:
+            current = current.setdefault(key, {})
+            if not isinstance(current, dict):
+                break
+        if not isinstance(current, dict) or path[-1] in current:
+            continue
+
+        try:
+            current[path[-1]] = _dump(_resolve(state, path))
+        except (AttributeError, KeyError):
+            # The path was removed again before the flush
+            continue
+
+    return patch
+
+
+class StatePersistence:
+    """
+    Write-behind persistence for a reactive app state.
+
+    Instead of periodically dumping and diffing the whole state, this
+    subscribes to changes of ``app_state`` and records the paths that were
+    modified. Changes arriving within ``debounce`` seconds of each other are
+    coalesced and handed to ``write`` as a single patch. Flushes are timed by
+    the shared scheduler and run on `PERSISTENCE_EXECUTOR`, so while nothing
+    changes this costs no CPU and holds no thread.
+
+    Parameters
+    ----------
+    app_state : `~solara.Reactive`
+        The reactive app state to persist.
+    write : callable
+        Called with the nested patch dictionary on every flush.
+    debounce : float
+        The number of seconds to wait for further changes before flushing.
+    """
+
+    def __init__(
+        self,
+        app_state: Reactive[BaseAppState],
+        write: Callable[[dict], Any],
+        debounce: float = 2.0,
+    ):
+        self._app_state = app_state
+        self._write = write
+        self.debounce = debounce
+
+        self._dirty: set[StatePath] = set()
+        self._lock = Lock()
+        # Held while writing, so that patches reach the database in order
+        self._write_lock = Lock()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._flush_later = Debouncer(
+            debounce, self.flush, executor=PERSISTENCE_EXECUTOR
+        )
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def start(self):
+        """Begin listening for changes to the app state."""
+        with self._lock:
+            if self._unsubscribe is None:
+                self._unsubscribe = self._app_state.subscribe_change(
+                    self._on_change
+                )
+
+    def _on_change(self, new: BaseAppState, old: BaseAppState):
+        paths = changed_paths(old, new)
+        if not paths:
+            return
+
+        with self._lock:
+            self._dirty.update(paths)
+
+        self._flush_later()
+
+    def flush(self) -> bool:
+        """Write any pending changes immediately."""
+        with self._write_lock:
+            with self._lock:
+                paths, self._dirty = self._dirty, set()
+
+            if not paths:
+                return False
+
+            patch = build_patch(self._app_state.value, paths)
+            if not patch:
+                return False
+
+            logger.debug("Flushing %d changed path(s).", len(paths))
+            try:
+                self._write(patch)
+            except Exception:
+                # Keep the paths dirty, so that the next flush retries them
+                with self._lock:
+                    self._dirty.update(paths)
+                raise
+            return True
+
+    def write_all(self):
+        """Write the full state, which also covers any pending changes."""
+        with self._write_lock:
+            with self._lock:
+                paths, self._dirty = self._dirty, set()
+
+            try:
+                self._write(self._app_state.value.as_dict())
+            except Exception:
+                with self._lock:
+                    self._dirty.update(paths)
+                raise
+
+    def close(self):
+        """Stop listening for changes and flush what is left."""
+        with self._lock:
+            if self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+
+        self._flush_later.cancel()
+        self.flush()
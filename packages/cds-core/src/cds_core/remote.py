@@ -1,8 +1,11 @@
 import hashlib
 import json
 import os
-from functools import cached_property
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
 
+from cds_client import CDSAPIError, CDSClient, CDSNotFoundError, shared_client
 from requests import Session
 from typing import Optional
 from solara import Reactive
@@ -17,19 +20,44 @@ from .utils import CDSJSONEncoder
 logger = setup_logger("API")
 
 
+@lru_cache(maxsize=1024)
+def _hash_user_ref(user_ref: str) -> str:
+    return hashlib.sha1(
+        (user_ref + os.environ["SOLARA_SESSION_SECRET_KEY"]).encode()
+    ).hexdigest()
+
+
+@dataclass
+class Identity:
+    """
+    What the API knows about the user of a session. Each flag is looked up
+    the first time it is needed and then kept for the rest of the session.
+    """
+
+    hashed_user: str
+    is_educator: Optional[bool] = None
+    user_exists: Optional[bool] = None
+
+
 class BaseAPI:
     API_URL = "https://api.cosmicds.cfa.harvard.edu"
 
-    @cached_property
-    def request_session(self):
+    @property
+    def client(self) -> CDSClient:
         """
-        Returns a `requests.Session` object that has the relevant authorization
-        parameters to interface with the CosmicDS API server (provided that
-        environment variables are set correctly).
+        The `CDSClient` shared by every API object and every session in the
+        process, authorized with the ``CDS_API_KEY`` environment variable.
         """
-        session = Session()
-        session.headers.update({"Authorization": os.getenv("CDS_API_KEY")})
-        return session
+        return shared_client(base_url=self.API_URL)
+
+    @property
+    def request_session(self) -> Session:
+        """
+        The pooled `requests.Session` of the shared client, for the routes
+        that have no endpoint method in `cds_client`. Build URLs against
+        ``API_URL``.
+        """
+        return self.client.session.http
 
     @property
     def hashed_user(self):
@@ -49,34 +77,98 @@ class BaseAPI:
 
         user_ref = userinfo.get("cds/email", userinfo["cds/name"])
 
-        hashed = hashlib.sha1(
-            (user_ref + os.environ["SOLARA_SESSION_SECRET_KEY"]).encode()
-        ).hexdigest()
+        return _hash_user_ref(user_ref)
+
+    # Number of identity lookups served from memory instead of the API
+    identity_lookups_saved = 0
+    _identity_lock = Lock()
+
+    @staticmethod
+    def _identity_store() -> dict | None:
+        """
+        Per-kernel storage of the identity, dropped along with the kernel
+        when the session closes.
+        """
+        import solara.server.kernel_context as kernel_context
 
-        return hashed
+        if not kernel_context.has_current_context():
+            # Not running inside a session, e.g. in a background thread
+            return None
+        context = kernel_context.get_current_context()
+        return context.user_dicts.setdefault("cds-identity", {})
+
+    @property
+    def identity(self) -> Identity:
+        """
+        The identity of the current session's user. It is kept for the
+        lifetime of the session's kernel, and replaced if the authenticated
+        user changes.
+        """
+        hashed_user = self.hashed_user
+        store = self._identity_store()
+        identity = store.get("identity") if store is not None else None
+
+        if identity is None or identity.hashed_user != hashed_user:
+            identity = Identity(hashed_user=hashed_user)
+            self._store_identity(identity)
+
+        return identity
+
+    def _store_identity(self, identity: Identity):
+        store = self._identity_store()
+        if store is not None:
+            store["identity"] = identity
+
+    def _lookup_identity(self, field: str, fetch) -> bool:
+        identity = self.identity
+        value = getattr(identity, field)
+
+        if value is None:
+            value = fetch(identity.hashed_user)
+            setattr(identity, field, value)
+            self._store_identity(identity)
+        else:
+            with self._identity_lock:
+                BaseAPI.identity_lookups_saved += 1
+
+        return value
+
+    def _fetch_user_exists(self, hashed_user: str) -> bool:
+        return self.client.students.get(hashed_user) is not None
+
+    def _fetch_is_educator(self, hashed_user: str) -> bool:
+        return self.client.educators.get(hashed_user) is not None
 
     @property
     def user_exists(self):
-        r = self.request_session.get(f"{self.API_URL}/student/{self.hashed_user}")
-        return r.json()["student"] is not None
+        return self._lookup_identity("user_exists", self._fetch_user_exists)
 
     @property
     def is_educator(self):
-        r = self.request_session.get(f"{self.API_URL}/educators/{self.hashed_user}")
-        return r.json()["educator"] is not None
+        return self._lookup_identity("is_educator", self._fetch_is_educator)
+
+    def resolve_identity(self) -> Identity:
+        """
+        Look up every identity flag of the current user at once, so that
+        the API methods called later in the session answer from memory.
+        """
+        self.is_educator
+        self.user_exists
+        return self.identity
+
+    def invalidate_identity(self):
+        """Forget the identity of the current session's user."""
+        store = self._identity_store()
+        if store is not None:
+            store.pop("identity", None)
 
     def update_class_size(self, state: Reactive[BaseAppState]):
         class_id = state.value.classroom.class_info["id"]
-        size_json = self.request_session.get(
-            f"{self.API_URL}/classes/size/{class_id}"
-        ).json()
-        Ref(state.fields.classroom.size).set(size_json["size"])
+        size = self.client.classes.get_size(class_id)
+        Ref(state.fields.classroom.size).set(size)
 
     def load_user_info(self, story_name: str, state: Reactive[BaseAppState]):
-        student_json = self.request_session.get(
-            f"{self.API_URL}/student/{self.hashed_user}"
-        ).json()["student"]
-        sid = student_json["id"]
+        sid = self.client.students.get(self.hashed_user).id
 
         class_json = self.request_session.get(
             f"{self.API_URL}/class-for-student-story/{sid}/{story_name}"
@@ -91,10 +183,7 @@ class BaseAPI:
     def create_new_user(
         self, story_name: str, class_code: str, state: Reactive[BaseAppState]
     ):
-        r = self.request_session.get(f"{self.API_URL}/student/{self.hashed_user}")
-        student = r.json()["student"]
-
-        if student is not None:
+        if self.client.students.get(self.hashed_user) is not None:
             logger.error(
                 "Failed to create user `%s`: user already exists.", self.hashed_user
             )
@@ -117,6 +206,10 @@ class BaseAPI:
             logger.error("Failed to create new user.")
             return
 
+        identity = self.identity
+        identity.user_exists = True
+        self._store_identity(identity)
+
         logger.info(
             "Created new user `%s` with class code '%s'.",
             self.hashed_user,
@@ -177,29 +270,26 @@ class BaseAPI:
             logger.info("Skipping deletion of stage state.")
             return
 
-        r = self.request_session.delete(
-            f"{self.API_URL}/stage-state/{global_state.value.student.id}/"
-            f"{local_state.value.story_id}/{component_state.value.stage_id}"
-        )
-
-        if r.status_code != 200:
+        try:
+            self.client.stories.delete_stage_state(
+                global_state.value.student.id,
+                local_state.value.story_id,
+                component_state.value.stage_id,
+            )
+        except CDSNotFoundError:
             logger.error(
                 "Stage state for stage `%s`, story `%s` user `%s` did not exist in database.",
                 component_state.value.stage_id,
                 local_state.value.story_id,
                 global_state.value.student.id,
             )
-            return
-
-        result = r.json()
-        if not result.get("success", False):
+        except CDSAPIError:
             logger.error(
                 "Error deleting stage state for stage `%s`, story `%s` user `%s`.",
                 component_state.value.stage_id,
                 local_state.value.story_id,
                 global_state.value.student.id,
             )
-            return
 
     def get_app_story_states(
         self,
@@ -298,21 +388,16 @@ class BaseAPI:
     ):
         stu_id = student_id or self.hashed_user
 
-        r = self.request_session.put(
-            f"{self.API_URL}/students/ignore/{stu_id}/{story_name}",
-            json={
-                "ignore": ignore,
-            }
-        )
-
-        if r.status_code != 200:
+        try:
+            self.client.students.ignore_for_story(stu_id, story_name, ignore=ignore)
+        except CDSAPIError:
             logger.error(f"Failed to update ignored status for student {stu_id} for story {story_name}")
             return
 
         logger.info(f"Set student {stu_id}'s ignored status to {ignore} for story {story_name}")
 
-    @staticmethod
-    def clear_user(state: Reactive[BaseAppState]):
+    def clear_user(self, state: Reactive[BaseAppState]):
+        self.invalidate_identity()
         Ref(state.fields.student.id).set(0)
         Ref(state.fields.classroom.class_info).set({})
         Ref(state.fields.classroom.size).set(0)
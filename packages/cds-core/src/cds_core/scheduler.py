@@ -0,0 +1,272 @@
+import asyncio
+import os
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Optional
+
+from .logger import setup_logger
+
+logger = setup_logger("SCHEDULER")
+
+__all__ = ["TimerHandle", "TimerWheel", "SCHEDULER"]
+
+# Seconds between two ticks of the scheduler, i.e. the precision of timers
+SCHEDULER_RESOLUTION = float(os.getenv("CDS_SCHEDULER_RESOLUTION", 0.1))
+
+# Number of slots of the timer wheel. Timers further away than one turn of
+#  the wheel wait for the required number of turns in their slot.
+SCHEDULER_SLOTS = int(os.getenv("CDS_SCHEDULER_SLOTS", 512))
+
+
+class _Timer:
+    __slots__ = (
+        "ticks",
+        "function",
+        "args",
+        "kwargs",
+        "context",
+        "session",
+        "repeat",
+        "rounds",
+        "cancelled",
+    )
+
+    def __init__(self, ticks, function, args, kwargs, context, session, repeat):
+        self.ticks = ticks
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.context = context
+        self.session = session
+        self.repeat = repeat
+        self.rounds = 0
+        self.cancelled = False
+
+
+class TimerHandle:
+    """A timer registered with a `TimerWheel`, which can be cancelled."""
+
+    def __init__(self, wheel: "TimerWheel", timer: _Timer):
+        self._wheel = wheel
+        self._timer = timer
+
+    @property
+    def active(self) -> bool:
+        return not self._timer.cancelled
+
+    def cancel(self):
+        self._wheel._cancel(self._timer)
+
+
+def _current_context() -> Optional[Any]:
+    """The solara kernel context of the calling thread, if any."""
+    try:
+        import solara.server.kernel_context as kernel_context
+    except ImportError:
+        return None
+
+    if not kernel_context.has_current_context():
+        return None
+    return kernel_context.get_current_context()
+
+
+class TimerWheel:
+    """
+    Process-wide scheduler running timers from a single thread.
+
+    Timers are kept in a hashed timer wheel: each tick of the scheduler
+    only looks at the timers in one slot of the wheel, so the cost of a tick
+    does not grow with the number of timers. Callbacks run in the
+    scheduler's thread, inside the solara kernel context of the session
+    that registered them, and so must return quickly. A timer registered
+    from a session is cancelled automatically when the session's kernel
+    shuts down.
+
+    The thread is started with the first timer, and sleeps while no timers
+    are active.
+
+    Parameters
+    ----------
+    resolution : float
+        Seconds between two ticks. Intervals are rounded to a multiple of
+        this.
+    slots : int
+        Number of slots of the wheel.
+    """
+
+    def __init__(
+        self, resolution: float = SCHEDULER_RESOLUTION, slots: int = SCHEDULER_SLOTS
+    ):
+        self.resolution = resolution
+        self._slots: list[list[_Timer]] = [[] for _ in range(slots)]
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._thread: Optional[Thread] = None
+
+        # Number of ticks processed so far, and the time of the first tick
+        self._now = 0
+        self._start = time.monotonic()
+
+        self._active = 0
+        self._sessions: dict[str, set[_Timer]] = {}
+
+        # Seconds by which the latest tick, and the latest tick at most,
+        #  ran behind schedule
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.fired = 0
+
+    def call_every(
+        self, interval: float, function: Callable, *args, **kwargs
+    ) -> TimerHandle:
+        """
+        Call ``function(*args, **kwargs)`` every ``interval`` seconds until
+        the returned handle is cancelled.
+        """
+        return self._schedule(interval, function, args, kwargs, repeat=True)
+
+    def call_later(
+        self, delay: float, function: Callable, *args, **kwargs
+    ) -> TimerHandle:
+        """
+        Call ``function(*args, **kwargs)`` once, after ``delay`` seconds,
+        unless the returned handle is cancelled first.
+        """
+        return self._schedule(delay, function, args, kwargs, repeat=False)
+
+    def _schedule(self, interval, function, args, kwargs, repeat) -> TimerHandle:
+        context = _current_context()
+        session = getattr(context, "id", None)
+        ticks = max(1, round(interval / self.resolution))
+        timer = _Timer(ticks, function, args, kwargs, context, session, repeat)
+
+        with self._lock:
+            self._insert(timer, self._now)
+            self._active += 1
+
+            if session is not None and session not in self._sessions:
+                self._sessions[session] = set()
+                context.on_close(lambda: self.cancel_session(session))
+            if session is not None:
+                self._sessions[session].add(timer)
+
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="cds-scheduler", daemon=True
+                )
+                self._thread.start()
+
+        self._wakeup.set()
+        return TimerHandle(self, timer)
+
+    def _insert(self, timer: _Timer, now: int):
+        slots = len(self._slots)
+        timer.rounds = (timer.ticks - 1) // slots
+        self._slots[(now + timer.ticks) % slots].append(timer)
+
+    def _cancel(self, timer: _Timer):
+        with self._lock:
+            if timer.cancelled:
+                return
+            timer.cancelled = True
+            self._active -= 1
+            if timer.session in self._sessions:
+                self._sessions[timer.session].discard(timer)
+
+    def cancel_session(self, session: str):
+        """Cancel all timers registered from the kernel ``session``."""
+        with self._lock:
+            timers = self._sessions.pop(session, set())
+        for timer in timers:
+            self._cancel(timer)
+        if timers:
+            logger.info("Cancelled %d timers of session `%s`.", len(timers), session)
+
+    def _advance(self, tick: int) -> list[_Timer]:
+        """
+        Process the ticks up to ``tick`` and return the timers that are due,
+        each only once even if it came due several times.
+        """
+        due: dict[int, _Timer] = {}
+        with self._lock:
+            while self._now < tick:
+                self._now += 1
+                slot = self._slots[self._now % len(self._slots)]
+                waiting, fired = [], []
+                for timer in slot:
+                    if timer.cancelled:
+                        continue
+                    if timer.rounds > 0:
+                        timer.rounds -= 1
+                        waiting.append(timer)
+                    else:
+                        fired.append(timer)
+                slot[:] = waiting
+
+                for timer in fired:
+                    due[id(timer)] = timer
+                    if timer.repeat:
+                        self._insert(timer, self._now)
+
+        return list(due.values())
+
+    def _fire(self, timer: _Timer):
+        try:
+            if timer.context is None:
+                timer.function(*timer.args, **timer.kwargs)
+            else:
+                with timer.context:
+                    timer.function(*timer.args, **timer.kwargs)
+        except Exception as e:
+            logger.warning("Timer callback %r failed: %s", timer.function, e)
+
+    def _run(self):
+        # Callbacks used to run with a fresh event loop of their own, so set
+        #  one for the scheduler's thread
+        asyncio.set_event_loop(asyncio.new_event_loop())
+
+        while True:
+            if self._active == 0:
+                self._wakeup.clear()
+                while self._active == 0:
+                    self._wakeup.wait()
+                    self._wakeup.clear()
+                # Do not try to catch up with the ticks missed while idle
+                self._start = time.monotonic() - self._now * self.resolution
+
+            next_tick = self._start + (self._now + 1) * self.resolution
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            now = time.monotonic()
+            self.last_lag = max(0.0, now - next_tick)
+            self.max_lag = max(self.max_lag, self.last_lag)
+
+            # Ticks missed while callbacks were running are processed at once
+            tick = max(self._now + 1, int((now - self._start) / self.resolution))
+            for timer in self._advance(tick):
+                if not timer.cancelled:
+                    self._fire(timer)
+                    self.fired += 1
+                if not timer.repeat:
+                    self._cancel(timer)
+
+    @property
+    def active_timers(self) -> int:
+        return self._active
+
+    def stats(self) -> dict[str, Any]:
+        """The number of active timers and sessions, and the tick lag."""
+        with self._lock:
+            sessions = sum(1 for timers in self._sessions.values() if timers)
+        return {
+            "active_timers": self._active,
+            "sessions": sessions,
+            "fired": self.fired,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
+
+
+SCHEDULER = TimerWheel()
@@ -27,12 +27,12 @@ from plotly.graph_objects import Scatter
 
 from glue.core.state_objects import State
 import numpy as np
-from threading import Timer, Event
 from functools import wraps
 from traitlets import Unicode
-from zmq.eventloop.ioloop import IOLoop
 from enum import Enum
 
+from .debounce import Debouncer
+
 __all__ = [
     "load_template",
     "update_figure_css",
@@ -43,8 +43,8 @@ __all__ = [
     "vertical_line_mark",
     "API_URL",
     "CDSJSONEncoder",
-    "RepeatedTimer",
     "debounce",
+    "throttle",
 ]
 
 # The URL for the CosmicDS API
@@ -83,36 +83,6 @@ class CDSJSONEncoder(json.JSONEncoder):
         return super(CDSJSONEncoder, self).default(obj)
 
 
-# JC: I got this from https://stackoverflow.com/a/13151299
-class RepeatedTimer(object):
-    def __init__(self, interval, function, *args, **kwargs):
-        self._timer = None
-        self.interval = interval
-        self.function = function
-        self.args = args
-        self.kwargs = kwargs
-        self.is_running = False
-        self.start()
-
-    def _run(self):
-        self.is_running = False
-        loop = IOLoop()
-        loop.make_current()
-        self.start()
-        self.function(*self.args, **self.kwargs)
-        loop.close()
-
-    def start(self):
-        if not self.is_running:
-            self._timer = Timer(self.interval, self._run)
-            self._timer.start()
-            self.is_running = True
-
-    def stop(self):
-        self._timer.cancel()
-        self.is_running = False
-
-
 def load_template(file_name, path=None, traitlet=False):
     """
     Load a vue template file and instantiate the appropriate traitlet object.
@@ -326,53 +296,59 @@ def vertical_line_mark(layer, x, color, label=None):
     )
 
 
-def debounce(wait):
+def debounce(wait, leading=False, trailing=True, key=None, executor=None):
     """
     Decorator that will postpone a function's execution until after `wait` seconds have elapsed
-    since the last time it was invoked.
+    since the last time it was invoked. Calls are debounced separately for each session (and
+    each `key`, if given), on the shared scheduler. See `cds_core.debounce.Debouncer` for the
+    parameters. The decorated function has `flush` and `cancel` methods for the pending calls.
     """
 
     def decorator(fn):
-        def debounced(*args, **kwargs):
-            def call_it():
-                return fn(*args, **kwargs)
-
-            if hasattr(debounced, "_timer"):
-                debounced._timer.cancel()
+        debouncer = Debouncer(
+            wait,
+            fn,
+            leading=leading,
+            trailing=trailing,
+            key=key,
+            executor=executor,
+        )
 
-            debounced._timer = Timer(wait, call_it)
-            debounced._timer.start()
+        @wraps(fn)
+        def debounced(*args, **kwargs):
+            return debouncer(*args, **kwargs)
 
+        debounced.flush = debouncer.flush
+        debounced.cancel = debouncer.cancel
         return debounced
 
     return decorator
 
 
-def _debounce(wait):
+def throttle(wait, leading=True, trailing=True, key=None, executor=None):
     """
-    Decorator that will postpone a function's execution until after `wait` seconds have elapsed
-    since the last time it was invoked, and return the result of the function.
+    Decorator that will execute a function at most once every `wait` seconds, per session (and
+    `key`, if given). See `cds_core.debounce.Debouncer` for the parameters.
     """
 
     def decorator(fn):
-        @wraps(fn)
-        def debounced(*args, **kwargs):
-            def call_it():
-                debounced._result = fn(*args, **kwargs)
-                debounced._called.set()
-
-            if hasattr(debounced, "_timer"):
-                debounced._timer.cancel()
-
-            debounced._timer = Timer(wait, call_it)
-            debounced._timer.start()
-
-            debounced._called = Event()
-            debounced._called.wait()
+        throttler = Debouncer(
+            wait,
+            fn,
+            leading=leading,
+            trailing=trailing,
+            throttle=True,
+            key=key,
+            executor=executor,
+        )
 
-            return getattr(debounced, "_result", None)
+        @wraps(fn)
+        def throttled(*args, **kwargs):
+            return throttler(*args, **kwargs)
 
-        return debounced
+        throttled.flush = throttler.flush
+        throttled.cancel = throttler.cancel
+        return throttled
 
     return decorator
 
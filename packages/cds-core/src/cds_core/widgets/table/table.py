@@ -8,16 +8,72 @@ from glue.core.message import (
 )
 from glue.core import HubListener
 from glue.core.subset import SubsetState
+from glue.utils import categorical_ndarray
 from ipyvuetify import VuetifyTemplate
 from traitlets import Bool, Dict, List, Unicode, observe
 
 from ...utils import convert_material_color, load_template
 
-__all__ = ["Table"]
+__all__ = ["KeySubsetState", "Table"]
 
 _DEFAULT_TRANSFORM = lambda x: x
 
 
+def _same_row(item, other):
+    # NaN != NaN, so compare missing measurements separately
+    return item == other or (
+        item.keys() == other.keys()
+        and all(
+            value == other[key]
+            or (value != value and other[key] != other[key])
+            for key, value in item.items()
+        )
+    )
+
+
+class KeySubsetState(SubsetState):
+    """
+    A subset defined by the rows whose key is one of a set of keys, computed
+    with a single hashed membership test over the key attribute.
+
+    Parameters
+    ----------
+    att : :class:`~glue.core.component_id.ComponentID`
+        The key attribute of the data.
+    keys : iterable
+        The keys of the rows in the subset. For categorical attributes, these
+        are the labels, not the integer codes.
+    """
+
+    def __init__(self, att, keys):
+        super().__init__()
+        self._att = att
+        self._keys = np.asarray(list(keys)).ravel()
+
+    @property
+    def att(self):
+        return self._att
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def attributes(self):
+        return (self._att,)
+
+    def to_mask(self, data, view=None):
+        values = data[self._att, view]
+        if isinstance(values, categorical_ndarray):
+            # Compare the few category codes instead of every label
+            codes = np.flatnonzero(np.isin(values.categories, self._keys))
+            return np.isin(values.codes, codes)
+        return np.isin(values, self._keys)
+
+    def copy(self):
+        return KeySubsetState(self._att, self._keys)
+
+
 class Table(VuetifyTemplate, HubListener):
     default_color = "dodgerblue"
 
@@ -104,6 +160,13 @@ class Table(VuetifyTemplate, HubListener):
 
         self._row_click_callback = None
 
+        # The current rows, i.e. `items` with the rows patched since it was
+        #  last synced, the position of the row of each key, and the indices
+        #  of the patched rows
+        self._rows = []
+        self._row_index = {}
+        self._patched_rows = set()
+
         # Populate the table with the current data in the collection
         self._populate_table()
 
@@ -178,39 +241,86 @@ class Table(VuetifyTemplate, HubListener):
     def subset_state_from_selected(self, selected):
         keys = [x[self.key_component] for x in selected]
         if keys:
-            state = np.bitwise_or.reduce(
-                [self._glue_data.id[self.key_component] == x for x in keys]
-            )
+            state = KeySubsetState(self._glue_data.id[self.key_component], keys)
         else:
             state = SubsetState()
         return state
 
     def _selection_from_state(self, state):
         mask = state.to_mask(self._glue_data)
-        return [item for index, item in enumerate(self.items) if mask[index]]
+        keys = np.asarray(self._glue_data[self.key_component])[mask].tolist()
+        return [
+            self._rows[self._row_index[key]] for key in keys if key in self._row_index
+        ]
 
     def _transform(self, component):
         return self._transforms.get(component, _DEFAULT_TRANSFORM)
 
+    def _column(self, component):
+        values = np.asarray(self._glue_data[component])
+        transform = self._transform(component)
+        if transform is _DEFAULT_TRANSFORM:
+            return values.tolist()
+        return [transform(value) for value in values.tolist()]
+
+    def _build_items(self):
+        columns = [self._column(component) for component in self._glue_components]
+        return [
+            item
+            for row in zip(*columns)
+            if self.item_filter(item := dict(zip(self._glue_components, row)))
+        ]
+
     def _populate_table(self):
-        df = self._glue_data.to_dataframe()
-        self.headers = [
+        headers = [
             {"text": name, "value": component}
             for name, component in zip(
                 self._glue_component_names, self._glue_components
             )
         ]
-        self.headers[0]["align"] = "start"
-        self.items = [
-            item
-            for _, row in df.iterrows()
-            if self.item_filter(
-                item := {
-                    component: self._transform(component)(row[component])
-                    for component in self._glue_components
-                }
-            )
-        ]
+        headers[0]["align"] = "start"
+        if headers != self.headers:
+            self.headers = headers
+
+        items = self._build_items()
+        keys = [item[self.key_component] for item in items]
+        old_keys = [item[self.key_component] for item in self._rows]
+
+        # Unless rows were inserted, removed or reordered, only send the rows
+        #  that changed or were added at the end. Each view applies them to
+        #  its copy of `items`, until the rows patched since the last full
+        #  sync make up half of the table.
+        if not self._rows or keys[: len(old_keys)] != old_keys:
+            self._sync_items(items)
+        else:
+            changed = {
+                str(index): item
+                for index, item in enumerate(items)
+                if index >= len(self._rows) or not _same_row(item, self._rows[index])
+            }
+            if changed:
+                self._patched_rows.update(changed)
+                if len(self._patched_rows) > len(items) // 2:
+                    self._sync_items(items)
+                else:
+                    self._rows = items
+                    self.send({"method": "patch_rows", "args": [changed]})
+
+        self._row_index = {key: index for index, key in enumerate(keys)}
+
+    def _sync_items(self, items):
+        self.items = items
+        self._rows = items
+        self._patched_rows = set()
+        # `items` is not resent if it equals the last full sync, so tell the
+        #  views to drop their patches explicitly
+        self.send({"method": "reset_rows", "args": []})
+
+    def vue_sync_rows(self, _data=None):
+        # A new view only has `items`, so it needs a full sync if rows were
+        #  patched since
+        if self._patched_rows:
+            self._sync_items(self._rows)
 
     def _new_subset(self):
         state = self.subset_state_from_selected(self.selected)
@@ -244,7 +354,8 @@ class Table(VuetifyTemplate, HubListener):
     def _on_data_deleted(self):
         self.data_collection.remove_subset_group(self._subset)
         self.subset = None
-        self.items = {}
+        self._sync_items([])
+        self._row_index = {}
 
     def _on_data_collection_delete(self, message=None):
         self._on_data_deleted()
@@ -272,7 +383,7 @@ class Table(VuetifyTemplate, HubListener):
     def indices_from_items(self, items):
         state = self.subset_state_from_selected(items)
         mask = state.to_mask(self.glue_data)
-        return [index for index in range(len(mask)) if mask[index]]
+        return np.flatnonzero(mask).tolist()
 
     @property
     def indices(self):
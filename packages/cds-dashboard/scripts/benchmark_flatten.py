@@ -0,0 +1,98 @@
+"""
+Benchmark the single-pass `flatten` against the original recursive
+implementation on a synthetic roster, and check that both give the same
+frame, also when a schema shared with another class is used.
+
+    python packages/cds-dashboard/scripts/benchmark_flatten.py --students 100
+"""
+import argparse
+import random
+import timeit
+
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from cds_dashboard.cds_api_utils.nested_dataframe import flatten, flatten_recursive
+
+STAGES = ['1', '2', '3', '4', '5', '6']
+QUESTIONS_PER_STAGE = 6
+
+
+def make_roster(n_students, seed=42):
+    """
+    Free responses and multiple choice scores shaped like the ones the
+    roster flattens, for `n_students` students at random points in the story
+    """
+    rng = random.Random(seed)
+    responses = {}
+    mc_scoring = {}
+    for stage in STAGES:
+        stage_responses = []
+        stage_scores = []
+        for _ in range(n_students):
+            answered = rng.randint(0, QUESTIONS_PER_STAGE)
+            stage_responses.append({
+                f'fr-{stage}-{q}': f'Response to question {q} ' * rng.randint(1, 5)
+                for q in range(answered)
+            })
+            stage_scores.append({
+                f'mc-{stage}-{q}': {
+                    'tag': f'mc-{stage}-{q}',
+                    'score': rng.choice([0, 5, 10]),
+                    'choice': rng.randint(0, 3),
+                    'tries': rng.randint(1, 3),
+                    'wrong_attempts': [rng.randint(0, 3) for _ in range(rng.randint(0, 2))],
+                }
+                for q in range(answered)
+            } if answered else None)
+        responses[stage] = stage_responses
+        mc_scoring[stage] = stage_scores
+
+    student_id = list(range(1, n_students + 1))
+    return (DataFrame({'student_id': student_id, **responses}),
+            DataFrame({'student_id': student_id, **mc_scoring}))
+
+
+def check_shared_schema():
+    """
+    A class flattened with a schema key shared with an earlier class must
+    expand to the same columns as when it is flattened on its own
+    """
+    key = 'benchmark/cross-class'
+    with_lists = DataFrame({'student_id': [1, 2], '1': [{'q1': ['a', 'b']}, {'q1': ['c']}]})
+    with_strings = DataFrame({'student_id': [3, 4], '1': [{'q1': 'a'}, {'q1': 'b'}]})
+
+    flatten(with_lists.copy(), schema_key=key)
+    expected = flatten_recursive(with_strings.copy())
+    result = flatten(with_strings.copy(), schema_key=key)
+    assert list(result.columns) == ['student_id', '1.q1'], list(result.columns)
+    assert_frame_equal(result, expected, check_dtype=False, check_like=True)
+
+    for name, df in zip(['free responses', 'multiple choice'], make_roster(20, seed=7)):
+        flatten(df.copy(), schema_key=f'{key}/{name}')
+    for name, df in zip(['free responses', 'multiple choice'], make_roster(20, seed=8)):
+        result = flatten(df.copy(), schema_key=f'{key}/{name}')
+        assert_frame_equal(result, flatten_recursive(df.copy()), check_dtype=False, check_like=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    check_shared_schema()
+
+    for name, df in zip(['free responses', 'multiple choice'], make_roster(args.students)):
+        expected = flatten_recursive(df.copy())
+        result = flatten(df.copy())
+        assert_frame_equal(result, expected, check_dtype=False)
+
+        old = min(timeit.repeat(lambda: flatten_recursive(df.copy()), number=1, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: flatten(df.copy()), number=1, repeat=args.repeat))
+        print(f'{name:>16}: {len(result.columns):4d} columns  '
+              f'recursive {old * 1e3:8.1f} ms  single pass {new * 1e3:6.1f} ms  ({old / new:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,11 @@ from requests import Session
 import os
 import json
 import numpy as np
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from pathlib import Path  # python3 only
 from random import randint
@@ -11,6 +15,23 @@ from random import randint
 API_URL = "https://api.cosmicds.cfa.harvard.edu"
 HUBBLE_ROUTE_PATH = "hubbles_law"
 
+# Maximum number of requests to the API in flight at once, across all
+# queries in the process
+QUERY_WORKERS = int(os.getenv('CDS_QUERY_WORKERS', 8))
+
+# Transient failures (connection errors, 429 and 5xx responses) of GET
+# requests are retried this many times, with exponential backoff
+QUERY_RETRIES = int(os.getenv('CDS_QUERY_RETRIES', 3))
+QUERY_BACKOFF = float(os.getenv('CDS_QUERY_BACKOFF', 0.5))
+
+_request_slots = threading.BoundedSemaphore(QUERY_WORKERS)
+# shared by every query in the process, so concurrent queries (and nested
+# `map_concurrent` calls) never start more than QUERY_WORKERS threads
+_query_executor = ThreadPoolExecutor(max_workers = QUERY_WORKERS, thread_name_prefix = 'cds-query')
+_query_worker = threading.local()
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
 _stages = ['introduction',
            'spectra_&_velocity', 
            'distance_introduction', 
@@ -20,6 +41,7 @@ _stages = ['introduction',
            'professional_data']
 
 from ..logger_setup import logger
+from .cache import DASHBOARD_CACHE, ROSTER_TTL, CLASS_DATA_TTL, QUESTIONS_TTL
 
     
 class QueryCosmicDSApi():
@@ -59,10 +81,25 @@ class QueryCosmicDSApi():
         relevant authorization praameters to interface
         with the CosmicDS API server (provided environment 
         variables are set correctly)
+        
+        The session is shared by every query in the process, so they all
+        use one connection pool.
         """
-        session = requests.Session()        
-        session.headers.update({'Authorization': self.get_env()})
-        return session
+        global _shared_session
+        with _shared_session_lock:
+            if _shared_session is None:
+                retry = Retry(total = QUERY_RETRIES,
+                              backoff_factor = QUERY_BACKOFF,
+                              status_forcelist = (429, 500, 502, 503, 504),
+                              allowed_methods = frozenset(['GET']),
+                              raise_on_status = False)
+                adapter = HTTPAdapter(pool_connections = 1, pool_maxsize = QUERY_WORKERS, max_retries = retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({'Authorization': self.get_env()})
+                _shared_session = session
+            return _shared_session
     
     @staticmethod
     def l2d(list_of_dicts):
@@ -75,10 +112,33 @@ class QueryCosmicDSApi():
         dict_of_lists = {k: np.asarray([o[k] for o in list_of_dicts]) for k in keys}
         return dict_of_lists
     
-    def get(self, url):
-        response = self._request_session.get(url)
+    def get(self, url, params = None):
+        with _request_slots:
+            response = self._request_session.get(url, params = params)
         return response
     
+    @staticmethod
+    def _run_in_worker(fn, item):
+        _query_worker.active = True
+        try:
+            return fn(item)
+        finally:
+            _query_worker.active = False
+    
+    @staticmethod
+    def map_concurrent(fn, items):
+        """
+        Returns `fn(item)` for every item, in order, running the calls
+        concurrently on the shared query executor. Calls made from one of
+        its workers run serially instead, so that they cannot wait on
+        workers that are all busy waiting on them.
+        """
+        items = list(items)
+        if len(items) <= 1 or getattr(_query_worker, 'active', False):
+            return [fn(item) for item in items]
+        futures = [_query_executor.submit(QueryCosmicDSApi._run_in_worker, fn, item) for item in items]
+        return [future.result() for future in futures]
+    
     def get_stage(self, student_id, story = None, stage = None):
         # Solara API endpoint
         story = self.story or story
@@ -91,16 +151,106 @@ class QueryCosmicDSApi():
     def get_stages(self, student_id, story = None):
         # Solara API endpoint
         story = self.story or story
-        stages = {}
         
         stage_keys = self.get_stages_for_story(story)
+        stage_names = list(stage_keys.values())
+        responses = self.map_concurrent(lambda stage: self.get_stage(student_id, story = story, stage = stage), stage_names)
+        return self._index_stages(dict(zip(stage_names, responses)), stage_keys)
+    
+    @staticmethod
+    def _index_stages(states, stage_keys):
+        """
+        Returns the stages of one student keyed by stage name, given the
+        stage-state responses of that student. Each stage's state records its
+        index, and stages without a state get one holding only the index.
+        """
+        stages = {}
         for stage_index, stage_name in stage_keys.items():
-            stage = self.get_stage(student_id, story = story, stage = stage_name)
-            if stage['state'] is None:
-                stage['state'] = {'index': stage_index}
-            if stage['state'] is not None:
-                stage['state']['index'] = stage_index
-                stages[stage_name] = stage
+            stage = dict(states.get(stage_name) or {})
+            stage['state'] = dict(stage.get('state') or {})
+            stage['state']['index'] = stage_index
+            stages[stage_name] = stage
+        return stages
+    
+    def list_stage_states(self, class_id = None, story = None):
+        """
+        Returns every stage state of a class in a single request, or None if
+        the API could not provide them.
+        """
+        class_id = self.class_id or class_id
+        story = self.story or story
+        
+        endpoint = f'stage-states/{story}'
+        url = urljoin(self.url_head, endpoint)
+        self.stage_states_url = url
+        try:
+            req = self.get(url, params = {'class_id': class_id})
+            if req.status_code != 200:
+                logger.debug(f"Bulk stage states unavailable for class {class_id}: {req.status_code}")
+                return None
+            data = req.json()
+        except (requests.RequestException, json.JSONDecodeError) as e:
+            logger.debug(f"Bulk stage states unavailable for class {class_id}: {e}")
+            return None
+        
+        # The API returns either a list of stage states or lists of them
+        # grouped by student
+        if isinstance(data, dict):
+            data = [entry for entries in data.values() for entry in entries]
+        return data
+    
+    def get_class_stages(self, student_ids, class_id = None, story = None):
+        """
+        Returns the stages of every student in `student_ids`, keyed by student
+        id, in the same form as `get_stages`.
+        
+        All stage states of the class are fetched in one request. Students
+        the bulk request has nothing for have not started any stage. Only if
+        the request fails is every stage of every student fetched on its own,
+        concurrently.
+        """
+        class_id = self.class_id or class_id
+        story = self.story or story
+        stage_keys = self.get_stages_for_story(story)
+        
+        bulk = self.list_stage_states(class_id = class_id, story = story) if class_id is not None else None
+        if bulk is None:
+            return self._get_stages_individually(student_ids, stage_keys, story)
+        
+        states = {}
+        for entry in bulk:
+            states.setdefault(entry['student_id'], {})[entry['stage_name']] = entry
+        return {student_id: self._index_stages(states.get(student_id, {}), stage_keys)
+                for student_id in student_ids}
+    
+    def _get_stages_individually(self, student_ids, stage_keys, story = None):
+        """
+        Fetches every (student, stage) pair in one flat concurrent map. A
+        student any of whose stages fails to load gets no stages.
+        """
+        student_ids = list(student_ids)
+        logger.debug(f"Fetching stages for {len(student_ids)} students individually")
+        stage_names = list(stage_keys.values())
+        pairs = [(sid, stage) for sid in student_ids for stage in stage_names]
+        
+        failed = object()
+        
+        def _try_get_stage(pair):
+            sid, stage = pair
+            try:
+                return self.get_stage(sid, story = story, stage = stage)
+            except Exception as e:
+                logger.error(f"Failed to fetch stage {stage} for student {sid}: {e}")
+                return failed
+        
+        responses = dict(zip(pairs, self.map_concurrent(_try_get_stage, pairs)))
+        stages = {}
+        for sid in student_ids:
+            states = {stage: responses[(sid, stage)] for stage in stage_names}
+            if any(state is failed for state in states.values()):
+                stages[sid] = {}
+            else:
+                stages[sid] = self._index_stages(states, stage_keys)
         return stages
     
     def get_stages_for_story(self, story = None):
@@ -130,10 +280,9 @@ class QueryCosmicDSApi():
         if (story is not None) and (story != ''):
             endpoint += f'/{story}'
         url = urljoin(self.url_head, endpoint)
-        print(url)
         self.roster_url = url
-        req = self.get(url)
-        return req.json()
+        # shared with every other roster of this class in the process
+        return DASHBOARD_CACHE.get_or_fetch(('roster', class_id, story), lambda: self.get(url).json(), ROSTER_TTL)
     
     def get_student_data(self, student_id, story = None):
         """
@@ -162,6 +311,13 @@ class QueryCosmicDSApi():
         logger.debug(url)
         return self.get(url).json()
     
+    @staticmethod
+    def roster_version(roster):
+        """
+        Identifies the state of a roster by when each student last modified it
+        """
+        return hash(tuple((student['student_id'], str(student.get('last_modified'))) for student in roster))
+    
     def get_class_data(self, class_id = None, student_ids = None, story = None, exclude_merged = False):
         class_id = self.class_id or class_id
         story = self.story or story
@@ -170,6 +326,17 @@ class QueryCosmicDSApi():
         ## this is a little fast since it runs on the serve
         ## but I feel like /all-data is more robust
         roster = self.get_roster(class_id, story = story)
+        
+        # class data only changes when the roster does, so it is cached
+        # for as long as the roster is unchanged, and the data of earlier
+        # rosters is dropped
+        ids = tuple([student_ids] if isinstance(student_ids, int) else student_ids) if student_ids is not None else None
+        key = ('class_data', class_id, story, ids, exclude_merged, self.roster_version(roster))
+        return DASHBOARD_CACHE.get_or_fetch(
+            key, lambda: self._get_class_data(roster, class_id, student_ids, story, exclude_merged), CLASS_DATA_TTL,
+            versioned = True)
+    
+    def _get_class_data(self, roster, class_id, student_ids, story, exclude_merged):
         student_id = [student['student_id'] for student in roster]
         if len(student_id) == 0:
             return None
@@ -196,7 +363,7 @@ class QueryCosmicDSApi():
         else:
             if isinstance(student_ids, int):
                 student_ids = [student_ids]
-            measurements = [self.get_student_data(student_id)['measurements'] for student_id in student_ids]
+            measurements = [data['measurements'] for data in self.map_concurrent(self.get_student_data, student_ids)]
         logger.debug(f"Retrieved {len(measurements)} measurements for class {class_id}")
         if len(measurements) == len(roster):
             logger.debug("All student data present in class data")
@@ -205,9 +372,8 @@ class QueryCosmicDSApi():
             missing_students = [student['student_id'] for student in roster if student['student_id'] not in [m['student_id'] for m in measurements]]
             logger.debug(f"Missing data for students: {missing_students}")
             new_measurements = []
-            for student_id in missing_students:
-                new_measurements +=  self.get_student_data(student_id)['measurements']
-                # self.get_student_data(student_id)['measurements'] for student_id in missing_students]
+            for data in self.map_concurrent(self.get_student_data, missing_students):
+                new_measurements += data['measurements']
             new_measurements = [m for m in new_measurements if len(m) > 0]
             # add class_id to new measurements
             for m in new_measurements:
@@ -269,9 +435,13 @@ class QueryCosmicDSApi():
         url = urljoin(self.url_head, endpoint)
         self.questions_url = url
         logger.debug(url)
-        req = self.get(url)
-        if req.status_code == 200:
-            return {q['tag']:q for q in req.json()['questions']}
+        
+        def fetch():
+            req = self.get(url)
+            if req.status_code == 200:
+                return {q['tag']:q for q in req.json()['questions']}
+        
+        return DASHBOARD_CACHE.get_or_fetch(('questions', story), fetch, QUESTIONS_TTL)
         
     def get_class_for_teacher(self,teacher_key = None):
         endpoint = f"/educator-classes/{teacher_key}"
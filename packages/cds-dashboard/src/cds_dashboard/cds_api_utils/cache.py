@@ -0,0 +1,130 @@
+import copy
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ..logger_setup import logger
+
+# Seconds a roster stays cached. Class data and question text are keyed by
+# the roster they belong to (or never change), so they can live longer.
+ROSTER_TTL = float(os.getenv('CDS_DASHBOARD_ROSTER_TTL', 30))
+CLASS_DATA_TTL = float(os.getenv('CDS_DASHBOARD_CLASS_DATA_TTL', 600))
+QUESTIONS_TTL = float(os.getenv('CDS_DASHBOARD_QUESTIONS_TTL', 3600))
+
+# Number of entries kept, least recently used first out
+CACHE_SIZE = int(os.getenv('CDS_DASHBOARD_CACHE_SIZE', 256))
+
+
+class DashboardCache():
+    """
+    Process-wide cache of API responses, shared by every `Roster` and every
+    session of the dashboard, so teachers (or tabs) looking at the same
+    class share one set of requests.
+
+    Entries are keyed by a tuple whose first element names the kind of data
+    (e.g. ``('roster', class_id, story)``), and keys may include a version
+    (such as the roster's modification times) so that new data gets a new
+    entry, and storing a new version drops the older ones. Every entry also
+    expires after its own TTL; expired entries are purged whenever a value
+    is stored, and at most `max_entries` entries are kept, dropping the
+    least recently used. Concurrent misses on the same key result in a
+    single fetch.
+
+    Values are deep-copied on the way out, as callers reshape API responses
+    in place.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, value, ttl: float, versioned: bool):
+        now = time.monotonic()
+        with self._lock:
+            for other, (expires, _) in list(self._entries.items()):
+                if expires < now or (versioned and other[:-1] == key[:-1]):
+                    del self._entries[other]
+            self._entries[key] = (now + ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key: tuple, fetch: Callable[[], Any], ttl: float, copy_value: bool = True, versioned: bool = False) -> Any:
+        """
+        Return the cached value for `key`, calling `fetch` if it is missing or
+        expired. `None` results are not cached.
+        
+        If `versioned`, the last element of `key` is a version of the data,
+        and storing a value drops the other versions of it.
+        """
+        kind = key[0]
+        entry = self._lookup(key)
+        if entry is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                # another session may have fetched it while we waited
+                entry = self._lookup(key)
+                if entry is None:
+                    with self._lock:
+                        self.misses[kind] += 1
+                    try:
+                        value = fetch()
+                        if value is not None:
+                            self._store(key, value, ttl, versioned)
+                    finally:
+                        # only drop the key lock once the value is visible,
+                        # so that late arrivals find it instead of fetching again
+                        with self._lock:
+                            self._key_locks.pop(key, None)
+                    return copy.deepcopy(value) if copy_value else value
+
+        with self._lock:
+            self.hits[kind] += 1
+        value = entry[1]
+        return copy.deepcopy(value) if copy_value else value
+
+    def invalidate(self, kind: Optional[str] = None, class_id: Optional[int] = None):
+        """
+        Drop cached entries, optionally only those of one kind and/or class
+        (the class id is expected as the second element of the key).
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if kind is not None and key[0] != kind:
+                    continue
+                if class_id is not None and (len(key) < 2 or key[1] != class_id):
+                    continue
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses and hit rate of each kind of data"""
+        out = {}
+        for kind in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits[kind], self.misses[kind]
+            out[kind] = {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses)}
+        return out
+
+    def log_stats(self):
+        for kind, s in self.stats().items():
+            logger.info(f"Dashboard cache [{kind}]: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%})")
+
+
+DASHBOARD_CACHE = DashboardCache()
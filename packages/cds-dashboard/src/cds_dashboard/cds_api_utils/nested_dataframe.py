@@ -1,3 +1,6 @@
+from contextlib import nullcontext
+from threading import Lock
+
 from pandas import DataFrame, concat, Series, isna
 
 from ..logger_setup import logger
@@ -46,26 +49,194 @@ def __convertable_to_DataFrame__(x):
     """
     return __values_are_dict_like__(x) or __values_are_list_like__(x)
     
-def flatten(df, parent = '', delimiter = '.', fname = None,  tab = 0):
+def flatten_recursive(df, parent = '', delimiter = '.', fname = None,  tab = 0):
     """
     Recursively flat a pandas DataFrame with nested dictionaries
+    
+    This is the original column-by-column implementation, kept for
+    writing the column tree to `fname` and for flattening a Series.
+    `flatten` gives the same result in a single pass.
     """
     markdown_string = lambda col: '  ' * tab+ '- {}'.format(col.replace(parent,'').lstrip(delimiter)) + '\n'
     
     if isinstance(df, Series) or __values_are_list_like__(df):
         new_df = __expand_subdict__(df).add_prefix(parent + delimiter)
-        return flatten(new_df, parent = parent, delimiter = delimiter,  fname = fname, tab = tab + 1)
+        return flatten_recursive(new_df, parent = parent, delimiter = delimiter,  fname = fname, tab = tab + 1)
     else:
         for col in df.columns:
             if fname is not None: fname.write(markdown_string(col))
             
             if __convertable_to_DataFrame__(df[col]):
-                df = df.join(flatten(df[col], parent = col, delimiter = delimiter,  fname = fname, tab = tab + 1))
+                df = df.join(flatten_recursive(df[col], parent = col, delimiter = delimiter,  fname = fname, tab = tab + 1))
                 df.drop(col, axis=1, inplace=True)
 
     return df  
 
 
+
+class FlatSchema():
+    """
+    The nested structure of a column (or of a whole DataFrame): the keys
+    found below it, in order of first appearance, and whether it holds
+    dictionaries or lists that have to be expanded
+    """
+    __slots__ = ('children', 'nested', 'has_scalar')
+
+    def __init__(self):
+        self.children = {}
+        self.nested = False
+        self.has_scalar = False
+
+    def add(self, value):
+        """Extend the schema with the structure of a single value"""
+        if isinstance(value, dict):
+            self.nested = True
+            for key, child in value.items():
+                self.child(key).add(child)
+        elif isinstance(value, list):
+            self.nested = True
+            for key, child in enumerate(value):
+                self.child(key).add(child)
+        elif not __is_missing__(value):
+            self.has_scalar = True
+
+    def child(self, key):
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = FlatSchema()
+        return node
+
+    def merge(self, other):
+        """Extend the schema with the structure of another schema"""
+        self.nested = self.nested or other.nested
+        self.has_scalar = self.has_scalar or other.has_scalar
+        for key, node in other.children.items():
+            self.child(key).merge(node)
+
+    def columns(self, path, delimiter = '.', order = None):
+        """
+        The flat column names below this node. Plain values come first and
+        expanded ones after them, in the order the recursive flatten used.
+        
+        If given, `order` is a schema covering this one whose keys set the
+        order of the columns; only the structure of this schema decides
+        which columns there are.
+        """
+        if self.nested and self.has_scalar:
+            # plain values mixed with dictionaries expand to column 0
+            self.child(0)
+        if order is None:
+            keys = list(self.children)
+        else:
+            keys = [key for key in order.children if key in self.children]
+            keys.extend(key for key in self.children if key not in order.children)
+        names = []
+        expanded = []
+        for key in keys:
+            node = self.children[key]
+            name = f'{path}{delimiter}{key}'
+            if node.nested:
+                child_order = None if order is None else order.children.get(key)
+                expanded.extend(node.columns(name, delimiter, child_order))
+            else:
+                names.append(name)
+        return names + expanded
+
+
+# Schemas inferred so far, by the key passed to `flatten`. They only set the
+# order of the columns, and are shared by every dashboard session, so each is
+# only read or extended while holding its lock in `_SCHEMA_LOCKS`, which
+# `_SCHEMAS_LOCK` guards.
+_SCHEMAS = {}
+_SCHEMA_LOCKS = {}
+_SCHEMAS_LOCK = Lock()
+
+def __shared_schema__(key):
+    with _SCHEMAS_LOCK:
+        if key not in _SCHEMAS:
+            _SCHEMAS[key] = FlatSchema()
+            _SCHEMA_LOCKS[key] = Lock()
+        return _SCHEMAS[key], _SCHEMA_LOCKS[key]
+
+def __is_missing__(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+def __flatten_value__(node, value, path, row, delimiter):
+    """
+    Write the flat columns of a single value into `row`
+    """
+    if not node.nested:
+        row[path] = value
+        return
+    
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    elif __is_missing__(value):
+        return
+    else:
+        items = ((0, value),)
+    
+    for key, child in items:
+        __flatten_value__(node.children[key], child, f'{path}{delimiter}{key}', row, delimiter)
+
+def flatten(df, parent = '', delimiter = '.', fname = None, tab = 0, schema_key = None):
+    """
+    Flatten a pandas DataFrame with nested dictionaries (and lists) into
+    columns named with dot notation, e.g. `stage.question.score`.
+    
+    The nested structure is inferred once, in a single pass over the
+    values, and the flat frame is then built in one go instead of
+    expanding and joining one column at a time. Expanded columns that
+    only hold missing values are dropped, as before.
+    
+    If `schema_key` is given, the keys met so far are kept under that key
+    and extended by later calls, so frames of the same kind (e.g. the
+    responses of one story version) are flattened with a stable order of
+    columns. Which columns a frame expands to only depends on its own
+    values, never on the frames flattened before it.
+    """
+    if fname is not None or isinstance(df, Series):
+        return flatten_recursive(df, parent = parent, delimiter = delimiter, fname = fname, tab = tab)
+    
+    schema = FlatSchema()
+    nested = []
+    for col in df.columns:
+        if df[col].dtype != 'object':
+            continue
+        node = schema.child(col)
+        for value in df[col]:
+            node.add(value)
+        if node.nested:
+            nested.append(col)
+    
+    if len(nested) == 0:
+        return df
+    
+    if schema_key is not None:
+        order, lock = __shared_schema__(schema_key)
+    else:
+        order, lock = None, nullcontext()
+    
+    columns = []
+    with lock:
+        if order is not None:
+            order.merge(schema)
+        for col in nested:
+            node_order = None if order is None else order.children[col]
+            columns.extend(schema.children[col].columns(col, delimiter, node_order))
+    
+    rows = []
+    for values in zip(*(df[col] for col in nested)):
+        row = {}
+        for col, value in zip(nested, values):
+            __flatten_value__(schema.children[col], value, col, row, delimiter)
+        rows.append(row)
+    
+    flat = DataFrame.from_records(rows, columns = columns, index = df.index).dropna(axis = 1, how = 'all')
+    return concat([df.drop(columns = nested), flat], axis = 1)
+
     
 def infer_schema(df, schema = {}):
     """
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import astropy.units as u
+
+from typing import Dict, List
+
+# Age of the universe in Gyr for a Hubble constant of 1 km/s/Mpc
+HUBBLE_TIME_GYR = (1 * u.Mpc / (u.km / u.s)).to(u.Gyr).value # pyright: ignore[reportAttributeAccessIssue]
+
+# Value used in the status table for students without any measurements
+NO_MEASUREMENTS = -9999
+
+
+class ClassAggregates():
+    """
+    Per-student reductions of a class's measurements, computed in a single
+    grouped aggregation.
+
+    For every student in the measurements this holds the number of rows, the
+    number of rows with both a distance and a velocity, the sums of
+    distance * velocity and distance**2 over those rows (from which the slope
+    of a line through the origin follows), the number of missing (zero)
+    distances and velocities, and the latest modification time. The class
+    summary, the measurement status and the Hubble fits used by the dashboard
+    plots are all read from these.
+
+    Parameters
+    ----------
+    measurements : pd.DataFrame
+        The class measurements, one row per galaxy measured by a student
+    student_ids : list of int
+        The students on the roster
+    n_measurements : int
+        The number of measurements a student makes
+    """
+
+    def __init__(self, measurements: pd.DataFrame, student_ids: List[int], n_measurements: int = 5):
+        self.student_ids = list(student_ids)
+        self.n_measurements = n_measurements
+        self.per_student = self._aggregate(measurements)
+
+    @staticmethod
+    def _aggregate(measurements: pd.DataFrame) -> pd.DataFrame:
+        columns = ['rows', 'pairs', 'sum_xy', 'sum_xx', 'zero_distances', 'zero_velocities', 'last_modified']
+        if 'student_id' not in measurements.columns or len(measurements) == 0:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name='student_id'))
+
+        def numeric(column):
+            if column not in measurements.columns:
+                return pd.Series(np.nan, index=measurements.index)
+            return pd.to_numeric(measurements[column], errors='coerce')
+
+        x = numeric('est_dist_value')
+        y = numeric('velocity_value')
+        valid = x.notna() & y.notna()
+
+        frame = pd.DataFrame({
+            'student_id': measurements['student_id'],
+            'pairs': valid.astype(int),
+            'sum_xy': (x * y).where(valid, 0.0),
+            'sum_xx': (x * x).where(valid, 0.0),
+            'zero_distances': (x == 0).astype(int),
+            'zero_velocities': (y == 0).astype(int),
+            'last_modified': measurements['last_modified'] if 'last_modified' in measurements.columns else None,
+        })
+
+        return frame.groupby('student_id').agg(
+            rows=('pairs', 'size'),
+            pairs=('pairs', 'sum'),
+            sum_xy=('sum_xy', 'sum'),
+            sum_xx=('sum_xx', 'sum'),
+            zero_distances=('zero_distances', 'sum'),
+            zero_velocities=('zero_velocities', 'sum'),
+            last_modified=('last_modified', 'max'),
+        )
+
+    @property
+    def fits(self) -> pd.DataFrame:
+        """
+        The Hubble constant (slope through the origin of velocity against
+        distance, ignoring incomplete rows) and age of every student with
+        measurements, indexed by student id
+        """
+        agg = self.per_student
+        sum_xx = agg['sum_xx'].astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h0 = (agg['sum_xy'].astype(float) / sum_xx).where(sum_xx != 0, np.nan)
+            age = HUBBLE_TIME_GYR / h0
+        return pd.DataFrame({'h0': h0, 'age': age, 'last_modified': agg['last_modified']})
+
+    def class_summary(self) -> pd.DataFrame:
+        """
+        The Hubble constant and age of each student on the roster, in roster
+        order. Students who have not made all their measurements get NaN.
+        """
+        agg = self.per_student
+        complete = (agg['rows'] == self.n_measurements) & (agg['pairs'] == self.n_measurements)
+        fits = self.fits.where(complete, np.nan).reindex(self.student_ids)
+        return pd.DataFrame({'H0': fits['h0'].to_numpy(dtype=float), 'age': fits['age'].to_numpy(dtype=float)})
+
+    @property
+    def status(self) -> pd.DataFrame:
+        """
+        The number of distances and velocities each student has measured, and
+        whether they are complete, indexed by student id. Students on the
+        roster without any measurements are marked with `NO_MEASUREMENTS`.
+        """
+        agg = self.per_student
+        distances = self.n_measurements - agg['zero_distances'].astype(int)
+        velocities = self.n_measurements - agg['zero_velocities'].astype(int)
+        df = pd.DataFrame({
+            'distances': distances,
+            'velocities': velocities,
+            'complete': (distances == self.n_measurements) & (velocities == self.n_measurements),
+        })
+
+        missing = [sid for sid in self.student_ids if sid not in df.index]
+        if len(missing) > 0:
+            df = pd.concat([df, pd.DataFrame({
+                'distances': NO_MEASUREMENTS,
+                'velocities': NO_MEASUREMENTS,
+                'complete': False,
+            }, index=pd.Index(missing, name=df.index.name))])
+        return df
+
+    @property
+    def summary(self) -> Dict[str, int]:
+        df = self.status
+        has_dist = df['distances'] != NO_MEASUREMENTS
+        has_vel = df['velocities'] != NO_MEASUREMENTS
+        return dict(
+            num_complete=int(df['complete'].sum()),  # number of students with complete data
+            num_incomplete=int(len(df) - df['complete'].sum()),  # number of students with incomplete data
+            num_dist=int(has_dist.sum()),  # number of students with distances
+            num_vel=int(has_vel.sum()),  # number of students with velocities
+            num_good=int((has_dist & has_vel).sum()),  # number of students with good data
+            num_total=len(df),  # number of students in class
+        )
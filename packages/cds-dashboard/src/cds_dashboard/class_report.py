@@ -1,13 +1,12 @@
+import copy
 import pandas as pd
 from .cds_api_utils.nested_dataframe import flatten
 from .cds_api_utils.Query import QueryCosmicDSApi
 from .state_adapters import StateAdapterFactory
+from .class_aggregates import ClassAggregates
 import time
 HUBBLE_ROUTE_PATH = "hubbles_law"
 
-import astropy.units as u
-from math import nan
-
 from .utils import l2d, convert_column_of_dates_to_datetime, get_or_none
 
 from typing import List, Dict, cast, Optional, Any, Union, TypedDict
@@ -69,6 +68,13 @@ class Roster():
         self._fr_keys = {}
         self._report = None
         self._short_report = None
+        self._questions_text = None
+        self._aggregates = None
+
+        # parts of the content fingerprint, updated whenever data is loaded
+        self._roster_fingerprint = None
+        self._measurements_version = None
+        self._names_fingerprint = None
 
         self._refresh = False
 
@@ -97,9 +103,27 @@ class Roster():
         self.real_names: Optional[Dict[int, str]] = None
 
     def __eq__(self, other):
-        if other.short_report() is None:
+        if not isinstance(other, Roster):
             return False
-        return self.short_report() == other.short_report()
+        return self.fingerprint == other.fingerprint
+
+    @property
+    def fingerprint(self):
+        """
+        Identifies the content of the roster: the class, when each student's
+        state was last modified, the version of the loaded measurements and
+        the student names. It is maintained as data is loaded, so comparing
+        rosters (which solara does on every `set`) does not rebuild anything.
+        """
+        return (self.class_id, self._roster_fingerprint, self._measurements_version, self._names_fingerprint)
+
+    @staticmethod
+    def _measurements_signature(data):
+        if not data:
+            return None
+        last_modified = data.get('last_modified')
+        latest = max(str(t) for t in last_modified) if last_modified is not None and len(last_modified) > 0 else None
+        return hash((len(data.get('student_id', [])), latest))
     
     @property
     def state_version(self):
@@ -133,6 +157,15 @@ class Roster():
 
         self.data = None
 
+        self._process_roster()
+
+    def _process_roster(self) -> None:
+        """
+        Builds the column-oriented views of the roster (student ids, story
+        states, stages and last modified times) from `self.roster`
+        """
+        self._roster_fingerprint = hash(tuple((entry['student_id'], str(entry.get('last_modified'))) for entry in self.roster))
+
         # Handle empty roster case
         if len(self.roster) == 0:
             self.student_id = {'student_id': []}
@@ -190,6 +223,7 @@ class Roster():
             if res is None or res == {} or len(res) == 0:
                 res = {'student_id': []}
             self.data = res if res is not None else {'student_id': []}
+            self._measurements_version = self._measurements_signature(self.data)
             if len(self.student_data) == 0:
                 groupdf = pd.DataFrame(self.data).groupby('student_id')
                 for student_id in groupdf.groups.keys():
@@ -205,53 +239,27 @@ class Roster():
             return pd.DataFrame(self.student_data[student_id])
         return self.student_data[student_id]
 
-    def get_class_summary(self, refresh=False):
-        if self.class_summary is None or self._refresh or refresh:
+    def class_aggregates(self, refresh=False) -> ClassAggregates:
+        """
+        Per-student reductions of the class measurements, shared by the class
+        summary, the measurement status and the dashboard plots. They are
+        recomputed whenever the class data is fetched again.
+        """
+        cached = self._aggregates
+        if cached is None or cached[0] is not self.data or self.data is None or self._refresh or refresh:
             measurements = self.measurements(refresh=refresh)
+            self._aggregates = (self.data, ClassAggregates(measurements, self.student_ids))
+        return self._aggregates[1]
 
-            def get_slope(x, y):
-                # slope through origin
-                return nan if (sum(x**2) == 0) else (sum(x * y) / sum(x**2))
-
-            def slope2age(h0):
-                return (1 / (h0 * u.km / u.s / u.Mpc)).to(u.Gyr).value # pyright: ignore[reportAttributeAccessIssue]
-
-            H0 = []
-            Age = []
-            for student in self.student_ids:
-                student_data = measurements[measurements['student_id'] == student]
-                if len(student_data) == 5:
-                    H0.append(get_slope(student_data['est_dist_value'], student_data['velocity_value']))
-                    Age.append(slope2age(H0[-1]))
-                else:
-                    H0.append(nan)
-                    Age.append(nan)
-            self.class_summary = self.make_dataframe(pd.DataFrame({'H0': H0, 'age': Age}))
+    def get_class_summary(self, refresh=False):
+        if self.class_summary is None or self._refresh or refresh:
+            self.class_summary = self.make_dataframe(self.class_aggregates(refresh=refresh).class_summary())
 
         return self.class_summary
 
     def class_measurement_status(self, refresh=False) -> MeasurementStatus:
-        g = cast(pd.DataFrame, self.get_class_data(df=True, refresh=refresh)).groupby('student_id')
-        nodist = g.apply(lambda x: 5 - sum(x['est_dist_value'] == 0))  # number of distances
-        novel = g.apply(lambda x: 5 - sum(x['velocity_value'] == 0))  # number of velocities
-        complete = (novel == 5) & (nodist == 5)
-        df = pd.DataFrame({'distances': nodist, 'velocities': novel, 'complete': complete})
-        m = set(df.index)
-        a = set(self.student_ids)
-        d = a - m  # students in roster but not in class data
-        for d in a - m:
-            df.loc[d] = {'distances': -9999, 'velocities': -9999, 'complete': False}  # type: ignore
-
-        # summary
-        summary = dict(
-            num_complete=sum(df['complete']),  # number of students with complete data
-            num_incomplete=len(df) - sum(df['complete']),  # number of students with incomplete data
-            num_dist=sum(df['distances'] != -9999),  # number of students with distances
-            num_vel=sum(df['velocities'] != -9999),  # number of students with velocities
-            num_good=sum((df['distances'] != -9999) & (df['velocities'] != -9999)),  # number of students with good data
-            num_total=len(df),  # number of students in class  
-        )
-        return {'summary': summary, 'status': df}
+        aggregates = self.class_aggregates(refresh=refresh)
+        return {'summary': aggregates.summary, 'status': aggregates.status}
 
     def get_student_by_id(self, student_id):
         if student_id not in self.student_ids:
@@ -340,20 +348,26 @@ class Roster():
         if len(self.roster) > 0:
             fr = self.free_response_questions()
             mc = self.multiple_choice_questions()
-            df_fr = flatten(self.make_dataframe(fr, include_class_id=False, include_username=False))
-            df_mc = flatten(self.make_dataframe(mc, include_class_id=False, include_username=False))  #.astype('Int64')
+            df_fr = flatten(self.make_dataframe(fr, include_class_id=False, include_username=False),
+                            schema_key=f'{self.state_version}/free_responses')
+            df_mc = flatten(self.make_dataframe(mc, include_class_id=False, include_username=False),
+                            schema_key=f'{self.state_version}/mc_scoring')  #.astype('Int64')
             self._questions = pd.merge(df_mc, df_fr, how='left', on='student_id')
         else:
             self._questions = pd.DataFrame({'student_id': self.student_ids})
         return self._questions
 
     def get_questions_text(self):
+        # the question text does not change, so only fetch it once
+        if self._questions_text is not None:
+            return self._questions_text
         qs = self.query.get_questions()
         if qs is None:
             logger.debug("""No questions found. Trying again after a moment.""")
             # wait 1 second
             time.sleep(1)
             qs = self.query.get_questions()
+        self._questions_text = qs
         return qs
 
     def question_keys(self, testing=False, get_all=True):
@@ -455,6 +469,7 @@ class Roster():
             # if student_names is not None:
         self.has_real_names = True
         self.real_names = student_names
+        self._names_fingerprint = hash(frozenset(student_names.items())) if student_names is not None else None
 
     def get_student_name(self, sid=None, fill = True):
         if sid is None:
@@ -481,7 +496,7 @@ class Roster():
     def responses(self):
         if len(self.roster) > 0:
             df = pd.DataFrame([student['story_state']['responses'] for student in self.roster])
-            return self.make_dataframe(flatten(df))
+            return self.make_dataframe(flatten(df, schema_key=f'{self.state_version}/responses'))
         else:
             return self.make_dataframe(pd.DataFrame())
 
@@ -691,7 +706,7 @@ class Roster():
         df['Hubble_Constant'] = summ['H0'].apply(lambda x: round(x, 2))
         df['Age'] = summ['age'].apply(lambda x: round(x, 2))
 
-        response = flatten(pd.DataFrame(self._story_state['responses']))
+        response = flatten(pd.DataFrame(self._story_state['responses']), schema_key=f'{self.state_version}/story_responses')
         response['student_id'] = self.student_id['student_id']
         df = df.merge(response, on='student_id', how='left')
         last_modified = pd.to_datetime(self.last_modified['last_modified']).tz_convert('US/Eastern').strftime(
@@ -768,6 +783,90 @@ class Roster():
             self.set_student_names(self.real_names)
         self._refresh = False
 
+    def delta_copy(self) -> Optional['Roster']:
+        """
+        Returns a copy of the roster updated with only the students whose
+        story state changed since the roster was loaded, or None if nothing
+        changed.
+        
+        The roster is fetched again to compare each student's `last_modified`
+        time, but stage states and measurements are only fetched for new or
+        changed students. The class measurements keep the rows of every other
+        student, and derived reports are rebuilt on the copy. This roster is
+        left untouched.
+        """
+        if self.class_id is None:
+            return None
+
+        api_roster = self.query.get_roster()
+        previous = {entry['student_id']: entry.get('last_modified') for entry in self.roster}
+        current = {entry['student_id']: entry.get('last_modified') for entry in api_roster}
+
+        changed = [entry for entry in api_roster
+                   if entry['student_id'] not in previous or previous[entry['student_id']] != entry.get('last_modified')]
+        removed = set(previous) - set(current)
+        if len(changed) == 0 and len(removed) == 0:
+            logger.debug(f"No changes in class {self.class_id} since last refresh")
+            return None
+
+        logger.debug(f"Refreshing {len(changed)} changed and {len(removed)} removed students in class {self.class_id}")
+        updated = {}
+        if len(changed) > 0:
+            updated = {entry['student_id']: entry for entry in self.adapter.transform_roster(changed)}
+        entries = {entry['student_id']: entry for entry in self.roster}
+
+        new = copy.copy(self)
+        new.roster = [updated.get(sid, entries.get(sid)) for sid in current]
+        new._process_roster()
+
+        new.student_data = {sid: data for sid, data in self.student_data.items()
+                            if sid in current and sid not in updated}
+        new.data = self._delta_class_data(new, set(updated) | removed)
+        new._measurements_version = self._measurements_signature(new.data)
+
+        # everything else derived from the whole class is rebuilt on demand
+        new.class_summary = None
+        new._aggregates = None
+        new._mc_questions = None
+        new._fr_questions = None
+        new._questions = None
+        new._question_keys = None
+        new._report = None
+        new._short_report = None
+        new._mc_keys = {k: list(v) for k, v in self._mc_keys.items()}
+        new._fr_keys = {k: list(v) for k, v in self._fr_keys.items()}
+
+        if new.has_real_names and new.real_names is not None:
+            new.set_student_names(new.real_names)
+
+        return new
+
+    def _delta_class_data(self, new: 'Roster', stale_ids: set) -> Optional[Dict]:
+        """
+        Returns the class measurements of `new`: the rows of this roster's
+        class data for every student not in `stale_ids`, plus the
+        measurements of the students of `new` in `stale_ids`, fetched one
+        student at a time. Those are also stored in `new.student_data`.
+        """
+        if self.data is None:
+            return None
+
+        kept = pd.DataFrame(self.data)
+        if 'student_id' in kept.columns:
+            kept = kept[~kept['student_id'].isin(stale_ids)]
+
+        refetch = [sid for sid in new.student_ids if sid in stale_ids]
+        records = self.query.map_concurrent(lambda sid: self.adapter.get_student_measurements(new.roster, sid), refetch)
+        fetched = []
+        for sid, measurements in zip(refetch, records):
+            new.student_data[sid] = measurements
+            fetched += [dict(m, class_id=m.get('class_id', self.class_id)) for m in measurements if len(m) > 0]
+
+        merged = pd.concat([kept, pd.DataFrame(fetched)], ignore_index=True) if len(fetched) > 0 else kept
+        if len(merged) == 0:
+            return {'student_id': []}
+        return {col: merged[col].to_numpy() for col in merged.columns}
+
     def empty_copy(self):
         """
         Creates an empty copy of the roster with just the class ID
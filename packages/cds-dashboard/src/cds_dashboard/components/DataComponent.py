@@ -284,13 +284,9 @@ def DataHistogram(roster: Reactive[Roster] | Roster = None, id_col = 'student_id
         solara.Markdown("There is no data for this class")
         return
     
-    #group by student_id
-    grouped = dataframe.groupby(id_col)
-    h0 = grouped.apply(lambda x: get_slope(x['est_dist_value'].to_numpy(), x['velocity_value'].to_numpy()))
-    # get the name associated with the student_id
-    age = h0.apply(slope2age)
-    time = grouped['last_modified'].max()
-    data = DataFrame({'h0': h0, 'age': age, 'last_modified': time}).reset_index() # move student_id to column
+    # per-student fits are shared with the class summary
+    fits = roster.class_aggregates().fits
+    data = fits.rename_axis(id_col).reset_index() # move student_id to column
     # student_id to str
     data['student_id'] = data['student_id'].apply(str)
     data['name'] = [roster.get_student_name(int(sid)) for sid in data['student_id']]
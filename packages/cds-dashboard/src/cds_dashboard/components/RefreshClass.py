@@ -26,7 +26,9 @@ def RefreshClass(rate_minutes = 5,
     if on_refresh is None:
         def on_refresh():
             logger.debug(f"refreshing class data class id: {roster.value.class_id}")
-            r = roster.value.empty_copy()
+            r = roster.value.delta_copy()
+            if r is None:
+                return
             if student_names is not None:
                 student_names_dict = {row['student_id']: row['name'] for _, row in student_names.iterrows()}
                 r.set_student_names(student_names_dict)
@@ -146,14 +146,15 @@ class OldSolaraStateAdapter(StateAdapter):
         return by_stage
     
     def _add_stage_data(self, roster: List[OldRosterEntry]) -> None:
-        for i, entry in enumerate(roster):
-            student_id = entry['student_id']
-            try:
-                stages = self.query.get_stages(student_id)
-                entry['story_state']['stages'] = stages  # type: ignore
-            except Exception as e:
-                logger.error(f"OldSolaraStateAdapter: Failed to fetch stages for student {student_id}: {e}")
-                entry['story_state']['stages'] = {}  # type: ignore
+        student_ids = [entry['student_id'] for entry in roster]
+        try:
+            stages = self.query.get_class_stages(student_ids)
+        except Exception as e:
+            logger.error(f"OldSolaraStateAdapter: Failed to fetch stages for class {self.query.class_id}: {e}")
+            stages = {}
+        
+        for entry in roster:
+            entry['story_state']['stages'] = stages.get(entry['student_id'], {})  # type: ignore
     
     def get_class_measurements(self, roster: List[OldRosterEntry], exclude_merged=False) -> Dict[str, List[Any]]:
         """Get all measurements for the class. Uses API call for Solara format."""
@@ -0,0 +1,249 @@
+import os
+import time
+from itertools import count as counter
+from threading import Event, Lock, Thread
+from typing import Callable, Hashable, Optional, Sequence
+
+from cds_core.logger import setup_logger
+from .story_state import MeasurementTable
+
+logger = setup_logger("CLASS-PROGRESS")
+
+__all__ = ["ClassProgressHub", "CLASS_PROGRESS_HUB"]
+
+# Seconds between two checks of a class's progress
+CLASS_PROGRESS_INTERVAL = float(os.getenv("CDS_CLASS_PROGRESS_INTERVAL", 10))
+
+
+# The count fetcher and the listener of one subscribed session
+_Subscriber = tuple[Callable[[], int], Callable[[int], None]]
+
+
+class _ClassEntry:
+    def __init__(self):
+        self.subscribers: dict[int, _Subscriber] = {}
+        self.count: Optional[int] = None
+        self.stop: Optional[Event] = None
+        self.lock = Lock()
+        self.last_used = time.monotonic()
+
+        # Class measurements by requesting student and requested student ids,
+        #  along with the time they were fetched. Cleared whenever the
+        #  completed count changes, which also bumps the generation.
+        self.measurements: dict[tuple, tuple[float, MeasurementTable]] = {}
+        self.generation = 0
+        self.measurements_lock = Lock()
+        # One lock per request, held while it is being fetched
+        self.request_locks: dict[tuple, Lock] = {}
+
+
+class ClassProgressHub:
+    """
+    Process-wide hub sharing the progress of each class between the
+    sessions of its students.
+
+    While at least one session of a class is subscribed, a single poller
+    thread checks how many students of the class have completed their
+    measurements and hands the count to every subscriber, instead of
+    each session polling the API on its own. The API scopes class
+    measurements to the requesting student, so those are only shared
+    between the sessions of the same student, until the completed count
+    changes or they are older than ``interval``.
+
+    A class is forgotten once it has no subscribers and its measurements
+    have not been requested for ``interval`` seconds.
+
+    Parameters
+    ----------
+    interval : float
+        Seconds between two checks of a class's progress.
+    """
+
+    def __init__(self, interval: float = CLASS_PROGRESS_INTERVAL):
+        self.interval = interval
+        self._entries: dict[Hashable, _ClassEntry] = {}
+        self._lock = Lock()
+        self._tokens = counter()
+
+    def _entry(self, key: Hashable) -> _ClassEntry:
+        # Must be called with `_lock` held
+        now = time.monotonic()
+        for other_key, entry in list(self._entries.items()):
+            with entry.lock:
+                idle = not entry.subscribers and now - entry.last_used > self.interval
+            if idle:
+                del self._entries[other_key]
+
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _ClassEntry()
+        entry.last_used = now
+        return entry
+
+    @staticmethod
+    def _notify(listener: Callable[[int], None], count: int):
+        try:
+            listener(count)
+        except Exception as e:
+            logger.warning("Failed to notify class progress subscriber: %s", e)
+
+    def subscribe(
+        self,
+        key: Hashable,
+        fetch_count: Callable[[], int],
+        listener: Callable[[int], None],
+    ) -> Callable[[], None]:
+        """
+        Call ``listener`` with the completed count of the class ``key``
+        whenever it changes, and right away if it is already known.
+
+        ``fetch_count`` is used to retrieve the count while this subscriber
+        is the one the poller relies on. Neither callable may read reactive
+        state, as both are called from the poller thread.
+
+        Returns
+        -------
+        callable
+            Removes the subscription. The poller of a class stops once its
+            last subscriber is removed.
+        """
+        token = next(self._tokens)
+
+        # Register while holding `_lock`, so that the entry cannot be
+        #  forgotten in between
+        with self._lock:
+            entry = self._entry(key)
+            with entry.lock:
+                entry.subscribers[token] = (fetch_count, listener)
+                count = entry.count
+
+                if entry.stop is None:
+                    entry.stop = Event()
+                    Thread(
+                        target=self._poll,
+                        args=(key, entry, entry.stop),
+                        name=f"class-progress-{key}",
+                        daemon=True,
+                    ).start()
+
+        if count is not None:
+            self._notify(listener, count)
+
+        def _unsubscribe():
+            with entry.lock:
+                entry.subscribers.pop(token, None)
+                entry.last_used = time.monotonic()
+                if not entry.subscribers and entry.stop is not None:
+                    entry.stop.set()
+                    entry.stop = None
+
+        return _unsubscribe
+
+    def _poll(self, key: Hashable, entry: _ClassEntry, stop: Event):
+        logger.info("Started polling progress of class `%s`.", key)
+
+        while not stop.is_set():
+            with entry.lock:
+                if not entry.subscribers:
+                    break
+                fetch_count, _ = next(iter(entry.subscribers.values()))
+
+            try:
+                count = fetch_count()
+            except Exception as e:
+                logger.warning("Failed to check progress of class `%s`: %s", key, e)
+            else:
+                with entry.lock:
+                    changed = count != entry.count
+                    entry.count = count
+                    listeners = [l for _, l in entry.subscribers.values()]
+
+                if changed:
+                    with entry.measurements_lock:
+                        entry.measurements.clear()
+                        entry.generation += 1
+                    for listener in listeners:
+                        self._notify(listener, count)
+
+            stop.wait(self.interval)
+
+        logger.info("Stopped polling progress of class `%s`.", key)
+
+    def get_class_measurements(
+        self,
+        key: Hashable,
+        student_id: int,
+        fetch: Callable[[], MeasurementTable],
+        student_ids: Optional[Sequence[int]] = None,
+    ) -> MeasurementTable:
+        """
+        Return the measurements of the class ``key`` as seen by the student
+        ``student_id``, calling ``fetch`` only if they were not fetched
+        recently. The API scopes class measurements to the requesting
+        student, so they are only shared between the sessions of the same
+        student. The table is immutable, so the same instance is handed to
+        every such session.
+        """
+        with self._lock:
+            entry = self._entry(key)
+        request = (student_id, tuple(student_ids or ()))
+
+        def _cached() -> Optional[MeasurementTable]:
+            # Must be called with `measurements_lock` held
+            cached = entry.measurements.get(request)
+            if cached is not None and time.time() - cached[0] < self.interval:
+                return cached[1]
+            return None
+
+        with entry.measurements_lock:
+            measurements = _cached()
+            if measurements is not None:
+                return measurements
+            request_lock = entry.request_locks.setdefault(request, Lock())
+
+        # Sessions of a student tend to request the class data at the same
+        #  time, so the request lock is held while fetching to let them share
+        #  one request, without making other students wait on it
+        try:
+            with request_lock:
+                with entry.measurements_lock:
+                    measurements = _cached()
+                    generation = entry.generation
+                if measurements is not None:
+                    return measurements
+
+                measurements = fetch()
+
+                with entry.measurements_lock:
+                    # Drop the measurements that are too old to be served anymore
+                    now = time.time()
+                    for other in [
+                        other
+                        for other, (fetched, _) in entry.measurements.items()
+                        if now - fetched >= self.interval
+                    ]:
+                        del entry.measurements[other]
+                    # Don't keep what was fetched before the count changed
+                    if generation == entry.generation:
+                        entry.measurements[request] = (now, measurements)
+        finally:
+            with entry.measurements_lock:
+                entry.request_locks.pop(request, None)
+
+        return measurements
+
+    def invalidate(self, key: Hashable | None = None):
+        """Drop the cached class measurements of ``key``, or of all classes."""
+        with self._lock:
+            entries = (
+                list(self._entries.values())
+                if key is None
+                else [self._entries[key]] if key in self._entries else []
+            )
+        for entry in entries:
+            with entry.measurements_lock:
+                entry.measurements.clear()
+                entry.generation += 1
+
+
+CLASS_PROGRESS_HUB = ClassProgressHub()
@@ -0,0 +1,92 @@
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Default upper bound on the number of points sent to the browser per view
+MAX_SPECTRUM_POINTS = int(os.getenv("CDS_MAX_SPECTRUM_POINTS", 1000))
+
+# Levels are not decimated further once they are this small
+MIN_LEVEL_POINTS = 64
+
+
+class SpectrumPyramid:
+    """
+    Level-of-detail pyramid of a spectrum for plotting.
+
+    Level 0 holds every sample. Each following level splits the spectrum
+    into buckets twice as wide as the previous one and keeps only the
+    minimum and maximum sample of each bucket, so narrow features such as
+    emission and absorption lines survive decimation. The levels are
+    computed once per spectrum; picking the points for a view is then just
+    two binary searches.
+
+    Parameters
+    ----------
+    wave : array-like
+        The wavelengths of the spectrum, in ascending order.
+    flux : array-like
+        The flux at each wavelength.
+    """
+
+    def __init__(self, wave: Sequence[float], flux: Sequence[float]):
+        wave = np.asarray(wave)
+        flux = np.asarray(flux)
+
+        self._levels = [(wave, flux)]
+
+        bucket = 4
+        while len(self._levels[-1][0]) > 2 * MIN_LEVEL_POINTS:
+            indices = _min_max_indices(flux, bucket)
+            self._levels.append((wave[indices], flux[indices]))
+            bucket *= 2
+
+    @property
+    def levels(self) -> int:
+        return len(self._levels)
+
+    def view(
+        self,
+        x_range: Optional[Sequence[float]] = None,
+        max_points: int = MAX_SPECTRUM_POINTS,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the wavelengths and fluxes to plot for ``x_range``, using the
+        finest level that needs at most ``max_points`` points to cover it.
+        One point beyond each end of the range is included so the line
+        reaches the edges of the plot.
+        """
+        for wave, flux in self._levels:
+            if x_range:
+                start = max(np.searchsorted(wave, x_range[0], side="left") - 1, 0)
+                stop = min(
+                    np.searchsorted(wave, x_range[1], side="right") + 1, len(wave)
+                )
+            else:
+                start, stop = 0, len(wave)
+
+            if stop - start <= max_points:
+                break
+
+        return wave[start:stop], flux[start:stop]
+
+
+def _min_max_indices(values: np.ndarray, bucket: int) -> np.ndarray:
+    """
+    Return the sorted indices of the minimum and maximum of ``values`` in
+    each consecutive bucket of ``bucket`` samples.
+    """
+    n_full = len(values) // bucket * bucket
+    starts = np.arange(0, n_full, bucket)
+
+    buckets = values[:n_full].reshape(-1, bucket)
+    lows = starts + buckets.argmin(axis=1)
+    highs = starts + buckets.argmax(axis=1)
+
+    # The end points are kept so every level spans the whole spectrum
+    indices = [[0, len(values) - 1], lows, highs]
+    if n_full < len(values):
+        tail = values[n_full:]
+        indices.append([n_full + tail.argmin(), n_full + tail.argmax()])
+
+    return np.unique(np.concatenate(indices))
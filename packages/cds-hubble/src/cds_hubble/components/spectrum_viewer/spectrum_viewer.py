@@ -9,6 +9,10 @@ from ...story_state import StoryState
 from ...story_state import GalaxyData
 from pandas import DataFrame
 from ...components.spectrum_viewer.plotly_figure import FigurePlotly
+from ...components.spectrum_viewer.decimation import (
+    MAX_SPECTRUM_POINTS,
+    SpectrumPyramid,
+)
 from cds_core.logger import setup_logger
 from ...helpers.viewer_marker_colors import (
     GENERIC_COLOR,
@@ -18,7 +22,6 @@ from ...helpers.viewer_marker_colors import (
 )
 from ...utils import PLOTLY_MARGINS
 from ...remote import LOCAL_API
-from astropy.table import Table
 
 
 from glue_plotly.common import DEFAULT_FONT
@@ -45,6 +48,7 @@ def SpectrumViewer(
     max_spectrum_bounds: Optional[solara.Reactive[list[float]]] = None,
     spectrum_color: str = GENERIC_COLOR,
     local_state: Reactive[StoryState] = None,
+    max_points: int = MAX_SPECTRUM_POINTS,
 ):
 
     # spectrum_bounds
@@ -65,13 +69,29 @@ def SpectrumViewer(
 
         spec_data = LOCAL_API.load_spectrum_data(local_state, galaxy_data)
 
-        return Table({"wave": spec_data.wave, "flux": spec_data.flux}).to_pandas()
+        if spec_data is None:
+            return None
+
+        # The spectrum arrays back the frame directly, without per-sample copies
+        return DataFrame({"wave": spec_data.wave, "flux": spec_data.flux}, copy=False)
 
     spec_data_task = solara.lab.use_task(
         _load_spectrum,
         dependencies=[galaxy_data],
     )
 
+    def _build_pyramid():
+        spec = spec_data_task.value
+        if not isinstance(spec, DataFrame):
+            return None
+        return SpectrumPyramid(spec["wave"].to_numpy(), spec["flux"].to_numpy())
+
+    # Only the points needed for the current x-range are sent to the browser,
+    #  so the decimated levels are computed once per loaded spectrum
+    pyramid = solara.use_memo(
+        _build_pyramid, dependencies=[galaxy_data, spec_data_task.finished]
+    )
+
     if spec_data_task.finished and spec_data_task.value is not False:
         spec = spec_data_task.value
         logger.info("spec_data_task is finished")
@@ -243,11 +263,16 @@ def SpectrumViewer(
             logger.info("galaxy_data is None")
             return
 
+        if pyramid is None:
+            pyramid = _build_pyramid()
+
+        wave, flux = pyramid.view(x_bounds.value, max_points)
+
         fig = go.Figure()
         fig.add_trace(
             go.Scatter(
-                x=spec_data_task.value["wave"],
-                y=spec_data_task.value["flux"],
+                x=wave,
+                y=flux,
                 line=dict(
                     color=spectrum_color,
                     width=2,
@@ -0,0 +1,189 @@
+import json
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from types import MappingProxyType
+from typing import Callable, Iterator, Mapping, Optional, Sequence
+
+from cds_core.logger import setup_logger
+from .story_state import GalaxyData
+
+logger = setup_logger("GALAXY-CATALOG")
+
+__all__ = ["GalaxyCatalog", "GalaxyCatalogCache", "GALAXY_CATALOG_CACHE"]
+
+# Seconds before a cached catalog is fetched from the API again
+CATALOG_TTL = float(os.getenv("CDS_CATALOG_TTL", 6 * 60 * 60))
+
+# Directory used to persist catalog snapshots between restarts, if set
+CATALOG_SNAPSHOT_DIR = os.getenv("CDS_CATALOG_SNAPSHOT_DIR")
+
+
+class GalaxyCatalog:
+    """
+    An immutable galaxy catalog shared by all sessions, along with a
+    prebuilt index of the galaxies by their id.
+    """
+
+    def __init__(self, galaxies: Sequence[GalaxyData]):
+        self._galaxies = tuple(galaxies)
+        self._by_id = MappingProxyType({g.id: g for g in self._galaxies})
+
+    @property
+    def galaxies(self) -> tuple[GalaxyData, ...]:
+        return self._galaxies
+
+    @property
+    def by_id(self) -> Mapping[int, GalaxyData]:
+        return self._by_id
+
+    def get(self, galaxy_id: int | None) -> GalaxyData | None:
+        return self._by_id.get(galaxy_id)
+
+    def __len__(self) -> int:
+        return len(self._galaxies)
+
+    def __iter__(self) -> Iterator[GalaxyData]:
+        return iter(self._galaxies)
+
+    def __getitem__(self, index: int) -> GalaxyData:
+        return self._galaxies[index]
+
+
+class _Entry:
+    def __init__(self, catalog: GalaxyCatalog, fetched: float):
+        self.catalog = catalog
+        self.fetched = fetched
+        self.lock = Lock()
+
+
+class GalaxyCatalogCache:
+    """
+    Process-wide, TTL-bounded cache of galaxy catalogs keyed by story.
+
+    Concurrent requests for an expired catalog result in a single fetch.
+    If a snapshot directory is given, each fetched catalog is also written
+    to disk so a restarted process can serve it without waiting on the API,
+    and so a stale catalog can still be served if the API is unreachable.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds a catalog is served before it is fetched again.
+    snapshot_dir : str or `~pathlib.Path`, optional
+        Directory in which catalog snapshots are stored.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CATALOG_TTL,
+        snapshot_dir: Optional[str | Path] = CATALOG_SNAPSHOT_DIR,
+    ):
+        self.ttl = ttl
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._entries: dict[str, _Entry] = {}
+        self._lock = Lock()
+
+    def _entry(self, key: str) -> _Entry:
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = _Entry(GalaxyCatalog([]), fetched=-float("inf"))
+            return self._entries[key]
+
+    def _snapshot_path(self, key: str) -> Path | None:
+        if self.snapshot_dir is None:
+            return None
+        return self.snapshot_dir / f"{key}_galaxies.json"
+
+    def _read_snapshot(self, key: str) -> tuple[list[dict], float] | None:
+        path = self._snapshot_path(key)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+            return snapshot["galaxies"], snapshot["fetched"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Failed to read galaxy catalog snapshot `%s`: %s", path, e)
+            return None
+
+    def _write_snapshot(self, key: str, galaxies: list[dict], fetched: float):
+        path = self._snapshot_path(key)
+        if path is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"fetched": fetched, "galaxies": galaxies}, f)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning("Failed to write galaxy catalog snapshot `%s`: %s", path, e)
+
+    def _expired(self, fetched: float) -> bool:
+        return time.time() - fetched > self.ttl
+
+    def get(self, key: str, fetch: Callable[[], list[dict]]) -> GalaxyCatalog:
+        """
+        Return the catalog for ``key``, calling ``fetch`` to retrieve the raw
+        galaxy records if there is no cached catalog or it has expired.
+        """
+        entry = self._entry(key)
+        if not self._expired(entry.fetched):
+            return entry.catalog
+
+        with entry.lock:
+            # Another thread may have refreshed the catalog while we waited
+            if not self._expired(entry.fetched):
+                return entry.catalog
+
+            if len(entry.catalog) == 0:
+                snapshot = self._read_snapshot(key)
+                if snapshot is not None:
+                    galaxies, fetched = snapshot
+                    entry.catalog = GalaxyCatalog([GalaxyData(**g) for g in galaxies])
+                    entry.fetched = fetched
+
+                    if not self._expired(fetched):
+                        logger.info("Loaded galaxy catalog `%s` from snapshot.", key)
+                        return entry.catalog
+
+            try:
+                galaxies = fetch()
+            except Exception as e:
+                if len(entry.catalog) == 0:
+                    raise
+                logger.warning(
+                    "Failed to refresh galaxy catalog `%s`, serving cached copy: %s",
+                    key,
+                    e,
+                )
+                return entry.catalog
+
+            fetched = time.time()
+            entry.catalog = GalaxyCatalog([GalaxyData(**g) for g in galaxies])
+            entry.fetched = fetched
+            self._write_snapshot(key, galaxies, fetched)
+
+            logger.info(
+                "Fetched galaxy catalog `%s` with %d galaxies.", key, len(entry.catalog)
+            )
+
+        return entry.catalog
+
+    def invalidate(self, key: str | None = None):
+        """Expire the cached catalog for ``key``, or all catalogs."""
+        with self._lock:
+            entries = (
+                list(self._entries.values())
+                if key is None
+                else [self._entries[key]] if key in self._entries else []
+            )
+        for entry in entries:
+            entry.fetched = -float("inf")
+
+
+GALAXY_CATALOG_CACHE = GalaxyCatalogCache()
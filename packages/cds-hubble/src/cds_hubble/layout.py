@@ -11,14 +11,18 @@ from cds_client.cookies import verify_student_cookie
 from cds_core.app_state import AppState
 from cds_core.layout import BaseLayout, BaseSetup
 from cds_core.logger import setup_logger
+from cds_core.persistence import StatePersistence
 from .remote import LOCAL_API
 from .story_state import StoryState
-from .utils import push_to_route, extract_changed_subtree
+from .utils import push_to_route
 
 logger = setup_logger("LAYOUT")
 
 FORCE_DEMO = os.getenv("CDS_FORCE_DEMO", "false").strip().lower() == "true"
 
+# Seconds to wait for further state changes before writing to the database
+WRITE_DEBOUNCE = 2
+
 
 def _load_state(
     app_state: Reactive[AppState], story_state: Reactive[StoryState], *args, **kwargs
@@ -117,40 +121,34 @@ def Layout(
 
     solara.use_memo(_state_setup, dependencies=[])
 
-    initial_state_written = solara.use_reactive(False)
-
-    def _consume_write_state():
-        while True:
-            if not initial_state_loaded.value:
-                time.sleep(2)
-                continue
-
-            if not initial_state_written.value:
-                logger.info(f"Initializing with full DB write.")
-                _write_state(app_state.value.as_dict(), app_state, story_state)
-                initial_state_written.set(True)
-                continue
-
-            # Retrieve current state
-            old_state = app_state.value.as_dict()
-
-            # Sleep for 2 seconds
-            time.sleep(2)
+    # Changes to the app state are tracked as they happen and written to the
+    #  database in coalesced patches, rather than polling and diffing the
+    #  full state on an interval.
+    persistence = solara.use_memo(
+        lambda: StatePersistence(
+            app_state,
+            lambda patch: _write_state(patch, app_state, story_state),
+            debounce=WRITE_DEBOUNCE,
+        ),
+        dependencies=[],
+    )
 
-            # Retrieve state after sleep
-            new_state = app_state.value.as_dict()
+    def _persistence_lifecycle():
+        persistence.start()
+        return persistence.close
 
-            # Get state diff to send atomic updates
-            diff = extract_changed_subtree(old_state, new_state)
+    solara.use_effect(_persistence_lifecycle, dependencies=[])
 
-            # Return if diff dict is empty
-            if not diff:
-                continue
+    def _consume_write_state():
+        if not initial_state_loaded.value:
+            return
 
-            # Write the state to the server
-            _write_state(diff, app_state, story_state)
+        logger.info(f"Initializing with full DB write.")
+        persistence.write_all()
 
-    solara.lab.use_task(_consume_write_state, dependencies=[])
+    solara.lab.use_task(
+        _consume_write_state, dependencies=[initial_state_loaded.value]
+    )
 
     route_restored = solara.use_reactive(False)
 
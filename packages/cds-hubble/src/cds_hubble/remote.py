@@ -1,21 +1,31 @@
 import json
-from contextlib import closing
+import os
+import threading
+from collections import OrderedDict
 from csv import DictReader
-from functools import cache
-from io import BytesIO
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Sequence
 
-from astropy.io import fits
 from solara import Reactive
 from solara.toestand import Ref
 
+from cds_client import (
+    CDSAPIError,
+    CDSNotFoundError,
+    HubbleMeasurement,
+    HubbleMeasurementInput,
+    HubbleSampleMeasurementInput,
+)
+from cds_client.spectra import GALAXY_TYPE_FOLDERS
 from cds_core.base_states import BaseStageState, BaseStoryState
 from cds_core.logger import setup_logger
 from cds_core.remote import BaseAPI
 from cds_core.app_state import AppState
 from cds_core.utils import CDSJSONEncoder
-from .story_state import ClassSummary, StudentMeasurement, StudentSummary
+from .class_progress import CLASS_PROGRESS_HUB
+from .galaxy_catalog import GALAXY_CATALOG_CACHE, GalaxyCatalog
+from .story_state import ClassSummaryTable, MeasurementTable, StudentMeasurement
+from .story_state import StudentSummaryTable
 from .story_state import GalaxyData, SpectrumData, StoryState
 
 logger = setup_logger("CDS-HUBBLE API")
@@ -25,57 +35,108 @@ from pandas import read_csv
 
 DEBOUNCE_TIMEOUT = 1
 
+# Fields left out of the payloads sent to the measurement endpoints
+MEASUREMENT_EXCLUDE = {"galaxy", "class_id", "measurement_number"}
+SAMPLE_MEASUREMENT_EXCLUDE = {"galaxy", "class_id"}
+
+# Number of students whose submitted measurement payloads are remembered
+SUBMITTED_LRU_SIZE = int(os.getenv("CDS_SUBMITTED_LRU_SIZE", 1024))
+
+
+class _SubmittedMeasurements:
+    """
+    Payloads of measurements as last stored in the database, used to skip
+    submitting measurements that have not changed.
+
+    Payloads are grouped by student, and only the students who submitted
+    most recently are kept. Forgetting a student only means that their
+    measurements are submitted again.
+
+    Parameters
+    ----------
+    max_students : int, optional
+        Number of students whose payloads are kept.
+    """
+
+    def __init__(self, max_students: int = SUBMITTED_LRU_SIZE):
+        self.max_students = max_students
+        self._students: OrderedDict[int, dict[tuple, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            payloads = self._students.get(key[1])
+            return None if payloads is None else payloads.get(key)
+
+    def set(self, key: tuple, payload: dict):
+        student_id = key[1]
+        with self._lock:
+            self._students.setdefault(student_id, {})[key] = payload
+            self._students.move_to_end(student_id)
+            while len(self._students) > self.max_students:
+                self._students.popitem(last=False)
+
+    def forget(self, student_id: int):
+        with self._lock:
+            self._students.pop(student_id, None)
+
 
 class LocalAPI(BaseAPI):
+    def __init__(self):
+        super().__init__()
+        self._submitted_measurements = _SubmittedMeasurements()
+        self._bulk_submit_supported = True
+
     def get_app_story_states(
         self, global_state: Reactive[AppState], local_state: Reactive[StoryState]
     ) -> BaseStoryState | None:
 
         return super().get_app_story_states(global_state, local_state)
 
-    @cache
-    def get_galaxies(self, local_state: Reactive[StoryState]) -> list[GalaxyData]:
-        galaxy_data_json = self.request_session.get(
-            f"{self.API_URL}/{local_state.value.story_id}/galaxies?types=Sp"
-        ).json()
+    def get_galaxy_catalog(self, local_state: Reactive[StoryState]) -> GalaxyCatalog:
+        """
+        Return the spiral galaxy catalog for the story. The catalog is cached
+        for the whole process and shared between all sessions.
+        """
+        story_id = local_state.value.story_id
 
-        galaxy_data = [GalaxyData(**x) for x in galaxy_data_json]
+        def _fetch():
+            r = self.request_session.get(
+                f"{self.API_URL}/{story_id}/galaxies?types=Sp"
+            )
+            r.raise_for_status()
+            return r.json()
 
-        return galaxy_data
+        return GALAXY_CATALOG_CACHE.get(story_id, _fetch)
+
+    def get_galaxies(self, local_state: Reactive[StoryState]) -> Sequence[GalaxyData]:
+        return self.get_galaxy_catalog(local_state).galaxies
 
     def load_spectrum_data(
         self, local_state: Reactive[StoryState], gal_data: GalaxyData
     ) -> SpectrumData | None:
-        file_name = f"{gal_data.name.replace('.fits', '')}.fits"
-
-        type_folders = {"Sp": "spiral", "E": "elliptical", "Ir": "irregular"}
-        folder = type_folders[gal_data.type]
-        url = (
-            f"{self.API_URL}/{local_state.value.story_id}/spectra/{folder}/{file_name}"
-        )
-        response = self.request_session.get(url)
-
-        with closing(BytesIO(response.content)) as f:
-            f.name = gal_data.name
-
-            with fits.open(f) as hdulist:
-                data = hdulist["COADD"].data if "COADD" in hdulist else None
-
-        if data is None:
-            logger.error("No extension named 'COADD' in spectrum file.")
+        """
+        Return the spectrum of a galaxy. Decoded spectra are kept in the
+        process-wide spectrum store, so the FITS file is only downloaded the
+        first time a spectrum is requested on this host.
+        """
+        folder = GALAXY_TYPE_FOLDERS[gal_data.type]
+
+        try:
+            spectrum = self.client.hubble.galaxies.get_spectrum(
+                folder, gal_data.name.replace(".fits", "")
+            )
+        except (CDSAPIError, ValueError) as e:
+            logger.error("Failed to load spectrum for galaxy `%s`: %s", gal_data.id, e)
             return
 
-        spec_data = SpectrumData(
+        return SpectrumData(
             name=gal_data.name,
-            wave=10 ** data["loglam"],
-            flux=data["flux"],
-            ivar=data["ivar"],
+            wave=spectrum.wave,
+            flux=spectrum.flux,
+            ivar=spectrum.ivar,
         )
 
-        logger.info("Loaded spectrum data for galaxy `%s` from database.", gal_data.id)
-
-        return spec_data
-
     @staticmethod
     def get_dummy_data() -> List[StudentMeasurement]:
         path = (Path(__file__).parent / "data" / "dummy_student_data.csv").as_posix()
@@ -101,32 +162,26 @@ class LocalAPI(BaseAPI):
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
     ) -> list[StudentMeasurement]:
-        url = (
-            f"{self.API_URL}/{local_state.value.story_id}/measurements/"
-            f"{global_state.value.student.id}"
-        )
         if not global_state.value.update_db or self.is_educator:
             Ref(local_state.fields.measurements_loaded).set(True)
             logger.info("Skipping retrieval of measurements from database.")
             return []
 
-        r = self.request_session.get(url)
-
         measurements = Ref(local_state.fields.measurements)
-        if r.status_code == 200:
-            measurement_json = r.json()
-
-            # Build a lookup so each measurement can be re-joined with its
-            # full GalaxyData (the API only returns galaxy_id, not the object).
-            galaxy_lookup = {g.id: g for g in self.get_galaxies(local_state)}
+        try:
+            stored = self.client.hubble.measurements.get(global_state.value.student.id)
+        except CDSAPIError as e:
+            logger.warning("Failed to retrieve measurements: %s", e)
+        else:
+            # Re-join each measurement with its full GalaxyData (the API
+            # only returns galaxy_id, not the object).
+            catalog = self.get_galaxy_catalog(local_state)
 
-            parsed_measurements = []
-            for meas in measurement_json["measurements"]:
-                galaxy = galaxy_lookup.get(meas.get("galaxy_id"))
-                if galaxy is not None:
-                    meas = {**meas, "galaxy": galaxy}
-                parsed_measurements.append(StudentMeasurement(**meas))
+            parsed_measurements = [
+                self._parse_measurement(meas, catalog) for meas in stored
+            ]
 
+            self._mark_submitted(parsed_measurements, MEASUREMENT_EXCLUDE)
             measurements.set(parsed_measurements)
 
         Ref(local_state.fields.measurements_loaded).set(True)
@@ -144,16 +199,20 @@ class LocalAPI(BaseAPI):
         if not global_state.value.update_db or self.is_educator:
             sample_measurement_json = {"measurements": []}
         else:
-            r = self.request_session.get(
-                f"{self.API_URL}/{local_state.value.story_id}/sample-"
-                f"measurements/{global_state.value.student.id}"
-            )
-
-            sample_measurement_json = r.json()
+            sample_measurement_json = {
+                "measurements": [
+                    meas.model_dump(exclude_none=True)
+                    for meas in self.client.hubble.measurements.get_sample(
+                        global_state.value.student.id
+                    )
+                ]
+            }
 
         sample_gal_data = LOCAL_API.get_sample_galaxy(local_state)
-        galaxy_lookup = {g.id: g for g in self.get_galaxies(local_state)}
-        galaxy_lookup[sample_gal_data.id] = sample_gal_data
+        catalog = self.get_galaxy_catalog(local_state)
+
+        # Measurements appended below have not been written to the database yet
+        stored_count = len(sample_measurement_json["measurements"])
 
         if len(sample_measurement_json["measurements"]) == 0:
             logger.info(
@@ -188,11 +247,18 @@ class LocalAPI(BaseAPI):
             galaxy_id = meas.get("galaxy_id") or (
                 meas.get("galaxy", {}).get("id") if isinstance(meas.get("galaxy"), dict) else None
             )
-            galaxy = galaxy_lookup.get(galaxy_id)
+            galaxy = (
+                sample_gal_data
+                if galaxy_id == sample_gal_data.id
+                else catalog.get(galaxy_id)
+            )
             if galaxy is not None:
                 meas = {**meas, "galaxy": galaxy}
             parsed_sample_measurements.append(StudentMeasurement(**meas))
 
+        self._mark_submitted(
+            parsed_sample_measurements[:stored_count], SAMPLE_MEASUREMENT_EXCLUDE
+        )
         sample_measurements.set(parsed_sample_measurements)
 
         logger.info("Loaded example measurements from database.")
@@ -209,21 +275,21 @@ class LocalAPI(BaseAPI):
             logger.info("Skipping DB write")
             return False
 
-        url = f"{self.API_URL}/{local_state.value.story_id}/submit-measurement/"
+        endpoint = self.client.hubble.measurements
+        failed = self._submit_changed_measurements(
+            local_state.value.measurements,
+            exclude=MEASUREMENT_EXCLUDE,
+            submit=endpoint.submit,
+            submit_many=endpoint.submit_many,
+            input_model=HubbleMeasurementInput,
+        )
 
-        for measurement in local_state.value.measurements:
-            payload = measurement.model_dump(
-                exclude={"galaxy", "class_id", "measurement_number"},
-                exclude_none=True,
+        for measurement in failed:
+            logger.warning(
+                "Failed to add measurement for galaxy `%s` by student `%s`.",
+                measurement.galaxy_id,
+                global_state.value.student.id,
             )
-            r = self.request_session.put(url, json=payload)
-
-            if r.status_code != 200:
-                logger.warning(
-                    "Failed to add measurement for galaxy `%s` by student `%s`.",
-                    measurement.galaxy_id,
-                    global_state.value.student.id,
-                )
 
         logger.info(
             "Stored measurements for student `%s`.",
@@ -238,52 +304,141 @@ class LocalAPI(BaseAPI):
             logger.info("Skipping DB write")
             return False
 
-        url = f"{self.API_URL}/{local_state.value.story_id}/sample-measurement/"
-
-        for i, measurement in enumerate(local_state.value.example_measurements):
-            if i == 0:
-                logger.info(
-                    "Adding example measurement for galaxy `%s` by student `%s`.",
-                    measurement.galaxy_id,
-                    global_state.value.student.id,
-                )
+        endpoint = self.client.hubble.measurements
+        failed = self._submit_changed_measurements(
+            local_state.value.example_measurements,
+            exclude=SAMPLE_MEASUREMENT_EXCLUDE,
+            submit=endpoint.submit_sample,
+            submit_many=endpoint.submit_sample_many,
+            input_model=HubbleSampleMeasurementInput,
+        )
 
-            payload = measurement.model_dump(
-                exclude={"galaxy", "class_id"},
-                exclude_none=True,
+        for measurement in failed:
+            logger.warning(
+                "Failed to add example measurement for galaxy `%s` by student `%s`.",
+                measurement.galaxy_id,
+                global_state.value.student.id,
             )
-            r = self.request_session.put(url, json=payload)
 
-            if r.status_code != 200:
-                logger.warning(
-                    "Failed to add example measurement for galaxy `%s` by student `%s`.",
-                    measurement.galaxy_id,
-                    global_state.value.student.id,
-                )
-                print(r.text)
+        logger.info(
+            "Stored example measurements for student %s.",
+            global_state.value.student.id,
+        )
+        return True
 
-            logger.info(
-                "Stored example measurements for student %s.",
-                global_state.value.student.id,
+    @staticmethod
+    def _measurement_key(
+        measurement: StudentMeasurement, exclude: set[str]
+    ) -> tuple:
+        # The excluded fields differ between regular and sample measurements,
+        #  so they also keep the two kinds apart in the submission cache.
+        return (
+            frozenset(exclude),
+            measurement.student_id,
+            measurement.galaxy_id,
+            measurement.measurement_number,
+        )
+
+    def _mark_submitted(
+        self, measurements: list[StudentMeasurement], exclude: set[str]
+    ):
+        """
+        Record the payloads of measurements known to be stored in the
+        database, so that unchanged measurements are not submitted again.
+        """
+        for measurement in measurements:
+            self._submitted_measurements.set(
+                self._measurement_key(measurement, exclude),
+                measurement.model_dump(exclude=exclude, exclude_none=True),
             )
-        return True
+
+    def _forget_submitted(self, student_id: int):
+        self._submitted_measurements.forget(student_id)
+
+    @staticmethod
+    def _parse_measurement(
+        measurement: HubbleMeasurement, catalog: GalaxyCatalog
+    ) -> StudentMeasurement:
+        meas = measurement.model_dump(exclude_none=True)
+        galaxy = catalog.get(meas.get("galaxy_id"))
+        if galaxy is not None:
+            meas["galaxy"] = galaxy
+        return StudentMeasurement(**meas)
+
+    def _submit_changed_measurements(
+        self,
+        measurements: list[StudentMeasurement],
+        exclude: set[str],
+        submit: Callable,
+        submit_many: Callable,
+        input_model: type,
+    ) -> list[StudentMeasurement]:
+        """
+        Submit only the measurements whose payload changed since they were
+        last written. Multiple changed measurements are sent in a single
+        request through the bulk endpoint when the server provides it.
+
+        Returns the measurements that could not be stored.
+        """
+        pending = {}
+        for measurement in measurements:
+            key = self._measurement_key(measurement, exclude)
+            payload = measurement.model_dump(exclude=exclude, exclude_none=True)
+            if self._submitted_measurements.get(key) != payload:
+                pending[key] = (measurement, payload)
+
+        if not pending:
+            return []
+
+        if len(pending) > 1 and self._bulk_submit_supported:
+            try:
+                submit_many(
+                    [input_model(**payload) for _, payload in pending.values()]
+                )
+            except CDSAPIError as e:
+                if not isinstance(e, CDSNotFoundError) and e.status_code != 405:
+                    logger.warning("Failed to submit measurements in bulk: %s", e)
+                    return [measurement for measurement, _ in pending.values()]
+                logger.info(
+                    "Bulk measurement endpoint is unavailable; submitting "
+                    "measurements individually."
+                )
+                self._bulk_submit_supported = False
+            else:
+                for key, (_, payload) in pending.items():
+                    self._submitted_measurements.set(key, payload)
+                return []
+
+        failed = []
+        for key, (measurement, payload) in pending.items():
+            try:
+                submit(input_model(**payload))
+            except CDSAPIError as e:
+                logger.warning(e)
+                failed.append(measurement)
+            else:
+                self._submitted_measurements.set(key, payload)
+
+        return failed
 
     def get_measurement(
         self,
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
         galaxy_id: int,
-    ) -> StudentMeasurement:
+    ) -> StudentMeasurement | None:
         logger.info(
             "Retrieving measurement of galaxy %s for student %s...",
             (galaxy_id, global_state.value.student.id),
         )
-        url = (
-            f"{self.API_URL}/{local_state.value.story_id}/measurements/"
-            f"{global_state.value.student.id}/{galaxy_id}"
+        stored = self.client.hubble.measurements.get_one(
+            global_state.value.student.id, galaxy_id
+        )
+        if stored is None:
+            return None
+        measurement = self._parse_measurement(
+            stored, self.get_galaxy_catalog(local_state)
         )
-        measurement_json = self.request_session.get(url).json()
-        measurement = measurement_json["measurements"]
 
         measurements = Ref(local_state.fields.measurements)
 
@@ -324,21 +479,20 @@ class LocalAPI(BaseAPI):
             logger.info("Skipping deletion of measurements.")
             return
 
-        url = f"{self.API_URL}/{local_state.value.story_id}/measurements/{global_state.value.student.id}"
-        measurements_json = self.request_session.get(url).json()
+        student_id = global_state.value.student.id
+        self._forget_submitted(student_id)
 
-        for measurement in measurements_json["measurements"]:
-            # url = url + "/first" if samples else url + f"/{measurement['galaxy']['id']}"
-            url += f"/{measurement['galaxy']['id']}"
-            r = self.request_session.delete(url)
-
-            if r.status_code != 200:
+        endpoint = self.client.hubble.measurements
+        for measurement in endpoint.get(student_id):
+            try:
+                endpoint.delete(student_id, measurement.galaxy_id)
+            except CDSAPIError as e:
                 logger.error(
                     "Failed to delete measurement of galaxy `%s` for student `%s`.",
-                    measurement["galaxy"]["id"],
-                    global_state.value.student.id,
+                    measurement.galaxy_id,
+                    student_id,
                 )
-                logger.error(r.text)
+                logger.error(e)
 
     def get_sample_galaxy(
         self,
@@ -352,91 +506,131 @@ class LocalAPI(BaseAPI):
 
         return galaxy_data
 
+    @staticmethod
+    def _class_key(
+        global_state: Reactive[AppState], local_state: Reactive[StoryState]
+    ) -> tuple[str, int] | None:
+        class_info = global_state.value.classroom.class_info
+        if class_info is None or "id" not in class_info:
+            return None
+        return local_state.value.story_id, class_info["id"]
+
     def get_class_measurements(
         self,
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
         student_ids: Optional[List[int]] = None,
-    ) -> list[StudentMeasurement]:
+    ) -> MeasurementTable:
+        """
+        Return the completed measurements of the student's class. The
+        measurements are fetched once and shared with the other sessions of
+        the student through the class progress hub.
+        """
+        story_id = local_state.value.story_id
+        student_id = global_state.value.student.id
+        class_id = global_state.value.classroom.class_info["id"]
+
+        def _fetch():
+            url = (
+                f"{self.API_URL}/{story_id}/class-measurements/"
+                f"{student_id}/{class_id}"
+                f"?complete_only=true"
+            )
+            if student_ids:
+                url += f"&student_ids={''.join([str(x) for x in student_ids])}"
+            r = self.request_session.get(url)
+            measurement_json = r.json()
 
-        url = (
-            f"{self.API_URL}/{local_state.value.story_id}/class-measurements/"
-            f"{global_state.value.student.id}/{global_state.value.classroom.class_info['id']}"
-            f"?complete_only=true"
-        )
-        if student_ids:
-            url += f"&student_ids={''.join([str(x) for x in student_ids])}"
-        r = self.request_session.get(url)
-        measurement_json = r.json()
+            logger.info("Loaded class measurements from database.")
 
-        measurements = Ref(local_state.fields.class_measurements)
-        parsed_measurements = []
+            return MeasurementTable.from_records(measurement_json["measurements"])
 
-        for measurement in measurement_json["measurements"]:
-            measurement = StudentMeasurement(**measurement)
-            parsed_measurements.append(measurement)
+        parsed_measurements = CLASS_PROGRESS_HUB.get_class_measurements(
+            (story_id, class_id), student_id, _fetch, student_ids
+        )
 
+        measurements = Ref(local_state.fields.class_measurements)
         measurements.set(parsed_measurements)
 
-        logger.info("Loaded class measurements from database.")
-
         return measurements.value
 
+    def _fetch_students_completed_measurements_count(
+        self, student_id: int, class_id: int
+    ) -> int:
+        return self.client.hubble.measurements.get_students_completed_count(
+            student_id, class_id
+        )
+
     def get_students_completed_measurements_count(
         self,
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
     ) -> int:
-        if (
-            global_state.value.classroom.class_info is None
-            or "id" not in global_state.value.classroom.class_info
-        ):
+        class_key = self._class_key(global_state, local_state)
+        if class_key is None:
             logger.warning("No class id found in classroom info.")
             return 0
-        url = (
-            f"{self.API_URL}/{local_state.value.story_id}/class-measurements/students-completed/"
-            f"{global_state.value.student.id}/{global_state.value.classroom.class_info['id']}"
+        _, class_id = class_key
+        return self._fetch_students_completed_measurements_count(
+            global_state.value.student.id, class_id
+        )
+
+    def subscribe_class_progress(
+        self,
+        global_state: Reactive[AppState],
+        local_state: Reactive[StoryState],
+        listener: Callable[[int], None],
+    ) -> Callable[[], None]:
+        """
+        Call ``listener`` with the number of students in the class that have
+        completed their measurements, whenever it changes. The count is
+        polled once per class for all subscribed students. ``listener`` is
+        called from the poller thread.
+
+        Returns a function that removes the subscription.
+        """
+        class_key = self._class_key(global_state, local_state)
+        if class_key is None:
+            logger.warning("No class id found in classroom info.")
+            listener(0)
+            return lambda: None
+
+        _, class_id = class_key
+        student_id = global_state.value.student.id
+
+        return CLASS_PROGRESS_HUB.subscribe(
+            class_key,
+            lambda: self._fetch_students_completed_measurements_count(
+                student_id, class_id
+            ),
+            listener,
         )
-        r = self.request_session.get(url)
-        # TODO: Handle non-200 status codes
-        return r.json()["students_completed_measurements"]
 
     def get_all_data(
         self,
         global_state: Reactive[AppState],
         local_state: Reactive[StoryState],
-    ) -> tuple[list[StudentMeasurement], list[StudentSummary], list[ClassSummary]]:
+    ) -> tuple[MeasurementTable, StudentSummaryTable, ClassSummaryTable]:
         url = f"{self.API_URL}/{local_state.value.story_id}/all-data?minimal=True"
         if global_state.value.classroom.class_info is not None:
             url += f"&class_id={global_state.value.classroom.class_info['id']}"
         r = self.request_session.get(url)
         res_json = r.json()
 
+        # The tables are built column by column straight from the JSON,
+        #  without creating a model instance per measurement
         measurements = Ref(local_state.fields.all_measurements)
-        parsed_measurements = []
-        for measurement in res_json["measurements"]:
-            if measurement["class_id"] is None:
-                continue
-            measurement = StudentMeasurement(**measurement)
-            parsed_measurements.append(measurement)
-
-        measurements.set(parsed_measurements)
+        measurements.set(
+            MeasurementTable.from_records(
+                [m for m in res_json["measurements"] if m["class_id"] is not None]
+            )
+        )
 
         student_summaries = Ref(local_state.fields.student_summaries)
-        parsed_student_summaries = []
-        for summary in res_json["studentData"]:
-            summary = StudentSummary(**summary)
-            parsed_student_summaries.append(summary)
-
-        student_summaries.set(parsed_student_summaries)
+        student_summaries.set(StudentSummaryTable.from_records(res_json["studentData"]))
 
         class_summaries = Ref(local_state.fields.class_summaries)
-        parsed_class_summaries = []
-        for summary in res_json["classData"]:
-            summary = ClassSummary(**summary)
-            parsed_class_summaries.append(summary)
-
-        class_summaries.set(parsed_class_summaries)
+        class_summaries.set(ClassSummaryTable.from_records(res_json["classData"]))
 
         logger.info("Loaded all measurements and summary data from database.")
 
@@ -461,15 +655,16 @@ class LocalAPI(BaseAPI):
             {"current_step": component_state.value.current_step.value}
         )
 
-        r = self.request_session.put(
-            f"{self.API_URL}/stage-state/{global_state.value.student.id}/"
-            f"{local_state.value.story_id}/{component_state.value.stage_id}",
-            json=comp_state_dict,
-        )
-
-        if r.status_code != 200:
+        try:
+            self.client.stories.put_stage_state(
+                global_state.value.student.id,
+                local_state.value.story_id,
+                component_state.value.stage_id,
+                comp_state_dict,
+            )
+        except CDSAPIError as e:
             logger.error("Failed to write story state to database.")
-            logger.error(r.text)
+            logger.error(e)
             return False
 
         return True
@@ -489,16 +684,15 @@ class LocalAPI(BaseAPI):
             ),
         }
 
-        state_json = json.dumps(state, cls=CDSJSONEncoder)
-        r = self.request_session.put(
-            f"{self.API_URL}/story-state/{global_state.value.student.id}/{local_state.value.story_id}",
-            headers={"Content-Type": "application/json"},
-            data=state_json,
-        )
-
-        if r.status_code != 200:
+        # Round-trip through the encoder, which handles numpy values
+        state = json.loads(json.dumps(state, cls=CDSJSONEncoder))
+        try:
+            self.client.stories.put_story_state(
+                global_state.value.student.id, local_state.value.story_id, state
+            )
+        except CDSAPIError as e:
             logger.error("Failed to write story state to database.")
-            logger.error(r.text)
+            logger.error(e)
             return False
 
         return True
@@ -255,7 +255,7 @@ def Page(app_state: Reactive[AppState]):
                 transition_to(stage_state, Marker.sel_gal3, force=True)
 
         if stage_state.value.current_step.value > Marker.cho_row1.value:
-            stage_state.value.selected_example_galaxy = (
+            Ref(stage_state.fields.selected_example_galaxy).set(
                 1576  # id of the first example galaxy
             )
 
@@ -452,11 +452,9 @@ def Page(app_state: Reactive[AppState]):
             solara.lab.use_task(snackbar_off, dependencies=[show_snackbar])
 
             def _galaxy_added_callback(galaxy_data: dict):
-                galaxy = next(
-                    gal
-                    for gal in LOCAL_API.get_galaxies(story_state)
-                    if gal.id == int(galaxy_data["id"])
-                )
+                galaxy = LOCAL_API.get_galaxy_catalog(story_state).by_id[
+                    int(galaxy_data["id"])
+                ]
                 already_exists = galaxy.id in [
                     x.galaxy_id for x in story_state.value.measurements
                 ]
@@ -499,11 +497,9 @@ def Page(app_state: Reactive[AppState]):
             total_galaxies.subscribe(advance_on_total_galaxies)
 
             def _galaxy_selected_callback(galaxy_data: dict):
-                galaxy = next(
-                    gal
-                    for gal in LOCAL_API.get_galaxies(story_state)
-                    if gal.id == int(galaxy_data["id"])
-                )
+                galaxy = LOCAL_API.get_galaxy_catalog(story_state).by_id[
+                    int(galaxy_data["id"])
+                ]
                 selected_galaxy = Ref(stage_state.fields.selected_galaxy)
                 selected_galaxy.set(galaxy.id)
                 galaxy_is_selected = Ref(stage_state.fields.galaxy_is_selected)
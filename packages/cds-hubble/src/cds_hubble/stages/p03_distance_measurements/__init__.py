@@ -269,9 +269,10 @@ def Page(app_state: Reactive[AppState]):
 
         def show_ruler_range(marker):
             print(f"show_ruler_range: {marker}")
-            stage_state.value.show_ruler = marker.is_between(
-                Marker.ang_siz3, Marker.est_dis4
-            ) or marker.is_between(Marker.dot_seq5, Marker.last())
+            Ref(stage_state.fields.show_ruler).set(
+                marker.is_between(Marker.ang_siz3, Marker.est_dis4)
+                or marker.is_between(Marker.dot_seq5, Marker.last())
+            )
 
         Ref(stage_state.fields.current_step).subscribe(show_ruler_range)
 
@@ -1,9 +1,8 @@
 import asyncio
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 from typing import cast
 
-import numpy as np
 import reacton.ipyvuetify as rv
 import solara
 from echo import delay_callback
@@ -21,7 +20,7 @@ from cds_core.base_states import (
 )
 from cds_core.components import ScaffoldAlert, StateEditor, ViewerLayout
 from cds_core.logger import setup_logger
-from cds_core.utils import empty_data_from_model_class, DEFAULT_VIEWER_HEIGHT
+from cds_core.utils import DEFAULT_VIEWER_HEIGHT
 from cds_core.viewers import CDSScatterView
 from .stage_state import Marker, StageState
 from ...components import (
@@ -35,8 +34,8 @@ from ...helpers.measurement_helpers import fill_add_all_measurements
 from ...helpers.viewer_marker_colors import MY_DATA_COLOR, MY_CLASS_COLOR, GENERIC_COLOR
 from ...remote import LOCAL_API
 from ...story_state import (
+    MeasurementTable,
     StoryState,
-    StudentMeasurement,
     mc_callback,
     fr_callback,
     get_free_response,
@@ -44,7 +43,6 @@ from ...story_state import (
 )
 from ...utils import (
     AGE_CONSTANT,
-    models_to_glue_data,
     PLOTLY_MARGINS,
     get_image_path,
     push_to_route,
@@ -66,7 +64,7 @@ def Page(app_state: Reactive[AppState]):
 
     completed_count = solara.use_reactive(0)
 
-    class_plot_data = solara.use_reactive([])
+    class_plot_data = solara.use_reactive(MeasurementTable.empty())
 
     # Are the buttons available to press?
     draw_active = solara.use_reactive(False)
@@ -117,14 +115,6 @@ def Page(app_state: Reactive[AppState]):
 
     gjapp, viewers = solara.use_memo(glue_setup, dependencies=[])
 
-    def check_completed_students_count():
-        logger.info("Checking how many students have completed measurements")
-        count = LOCAL_API.get_students_completed_measurements_count(
-            app_state, story_state
-        )
-        logger.info(f"Count: {count}")
-        return count
-
     def load_class_data():
         logger.info("Loading class data")
         measurements = Ref(story_state.fields.class_measurements)
@@ -135,26 +125,19 @@ def Page(app_state: Reactive[AppState]):
 
         class_data_points = class_measurements
         if not student_ids.value:
-            ids = [
-                int(id) for id in np.unique([m.student_id for m in class_measurements])
-            ]
-            student_ids.set(ids)
+            student_ids.set(class_measurements.student_ids)
         measurements.set(class_measurements)
 
         _on_class_data_loaded(class_data_points)
         class_data_loaded.set(True)
         return class_data_points
 
-    def _on_class_data_loaded(class_data_points: List[StudentMeasurement]):
+    def _on_class_data_loaded(class_data_points: MeasurementTable):
         logger.info("Setting up class glue data")
         if not class_data_points:
             return
 
-        class_data = models_to_glue_data(class_data_points, label="Stage 4 Class Data")
-        if not class_data.components:
-            class_data = empty_data_from_model_class(
-                StudentMeasurement, label="Stage 4 Class Data"
-            )
+        class_data = class_data_points.to_glue_data(label="Stage 4 Class Data")
         class_data = app_state.value.add_or_update_data(class_data)
         class_data.style.color = MY_CLASS_COLOR
         class_data.style.alpha = 1
@@ -176,13 +159,30 @@ def Page(app_state: Reactive[AppState]):
 
     async def keep_checking_class_data():
         enough_students_ready = Ref(story_state.fields.enough_students_ready)
-        # Add a state guard in case task cancellation fails
-        while stage_state.value.current_step == Marker.wwt_wait:
-            count = check_completed_students_count()
-            if (not enough_students_ready.value) and count >= 12:
-                enough_students_ready.set(True)
-            completed_count.set(count)
-            await asyncio.sleep(10)
+
+        # The count is polled once for the whole class and pushed from the
+        #  poller thread, so hand it over to this task's event loop
+        loop = asyncio.get_running_loop()
+        counts = asyncio.Queue()
+        unsubscribe = LOCAL_API.subscribe_class_progress(
+            app_state,
+            story_state,
+            lambda count: loop.call_soon_threadsafe(counts.put_nowait, count),
+        )
+
+        try:
+            # Add a state guard in case task cancellation fails
+            while stage_state.value.current_step == Marker.wwt_wait:
+                try:
+                    count = await asyncio.wait_for(counts.get(), timeout=10)
+                except asyncio.TimeoutError:
+                    continue
+                logger.info(f"Students with completed measurements: {count}")
+                if (not enough_students_ready.value) and count >= 12:
+                    enough_students_ready.set(True)
+                completed_count.set(count)
+        finally:
+            unsubscribe()
 
     class_ready_task = solara.lab.use_task(keep_checking_class_data, dependencies=[])
 
@@ -547,20 +547,29 @@ def Page(app_state: Reactive[AppState]):
                             and len(class_plot_data.value) > 0
                         ):
                             # Note the ordering here - we want the student data on top
-                            layers = (class_plot_data.value, student_plot_data.value)
+                            layers = (
+                                (
+                                    class_plot_data.value["est_dist_value"].tolist(),
+                                    class_plot_data.value["velocity_value"].tolist(),
+                                ),
+                                (
+                                    [t.est_dist_value for t in student_plot_data.value],
+                                    [t.velocity_value for t in student_plot_data.value],
+                                ),
+                            )
                             layers_visible = (False, True)
 
                             plot_data = [
                                 {
-                                    "x": [t.est_dist_value for t in data],
-                                    "y": [t.velocity_value for t in data],
+                                    "x": xs,
+                                    "y": ys,
                                     "mode": "markers",
                                     "marker": {"color": color, "size": size},
                                     "visible": visibility,
                                     "hoverinfo": "none",
                                     "showlegend": False,
                                 }
-                                for data, color, size, visibility in zip(
+                                for (xs, ys), color, size, visibility in zip(
                                     layers, colors, sizes, layers_visible
                                 )
                             ]
@@ -3,7 +3,6 @@ from functools import partial
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Tuple, cast
 
-import numpy as np
 import reacton.ipyvuetify as rv
 import solara
 from echo import delay_callback, add_callback
@@ -54,8 +53,11 @@ from ...remote import LOCAL_API
 from ...story_state import (
     StoryState,
     ClassSummary,
+    ClassSummaryTable,
+    MeasurementTable,
     StudentMeasurement,
     StudentSummary,
+    StudentSummaryTable,
     mc_callback,
     fr_callback,
     get_free_response,
@@ -178,48 +180,47 @@ def Page(app_state: Reactive[AppState]):
         # if we are a teacher then our measurements were not loaded with class_measurements and only exist on the front end in local_state.value.measuements
         #  make sure we add these to the class_measurements
         if (not app_state.value.update_db) and len(story_state.value.measurements) > 0:
-            class_measurements.extend(m for m in story_state.value.measurements)
+            class_measurements = MeasurementTable.concat(
+                class_measurements,
+                MeasurementTable.from_models(story_state.value.measurements),
+            )
+
+        class_info = app_state.value.classroom.class_info
+        if class_info is not None:
+            class_measurements = class_measurements.with_column(
+                "class_id", class_info["id"]
+            )
 
         measurements = Ref(story_state.fields.class_measurements)
         if class_measurements and not student_ids.value:
-            ids = list(np.unique([m.student_id for m in class_measurements]))
+            ids = class_measurements.student_ids
             student_ids.set(ids)
         measurements.set(class_measurements)
 
         all_measurements, student_summaries, class_summaries = LOCAL_API.get_all_data(
             app_state, story_state
         )
-        if app_state.value.classroom.class_info is not None:
-            class_id = app_state.value.classroom.class_info["id"]
-            class_distances = [
-                distance
-                for m in class_measurements
-                if (
-                    (distance := m.est_dist_value) is not None
-                    and m.velocity_value is not None
-                )
-            ]
-            class_velocities = [
-                velocity
-                for m in class_measurements
-                if (
-                    m.est_dist_value is not None
-                    and (velocity := m.velocity_value) is not None
-                )
-            ]
+        if class_info is not None:
+            class_id = class_info["id"]
             my_class_h0, my_class_age = create_single_summary(
-                distances=class_distances, velocities=class_velocities
+                distances=class_measurements["est_dist_value"],
+                velocities=class_measurements["velocity_value"],
             )
-            class_summaries.append(
-                ClassSummary(
-                    class_id=class_id,
-                    hubble_fit_value=my_class_h0,
-                    age_value=my_class_age,
-                )
+            class_summaries = ClassSummaryTable.concat(
+                class_summaries,
+                ClassSummaryTable.from_models(
+                    [
+                        ClassSummary(
+                            class_id=class_id,
+                            hubble_fit_value=my_class_h0,
+                            age_value=my_class_age,
+                        )
+                    ]
+                ),
+            )
+            all_measurements = MeasurementTable.concat(
+                all_measurements, class_measurements
             )
-            for measurement in class_measurements:
-                measurement.class_id = class_id
-            all_measurements.extend(class_measurements)
 
         all_meas = Ref(story_state.fields.all_measurements)
         all_stu_summaries = Ref(story_state.fields.student_summaries)
@@ -241,7 +242,7 @@ def Page(app_state: Reactive[AppState]):
         if (not app_state.value.update_db) and len(story_state.value.measurements) > 0:
             class_ids.append([m.student_id for m in story_state.value.measurements][0])
         class_data_points = story_state.value.class_measurements
-        class_data = models_to_glue_data(class_data_points, label="Class Data")
+        class_data = class_data_points.to_glue_data(label="Class Data")
         class_data = app_state.value.add_or_update_data(class_data)
 
         for component in ("est_dist_value", "velocity_value"):
@@ -326,11 +327,17 @@ def Page(app_state: Reactive[AppState]):
         my_h0, my_age = create_single_summary(
             distances=my_distances, velocities=my_velocities
         )
-        student_summaries.append(
-            StudentSummary(
-                student_id=student_id, hubble_fit_value=my_h0, age_value=my_age
-            )
+        student_summaries = StudentSummaryTable.concat(
+            student_summaries,
+            StudentSummaryTable.from_models(
+                [
+                    StudentSummary(
+                        student_id=student_id, hubble_fit_value=my_h0, age_value=my_age
+                    )
+                ]
+            ),
         )
+        all_stu_summaries.set(student_summaries)
 
         student_hist_viewer.add_data(class_summary_data)
         student_hist_viewer.state.x_att = class_summary_data.id["age_value"]
@@ -339,17 +346,15 @@ def Page(app_state: Reactive[AppState]):
         student_hist_viewer.layers[0].state.color = MY_CLASS_COLOR
         student_hist_viewer.add_subset(my_summ_subset)
 
-        all_data = models_to_glue_data(all_measurements, label="All Measurements")
+        all_data = all_measurements.to_glue_data(label="All Measurements")
         all_data = app_state.value.add_or_update_data(all_data)
 
-        student_summ_data = models_to_glue_data(
-            student_summaries, label="All Student Summaries"
+        student_summ_data = student_summaries.to_glue_data(
+            label="All Student Summaries"
         )
         student_summ_data = app_state.value.add_or_update_data(student_summ_data)
 
-        all_class_summ_data = models_to_glue_data(
-            class_summaries, label="All Class Summaries"
-        )
+        all_class_summ_data = class_summaries.to_glue_data(label="All Class Summaries")
         all_class_summ_data = app_state.value.add_or_update_data(all_class_summ_data)
 
         if len(all_data.subsets) == 0:
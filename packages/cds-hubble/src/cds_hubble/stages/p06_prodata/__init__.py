@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import Tuple, cast
 
-import numpy as np
 import reacton.ipyvuetify as rv
 import solara
 from glue.core.data_factories import load_data
@@ -40,7 +39,6 @@ from ...story_state import (
 )
 from ...utils import (
     HST_KEY_AGE,
-    models_to_glue_data,
     AGE_CONSTANT,
     push_to_route,
     PLOTLY_MARGINS,
@@ -105,13 +103,12 @@ def Page(app_state: Reactive[AppState]):
             measurements = Ref(story_state.fields.class_measurements)
             student_ids = Ref(story_state.fields.stage_5_class_data_students)
             if class_measurements and not student_ids.value:
-                ids = list(np.unique([m.student_id for m in class_measurements]))
-                student_ids.set(ids)
+                student_ids.set(class_measurements.student_ids)
             measurements.set(class_measurements)
 
         if "Class Data" not in gjapp.data_collection:
-            class_data = models_to_glue_data(
-                story_state.value.class_measurements, label="Class Data"
+            class_data = story_state.value.class_measurements.to_glue_data(
+                label="Class Data"
             )
             class_data = app_state.value.add_or_update_data(class_data)
 
@@ -1,12 +1,14 @@
 import datetime
-from typing import Callable, Tuple, Optional
+from typing import Any, Callable, Mapping, Optional, Sequence, Tuple
 from typing import TypeVar
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, ConfigDict, computed_field
 from pydantic import Field
+from pydantic.fields import FieldInfo
 from solara import Reactive
 from solara.toestand import Ref
 
+from cds_client.models.arrays import Float32Array
 from cds_core.base_states import (
     BaseStoryState,
     MultipleChoiceResponse,
@@ -14,6 +16,7 @@ from cds_core.base_states import (
     register_story,
 )
 from cds_core.logger import setup_logger
+from cds_core.model_table import ModelTable
 from .helpers.data_management import ELEMENT_REST
 
 logger = setup_logger("HUBBLEDS-STATE")
@@ -21,12 +24,15 @@ logger = setup_logger("HUBBLEDS-STATE")
 
 class SpectrumData(BaseModel):
     name: str
-    wave: list[float]
-    flux: list[float]
-    ivar: list[float]
+    wave: Float32Array
+    flux: Float32Array
+    ivar: Float32Array
 
 
 class GalaxyData(BaseModel):
+    # Galaxies are shared between sessions through the catalog cache
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     ra: float
@@ -102,6 +108,54 @@ class ClassSummary(BaseSummary):
     class_id: int
 
 
+class MeasurementTable(ModelTable):
+    """
+    Columnar table of student measurements. Galaxies are referenced by
+    their id into the shared galaxy catalog instead of being stored per row.
+    """
+
+    model = StudentMeasurement
+
+    @classmethod
+    def column_fields(cls) -> dict[str, FieldInfo]:
+        fields = dict(StudentMeasurement.model_fields)
+        fields.pop("galaxy")
+        fields["galaxy_id"] = FieldInfo(annotation=int, default=0)
+        return fields
+
+    @classmethod
+    def _record(cls, item: StudentMeasurement) -> dict[str, Any]:
+        record = super()._record(item)
+        record["galaxy_id"] = item.galaxy_id
+        return record
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "MeasurementTable":
+        def _galaxy_id(record: Mapping[str, Any]) -> int:
+            if record.get("galaxy_id") is not None:
+                return record["galaxy_id"]
+            galaxy = record.get("galaxy")
+            if isinstance(galaxy, dict):
+                return galaxy.get("id", 0)
+            return getattr(galaxy, "id", 0)
+
+        return super().from_records(
+            [{**record, "galaxy_id": _galaxy_id(record)} for record in records]
+        )
+
+    @property
+    def student_ids(self) -> list[int]:
+        return self.unique("student_id")
+
+
+class StudentSummaryTable(ModelTable):
+    model = StudentSummary
+
+
+class ClassSummaryTable(ModelTable):
+    model = ClassSummary
+
+
 @register_story("hubbles_law")
 class StoryState(BaseStoryState):
     title: str = "Hubble's Law"
@@ -111,14 +165,18 @@ class StoryState(BaseStoryState):
     example_measurements: list[StudentMeasurement] = Field(
         default_factory=list, exclude=True
     )
-    class_measurements: list[StudentMeasurement] = Field(
-        default_factory=list, exclude=True
+    class_measurements: MeasurementTable = Field(
+        default_factory=MeasurementTable.empty, exclude=True
     )
-    all_measurements: list[StudentMeasurement] = Field(
-        default_factory=list, exclude=True
+    all_measurements: MeasurementTable = Field(
+        default_factory=MeasurementTable.empty, exclude=True
+    )
+    student_summaries: StudentSummaryTable = Field(
+        default_factory=StudentSummaryTable.empty, exclude=True
+    )
+    class_summaries: ClassSummaryTable = Field(
+        default_factory=ClassSummaryTable.empty, exclude=True
     )
-    student_summaries: list[StudentSummary] = Field(default_factory=list, exclude=True)
-    class_summaries: list[ClassSummary] = Field(default_factory=list, exclude=True)
     measurements_loaded: bool = False
     calculations: dict = {}
     validation_failure_counts: dict = {}
@@ -245,8 +303,8 @@ def fr_callback(
         logger.debug(f"Free Response update event received: {event[1]}")
         new_response = FreeResponse(**{**event[1], "stage": stage_state.value.stage_id})
 
-        # TODO: We do not use a Ref here, which means that Free Response
-        #  updates are not reactive. This is because the reactivity is added
-        #  directly in the ScaffoldAlert vue component. We may want to revisit
-        #  this later to make it more consistent.
-        stage_state.value.free_responses[new_response.tag] = new_response
+        # Set a new dictionary rather than updating the current one in place,
+        #  so that the change is seen by `StatePersistence` and written
+        Ref(stage_state.fields.free_responses).set(
+            {**stage_state.value.free_responses, new_response.tag: new_response}
+        )
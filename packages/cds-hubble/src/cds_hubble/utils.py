@@ -1,6 +1,6 @@
-from collections import defaultdict
 from astropy import units as u
 from astropy.modeling import models, fitting
+import numpy as np
 from numpy import argsort, array, pi
 
 from cds_core.utils import component_type_for_field, mode, percent_around_center_indices
@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from glue.core import Data
 from glue_jupyter.app import JupyterApplication
 from numbers import Number
-from typing import List, Set, Tuple, TypeVar, Optional, cast, Any
+from typing import List, Tuple, TypeVar, Optional, cast, Any
 from collections.abc import Callable
 import solara
 from solara.routing import Router
@@ -20,9 +20,6 @@ from .story_state import GalaxyData, StudentMeasurement
 from glue.core import Data
 from numpy import asarray
 
-from deepdiff import DeepDiff
-from deepdiff.helper import NotPresent
-
 from pathlib import Path
 
 try:
@@ -106,7 +103,8 @@ def age_in_gyr_simple(H0):
     inv = 1 / H0
     mpc_to_km = u.Mpc.to(u.km)
     s_to_gyr = u.s.to(u.Gyr)
-    return round(inv * mpc_to_km * s_to_gyr, 3)
+    # `np.round` so that arrays of values (e.g. per student) work as well
+    return np.round(inv * mpc_to_km * s_to_gyr, 3)
 
 
 def fit_line(x, y):
@@ -199,13 +197,55 @@ def models_to_glue_data(
     return Data(**data_dict)
 
 
+def fit_slopes_through_origin(
+    group_ids: Any, x: Any, y: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit a line through the origin to the points of each group at once.
+
+    The least-squares slope of a line through the origin is
+    ``sum(x * y) / sum(x ** 2)``, so the fit of every group reduces to two
+    `numpy.bincount` sums over the group indices. Points where ``x`` or
+    ``y`` is missing or not finite are skipped.
+
+    Parameters
+    ----------
+    group_ids : array-like
+        The group (e.g. student or class id) of each point.
+    x, y : array-like
+        The coordinates of each point.
+
+    Returns
+    -------
+    ids : `~numpy.ndarray`
+        The sorted unique group ids.
+    slopes : `~numpy.ndarray`
+        The fitted slope of each group, NaN for groups without valid points.
+    """
+    ids, groups = np.unique(np.asarray(group_ids), return_inverse=True)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    valid = np.isfinite(x) & np.isfinite(y)
+    groups, x, y = groups[valid], x[valid], y[valid]
+
+    sum_xy = np.bincount(groups, weights=x * y, minlength=len(ids))
+    sum_xx = np.bincount(groups, weights=x * x, minlength=len(ids))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = sum_xy / sum_xx
+
+    return ids, slopes
+
+
 def create_single_summary(
     distances: List[Number], velocities: List[Number]
 ) -> Tuple[float, float]:
-    line = fit_line(distances, velocities)
-    h0 = line.slope.value
+    _, (h0,) = fit_slopes_through_origin(
+        np.zeros(len(distances), dtype=int), distances, velocities
+    )
     age = age_in_gyr_simple(h0)
-    return h0, age
+    return float(h0), float(age)
 
 
 def make_summary_data(
@@ -214,31 +254,17 @@ def make_summary_data(
     output_id_field: str | None = None,
     label: str | None = None,
 ) -> Data:
-    dists = defaultdict(list)
-    vels = defaultdict(list)
-    d = measurement_data["est_dist_value"]
-    v = measurement_data["velocity_value"]
-    ids: Set[int] = set()
-
-    for i in range(measurement_data.size):
-        id_num = measurement_data[input_id_field][i]
-        ids.add(id_num)
-        dist = d[i]
-        vel = v[i]
-        if dist is not None and vel is not None:
-            dists[id_num].append(dist)
-            vels[id_num].append(vel)
-
-    hubbles: List[float] = []
-    ages: List[float] = []
-    for id_num in ids:
-        h0, age = create_single_summary(dists[id_num], vels[id_num])
-        hubbles.append(h0)
-        ages.append(age)
+    ids, hubbles = fit_slopes_through_origin(
+        measurement_data[input_id_field],
+        measurement_data["est_dist_value"],
+        measurement_data["velocity_value"],
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ages = age_in_gyr_simple(hubbles)
 
     data_kwargs: dict = {"hubble_fit_value": hubbles, "age_value": ages}
     output_id_field = output_id_field or input_id_field
-    data_kwargs[output_id_field] = list(ids)
+    data_kwargs[output_id_field] = ids
 
     if label:
         data_kwargs["label"] = label
@@ -386,39 +412,6 @@ def dict_diff(d1, d2, path=""):
     return diffs
 
 
-def apply_changes(result, changes):
-    for change in changes:
-        path = change.path(output_format="list")
-        value = change.t2
-        if isinstance(value, NotPresent):
-            value = None
-
-        # Build nested dict structure
-        current = result
-        for key in path[:-1]:
-            current = current.setdefault(key, {})
-
-        current[path[-1]] = value
-
-
-def extract_changed_subtree(old_dict, new_dict):
-    diff = DeepDiff(old_dict, new_dict, view="tree")
-    result = {}
-
-    change_keys = [
-        "values_changed",
-        "iterable_item_added",
-        "iterable_item_removed",
-        "dictionary_item_added",
-    ]
-
-    for key in change_keys:
-        if (changes := diff.get(key, None)) is not None:
-            apply_changes(result, changes)
-
-    return result
-
-
 def observed_wavelength_from_redshift(z: float, rest_wavelength: float) -> float:
     return rest_wavelength * (1 + z)
 
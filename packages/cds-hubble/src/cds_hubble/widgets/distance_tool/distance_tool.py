@@ -3,7 +3,8 @@ from datetime import datetime
 import astropy.units as u
 import ipyvue as v
 from astropy.coordinates import Angle, SkyCoord
-from cds_core.utils import RepeatedTimer, load_template
+from cds_core.scheduler import SCHEDULER
+from cds_core.utils import load_template
 from ipywidgets import DOMWidget, widget_serialization
 from traitlets import Instance, Bool, Float, Int, Unicode, observe, Dict
 
@@ -55,6 +56,7 @@ class DistanceTool(v.VueTemplate):
     START_COORDINATES = SkyCoord(170 * u.deg, 13.3 * u.deg, frame='icrs')
 
     def __init__(self, *args, **kwargs):
+        self._rt = None
         self.widget = HubbleWWTWidget(use_remote=True)
         self.background = self.SDSS
         self.measuring = kwargs.get('measuring', False)
@@ -74,13 +76,15 @@ class DistanceTool(v.VueTemplate):
         self.widget._set_message_type_callback('wwt_view_state',
                                                self._update_wwt_state)
         self.last_update = datetime.now()
-        self._rt = RepeatedTimer(self.UPDATE_TIME, self._update_wwt_state)
-        self._rt.start()
+        if self._rt is not None:
+            self._rt.cancel()
+        self._rt = SCHEDULER.call_every(self.UPDATE_TIME, self._update_wwt_state)
         self.set_background()
         self.update_text()
 
     def __del__(self):
-        self._rt.stop()
+        if self._rt is not None:
+            self._rt.cancel()
         super().__del__()
 
     def set_background(self):
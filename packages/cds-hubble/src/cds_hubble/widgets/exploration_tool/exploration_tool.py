@@ -3,7 +3,8 @@ from datetime import datetime
 import astropy.units as u
 import ipyvue as v
 from astropy.coordinates import Angle
-from cds_core.utils import RepeatedTimer, load_template
+from cds_core.scheduler import SCHEDULER
+from cds_core.utils import load_template
 from ipywidgets import DOMWidget, widget_serialization
 from ipywwt import WWTWidget
 from traitlets import Bool, Instance, Int
@@ -37,6 +38,7 @@ class ExplorationTool(v.VueTemplate):
     def __init__(self, *args, **kwargs):
         # self.widget = WWTJupyterWidget(hide_all_chrome=True)
         self.widget = WWTWidget(use_remote=True)
+        self._rt = None
 
         # Wait for the WWT frontend to be ready
         self.widget.observe(lambda change: self._setup(),
@@ -52,7 +54,9 @@ class ExplorationTool(v.VueTemplate):
             "wwt_view_state", self._handle_view_message
         )
         self.last_update = datetime.now()
-        self._rt = RepeatedTimer(self.UPDATE_TIME, self._update_if_needed)
+        if self._rt is not None:
+            self._rt.cancel()
+        self._rt = SCHEDULER.call_every(self.UPDATE_TIME, self._update_if_needed)
 
     def _update_if_needed(self):
         delta = datetime.now() - self.last_update
@@ -76,7 +80,8 @@ class ExplorationTool(v.VueTemplate):
         if self.pan_count >= self.PANS_NEEDED or self.zoom_count >= self.ZOOMS_NEEDED:
             self.exploration_complete = True
             self.widget._set_message_type_callback("wwt_view_state", None)
-            self._rt.stop()
+            if self._rt is not None:
+                self._rt.cancel()
 
     def _handle_view_message(self, wwt, _updated):
         fov = Angle(wwt.get_fov())
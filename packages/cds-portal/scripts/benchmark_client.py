@@ -0,0 +1,138 @@
+"""
+Benchmark the portal's login and class creation flows with a new `CDSClient`
+per callback (as the portal used to do) against the shared, pooled client.
+
+The flows run against a local stand-in for the API that answers with canned
+records. It waits ``--handshake-ms`` whenever a new connection is opened, to
+stand in for the TCP and TLS handshakes with the real API host.
+
+    python packages/cds-portal/scripts/benchmark_client.py --repeat 20
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cds_client import CDSClient, ClassCreationInfo, shared_client
+
+STORY = "hubbles_law"
+TIMESTAMP = "2025-01-01T00:00:00+00:00"
+
+EDUCATOR = {
+    "id": 1, "verified": True, "verification_code": "", "email": "e@example.edu",
+    "username": "educator", "first_name": "Jane", "last_name": "Smith",
+    "password": "", "institution": "", "gender": "", "ip": "", "lat": "",
+    "lon": "", "profile_created": TIMESTAMP, "visits": 1,
+    "last_visit": TIMESTAMP, "last_visit_ip": "",
+}
+STUDENT = {
+    "id": 7, "email": "s@student.cosmicds", "username": "student",
+    "password": "", "profile_created": TIMESTAMP, "visits": 1,
+    "last_visit": TIMESTAMP, "dummy": False,
+}
+CLASSES = [
+    {
+        "id": i, "name": f"Class {i}", "educator_id": 1, "created": TIMESTAMP,
+        "active": True, "code": f"code-{i}", "asynchronous": False,
+        "test": False, "seed": False, "expected_size": 30,
+    }
+    for i in range(1, 4)
+]
+
+
+def _route(method, path):
+    if method == "POST" and path == "/classes/create":
+        return {"class_info": {"code": "code-1"}}
+    if path.startswith("/educators/"):
+        return {"educator": EDUCATOR if path.endswith("/1") else None}
+    if (path.startswith("/students/") and path.endswith("/classes")) or path.startswith("/student-classes/"):
+        return {"classes": CLASSES}
+    if path.startswith("/students/"):
+        return {"student": STUDENT}
+    if path.startswith("/educator-classes/"):
+        return {"classes": CLASSES}
+    if path.startswith("/classes/"):
+        return {"class": CLASSES[0]}
+    if path == f"/stages/{STORY}":
+        return {"stages": [f"stage-{i}" for i in range(6)]}
+    if path == f"/stage-states/{STORY}":
+        return {"1": {}, "2": {}}
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake = 0.0
+
+    def setup(self):
+        time.sleep(self.handshake)
+        super().setup()
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        data = _route(self.command, self.path.split("?")[0])
+        body = json.dumps(data).encode()
+        self.send_response(404 if data is None else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def login(client):
+    """The requests `Layout` makes when a student logs in with OAuth"""
+    if client.educators.get("student") is None:
+        student = client.students.get("student")
+        for cls in client.students.get_classes(student.id, active_only=False):
+            client.educators.get(cls.educator_id)
+        client.stories.get_stages(STORY)
+        client.stories.count_completed_stages(STORY, student.id)
+
+
+def create_class(client):
+    """The requests `CreateClassDialog` makes to create a class"""
+    client.classes.create(ClassCreationInfo(educator_id=1, name="New", expected_size=30, story_name=STORY))
+    client.educators.get_classes(1)
+
+
+def time_flow(flow, make_client, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        flow(make_client())
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=30)
+    args = parser.parse_args()
+
+    _Handler.handshake = args.handshake_ms / 1e3
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        for name, flow in [("login", login), ("create class", create_class)]:
+            per_callback = time_flow(flow, lambda: CDSClient(api_key="bench", base_url=base_url), args.repeat)
+            shared = time_flow(flow, lambda: shared_client(api_key="bench", base_url=base_url), args.repeat)
+            print(f"{name:>12}: new client {per_callback * 1e3:7.1f} ms  "
+                  f"shared client {shared * 1e3:6.1f} ms  ({per_callback / shared:.1f}x)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
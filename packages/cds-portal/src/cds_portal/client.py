@@ -0,0 +1,29 @@
+"""The API client shared by every portal session."""
+
+import solara
+from cds_client import CDSClient, shared_client
+
+_client_context = solara.create_context(None)
+
+
+def get_client() -> CDSClient:
+    """Return the process-wide client, creating it on first use.
+
+    Every session and callback shares its connection pool, so logins and
+    page loads reuse open (TLS) connections to the API instead of opening
+    new ones.
+    """
+    return shared_client()
+
+
+def provide_client(client: CDSClient | None = None) -> CDSClient:
+    """Make ``client`` (by default the shared one) available to the
+    components rendered below the calling component."""
+    client = client or get_client()
+    _client_context.provide(client)
+    return client
+
+
+def use_client() -> CDSClient:
+    """Return the client provided by an enclosing component, or the shared one."""
+    return solara.use_context(_client_context) or get_client()
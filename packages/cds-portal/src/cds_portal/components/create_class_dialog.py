@@ -1,7 +1,8 @@
 import solara
-from cds_client import CDSClient, ClassCreationInfo
+from cds_client import ClassCreationInfo
 from solara.alias import rv
 
+from ..client import use_client
 from ..state import get_portal_state
 
 STORY_MAP = {
@@ -18,6 +19,7 @@ def CreateClassDialog(verified: bool):
     story_name = solara.use_reactive("")
     error = solara.use_reactive("")
     loading = solara.use_reactive(False)
+    client = use_client()
 
     def _create():
         error.set("")
@@ -37,7 +39,6 @@ def CreateClassDialog(verified: bool):
 
         loading.set(True)
         try:
-            client = CDSClient()
             client.classes.create(
                 ClassCreationInfo(
                     educator_id=educator.id,
@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 
 import solara
-from cds_client import CDSClient, EducatorCreationInfo, StudentCreationInfo
+from cds_client import EducatorCreationInfo, StudentCreationInfo
 from cds_client.auth import hash_user
 from cds_client.cookies import verify_student_cookie
 from cds_core.components.location_helper.location_helper import LocationHelper
@@ -11,6 +11,7 @@ from solara.alias import rv
 from solara.lab import cookies as solara_cookies, use_dark_effective
 from solara_enterprise import auth
 
+from cds_portal.client import provide_client
 from cds_portal.state import get_auth_state, get_portal_state, get_registration_pending
 
 _STORY_NAME = "hubbles_law"
@@ -132,6 +133,7 @@ def Layout(children=[]):
     route_current, routes = solara.use_route()
     show_menu = solara.use_reactive(False)
     dark_effective = use_dark_effective()
+    client = provide_client()
 
     # Still need to watch auth.user to detect the OAuth callback
     oauth_user = auth.user.use_value()
@@ -187,7 +189,6 @@ def Layout(children=[]):
 
         ref = a.user_ref.value
         auth_type = a.auth_type.value
-        client = CDSClient()
 
         if auth_type == "oauth":
             # Educators also have a companion student record — check educators FIRST
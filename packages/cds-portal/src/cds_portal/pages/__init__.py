@@ -2,13 +2,13 @@ from pathlib import Path
 
 import namer
 import solara
-from cds_client import CDSClient
 from cds_client.cookies import sign_student_token
 from cds_client.models import StudentCreationInfo
 from cds_core.components.location_helper.location_helper import LocationHelper
 from solara.alias import rv
 from solara_enterprise import auth
 
+from ..client import use_client
 from ..layout import Layout
 from ..state import get_auth_state, get_portal_state, get_registration_pending
 
@@ -55,6 +55,7 @@ def LandingPage():
     student_login_username = solara.use_reactive("")
     student_login_class_code = solara.use_reactive("")
     redirect_url = solara.use_reactive("")
+    client = use_client()
 
     def _generate_student_username():
         name = namer.generate(category="astronomy")
@@ -102,7 +103,6 @@ def LandingPage():
             error.set("Please agree to the Terms of Service.")
             return
 
-        client = CDSClient()
         if not client.classes.validate_code(code):
             error.set("Class code does not exist.")
             return
@@ -135,7 +135,6 @@ def LandingPage():
             error.set("Please enter your username and class code.")
             return
 
-        client = CDSClient()
         student = client.students.get(username)
         if student is None:
             error.set("Invalid username or class code.")
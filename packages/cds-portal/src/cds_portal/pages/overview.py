@@ -1,10 +1,10 @@
 import solara
-from cds_client import CDSClient
 from cds_core.components.location_helper.location_helper import LocationHelper
 from solara.alias import rv
 
 from cds_portal.components.class_card import ClassCard
 
+from ..client import use_client
 from ..components.create_class_dialog import CreateClassDialog
 from ..components.overview_header import OverviewHeader
 from ..components.story_card import StoryCard
@@ -19,6 +19,7 @@ def EducatorOverview():
     search_query = solara.use_reactive("")
     status_filter = solara.use_reactive(1)  # 0=All, 1=Active, 2=Inactive
     sort_by = solara.use_reactive("Date")
+    client = use_client()
 
     educator = portal_state.educator.value
     verified = educator is not None and educator.verified
@@ -120,7 +121,6 @@ def EducatorOverview():
                 edu = portal_state.educator.value
                 if edu is None:
                     return
-                client = CDSClient()
                 client.classes.delete(code)
                 portal_state.educator_classes = sorted(
                     client.educators.get_classes(edu.id, active_only=False),